@@ -1,3 +1,8 @@
-from .dummyrsenv import *
-from .tile import *
 from .interactibles import *
+from .tile import *
+from .observation import *
+from .ticks import *
+from .worldstate import *
+from .dummyrsenv import *
+from .vectorenv import *
+from .envpool import *
\ No newline at end of file
@@ -1,24 +1,72 @@
 import gymnasium as gym
+import numpy as np
+from dataclasses import dataclass, replace
 from gymnasium import spaces
-from typing import Any, Dict, Tuple
-from envs import *
+from typing import Any, Dict, List, Optional, Tuple
+from .tile import Tile, create_game_map
+from .observation import CHANNELS, TileEncoder
+from .ticks import TickScheduler, TickSchedulerSnapshot
+from .worldstate import Map, WorldSnapshot
+
+
+@dataclass(frozen=True, eq=False)
+class EnvSnapshot:
+    """
+    An immutable snapshot of an OldSchoolRunescapeEnv, see OldSchoolRunescapeEnv.clone_state.
+
+    Attributes:
+        world (WorldSnapshot): The tiles of the map, including the interactible objects.
+        player_pos (Tuple[int, int]): The position of the player.
+        rng_state (Dict[str, Any]): The state of the env's np_random bit generator.
+        scheduler (TickSchedulerSnapshot): The game tick and the pending events.
+        resets (Tuple[Tuple[Tuple[int, int, str], Tuple[int, Any]], ...]): The pending interactible field resets.
+    """
+    world: WorldSnapshot
+    player_pos: Tuple[int, int]
+    rng_state: Dict[str, Any]
+    scheduler: TickSchedulerSnapshot
+    resets: Tuple[Tuple[Tuple[int, int, str], Tuple[int, Any]], ...] = ()
+
 
 class OldSchoolRunescapeEnv(gym.Env):
     """
     A custom gym environment for Old School Runescape.
 
+    Observations hold the map either as the Tile objects themselves ("objects") or,
+    for learning libraries that need numeric arrays, as a (CHANNELS, height, width)
+    uint8 tensor ("tensor", see TileEncoder). The tensor is kept up to date by
+    re-encoding only the tiles a step changed.
+
+    The map is stored column-wise in a WorldState, so a step only flips a couple of
+    array entries; Tile objects are only built for the "objects" observations.
+
+    Every step is one game tick. Timers such as resource respawns, door resets and
+    enemy movement are events registered with the TickScheduler, which a step
+    advances, so only the events that are due are processed.
+
     Attributes:
-        game_map (List[List[Tile]]): The game map consisting of tiles.
+        current_map (Map): The game map consisting of tiles.
         player_pos (Tuple[int, int]): The current position of the player.
+        scheduler (TickScheduler): The game tick and the pending timed events.
+        observation_mode (str): Either "objects" or "tensor".
         action_space (spaces.Space): The action space of the environment.
         observation_space (spaces.Space): The observation space of the environment.
     """
 
-    def __init__(self):
+    OBSERVATION_MODES = ("objects", "tensor")
+
+    def __init__(self, observation_mode: str = "objects"):
         super().__init__()
-        self.world_model = WorldModel()
+        if observation_mode not in self.OBSERVATION_MODES:
+            raise ValueError(f"Invalid observation mode: {observation_mode}")
+        self.observation_mode = observation_mode
         self.current_map = Map()
         self.player_pos = (3, 5)  # Set initial player position
+        self.scheduler = TickScheduler()
+        # (x, y, field) -> (id of the event resetting the field, the value it resets to)
+        self._resets: Dict[Tuple[int, int, str], Tuple[int, Any]] = {}
+        self.encoder = TileEncoder(self.current_map.width, self.current_map.height)
+        self._place_player()
 
         self.action_space = spaces.Tuple((
             spaces.Discrete(3),  # Action type: 0 - move, 1 - attack, 2 - interact
@@ -26,8 +74,13 @@ class OldSchoolRunescapeEnv(gym.Env):
             spaces.Discrete(7)   # Y coordinate
         ))
 
+        if observation_mode == "tensor":
+            current_map = spaces.Box(low=0, high=255, shape=(CHANNELS, 7, 10), dtype=np.uint8) # Encoded 7x10 game map
+        else:
+            # gymnasium has no Box of objects, so the tile grid is declared as a plain Space
+            current_map = spaces.Space(shape=(7, 10), dtype=object) # 7x10 game map
         self.observation_space = spaces.Dict({
-            "current_map": spaces.Box(low=0, high=1, shape=(7, 10), dtype=object), # 7x10 game map
+            "current_map": current_map,
             "player_pos": spaces.Tuple((spaces.Discrete(10), spaces.Discrete(7))) # Player position
         })
 
@@ -54,6 +107,8 @@ class OldSchoolRunescapeEnv(gym.Env):
         elif action_type == 2:  # Interact
             pass  # Implement interact logic
 
+        self.scheduler.advance()
+
         observation = self.get_observation()
         reward = 0  # Define the reward logic
         done = False  # Define the episode termination logic
@@ -68,8 +123,11 @@ class OldSchoolRunescapeEnv(gym.Env):
         Returns:
             Dict[str, Any]: The initial observation of the environment.
         """
-        self.game_map = create_game_map()
+        self.current_map = Map()
         self.player_pos = (3, 5)  # Reset player position
+        self.scheduler = TickScheduler()
+        self._resets = {}
+        self._place_player()
         return self.get_observation()
 
     def render(self, mode: str = "human") -> None:
@@ -88,6 +146,11 @@ class OldSchoolRunescapeEnv(gym.Env):
         Returns:
             Dict[str, Any]: The current observation of the environment.
         """
+        if self.observation_mode == "tensor":
+            return {
+                "current_map": self.encoder.buffer.copy(),
+                "player_pos": self.player_pos
+            }
         return {
             "current_map": self.current_map.tiles,
             "player_pos": self.player_pos
@@ -101,35 +164,139 @@ class OldSchoolRunescapeEnv(gym.Env):
             x (int): The x coordinate of the target position.
             y (int): The y coordinate of the target position.
         """
-        target_tile = self.game_map[y][x]
-        if not target_tile.inaccessible:
-            # Update the player's position on the current tile
-            current_tile = self.game_map[self.player_pos[1]][self.player_pos[0]]
-            new_current_tile = Tile.new_tile_with_player(current_tile, player=False)
-            self.game_map[self.player_pos[1]][self.player_pos[0]] = new_current_tile
-
-            # Update the player's position on the target tile
-            new_target_tile = Tile.new_tile_with_player(target_tile, player=True)
-            self.game_map[y][x] = new_target_tile
+        state = self.current_map.state
+        if not state.inaccessible(x, y):
+            # Move the player from the current tile to the target tile
+            current_x, current_y = self.player_pos
+            state.move_player(current_x, current_y, x, y)
 
             # Update the player's position attribute
             self.player_pos = (x, y)
 
-    def create_game_map(width: int = 10, height: int = 7) -> List[List[Tile]]:
+            # Re-encode only the two tiles that changed
+            if self.observation_mode == "tensor":
+                self.encoder.encode_position(state, current_x, current_y)
+                self.encoder.encode_position(state, x, y)
+
+    def set_interactible_state(self, x: int, y: int, reset_ticks: Optional[int] = None, **fields: Any) -> Optional[int]:
         """
-        Creates a game map consisting of tiles in a specified configuration.
+        Changes fields of the interactible object on a tile, optionally only for a number of ticks.
+
+        For example, set_interactible_state(x, y, 10, available=False) depletes a tree
+        that respawns 10 ticks later, and set_interactible_state(x, y, 50, is_open=True)
+        opens a door that closes again after 50 ticks.
+
+        A field that already has a pending reset keeps the value it resets to, so
+        depleting a tree again before it respawns only postpones the respawn. Changing
+        a field without reset_ticks drops its pending reset.
 
         Args:
-            width (int, optional): The width of the game map. Defaults to 10.
-            height (int, optional): The height of the game map. Defaults to 7.
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+            reset_ticks (Optional[int]): The number of ticks after which the previous values are restored, or None.
+            **fields (Any): The new field values.
+
+        Returns:
+            Optional[int]: The id of the scheduled reset event, or None.
+        """
+        state = self.current_map.state
+        interactible_object = state.interactibles.get(state.index(x, y))
+        if interactible_object is None:
+            raise ValueError(f"No interactible object at ({x}, {y})")
+        originals = {}
+        for name in fields:
+            pending = self._resets.pop((x, y, name), None)
+            if pending is not None:
+                self.scheduler.cancel(pending[0])
+            originals[name] = pending[1] if pending is not None else getattr(interactible_object, name)
+        self._replace_interactible_fields(x, y, fields)
+        if reset_ticks is None:
+            return None
+        event_id = self.scheduler.schedule(reset_ticks, self._reset_interactible_fields, x, y, tuple(fields))
+        for name, original in originals.items():
+            self._resets[(x, y, name)] = (event_id, original)
+        return event_id
+
+    def move_enemy(self, x: int, y: int, to_x: int, to_y: int, enemy: str) -> bool:
+        """
+        Moves an enemy from one tile to another, e.g. from a scheduled event.
 
         Returns:
-            List[List[Tile]]: A 2D list of tiles representing the game map.
-        """
-        game_map = []
-        for y in range(height):
-            row = []
-            for x in range(width):
-                row.append(Tile(x=x, y=y))
-            game_map.append(row)
-        return game_map
+            bool: True if the enemy was on the first tile and moved, False otherwise.
+        """
+        state = self.current_map.state
+        if not state.remove_enemy(x, y, enemy):
+            return False
+        state.add_enemy(to_x, to_y, enemy)
+        if self.observation_mode == "tensor":
+            self.encoder.encode_position(state, x, y)
+            self.encoder.encode_position(state, to_x, to_y)
+        return True
+
+    def clone_state(self) -> EnvSnapshot:
+        """
+        Captures the state of the environment, e.g. for tree search.
+
+        Snapshots share unchanged tiles with earlier snapshots of the same map, so a
+        snapshot costs as much as the tiles changed since the previous one, see
+        WorldState.snapshot.
+
+        Returns:
+            EnvSnapshot: The snapshot.
+        """
+        return EnvSnapshot(self.current_map.state.snapshot(), self.player_pos, self.np_random.bit_generator.state,
+                           self.scheduler.snapshot(), tuple(self._resets.items()))
+
+    def restore_state(self, snapshot: EnvSnapshot) -> None:
+        """
+        Restores a state captured by clone_state, re-encoding only the tiles that changed.
+
+        The pending events of the snapshot call back into the env that cloned it, so a
+        snapshot should only be restored into that env.
+
+        Args:
+            snapshot (EnvSnapshot): The snapshot to restore.
+        """
+        state = self.current_map.state
+        changed = state.restore(snapshot.world)
+        self.player_pos = snapshot.player_pos
+        self.np_random.bit_generator.state = snapshot.rng_state
+        self.scheduler.restore(snapshot.scheduler)
+        self._resets = dict(snapshot.resets)
+        if self.observation_mode == "tensor":
+            for index in set(changed):
+                y, x = divmod(index, state.width)
+                self.encoder.encode_position(state, x, y)
+
+    def _replace_interactible_fields(self, x: int, y: int, fields: Dict[str, Any]) -> None:
+        """
+        Replaces the interactible object on a tile with a copy with some fields changed.
+        """
+        state = self.current_map.state
+        state.set_interactible_object(x, y, replace(state.interactibles[state.index(x, y)], **fields))
+        if self.observation_mode == "tensor":
+            self.encoder.encode_position(state, x, y)
+
+    def _reset_interactible_fields(self, x: int, y: int, names: Tuple[str, ...]) -> None:
+        """
+        Resets fields of the interactible object on a tile to the values they had before set_interactible_state.
+        """
+        fields = {name: self._resets.pop((x, y, name))[1] for name in names}
+        self._replace_interactible_fields(x, y, fields)
+
+    def _place_player(self) -> None:
+        """
+        Marks the player on its tile and, in tensor mode, encodes the whole map.
+        """
+        x, y = self.player_pos
+        self.current_map.state.touch(x, y)
+        self.current_map.state.player[y, x] = True
+        if self.observation_mode == "tensor":
+            self.encoder.encode_state(self.current_map.state)
+
+    @staticmethod
+    def create_game_map(width: int = 10, height: int = 7) -> List[List[Tile]]:
+        """
+        Creates a game map consisting of tiles in a specified configuration, see tile.create_game_map.
+        """
+        return create_game_map(width, height)
@@ -0,0 +1,260 @@
+import functools
+import multiprocessing as mp
+import traceback
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from .dummyrsenv import OldSchoolRunescapeEnv
+
+# The arrays of the shared block: name -> (shape after (ring_size, num_envs), dtype)
+_FIELDS = {
+    "actions": ((3,), np.int64),
+    "current_map": (None, np.uint8),
+    "player_pos": ((2,), np.int64),
+    "rewards": ((), np.float32),
+    "dones": ((), bool),
+}
+
+
+def _layout(ring_size: int, num_envs: int, map_shape: Tuple[int, ...]) -> Tuple[Dict[str, Tuple[Tuple[int, ...], np.dtype, int]], int]:
+    arrays, offset = {}, 0
+    for name, (shape, dtype) in _FIELDS.items():
+        shape = (ring_size, num_envs) + (map_shape if shape is None else shape)
+        dtype = np.dtype(dtype)
+        offset = -(-offset // 64) * 64  # Align every array to a cache line
+        arrays[name] = (shape, dtype, offset)
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return arrays, offset
+
+
+def _views(buffer, arrays: Dict[str, Tuple[Tuple[int, ...], np.dtype, int]]) -> Dict[str, np.ndarray]:
+    return {name: np.ndarray(shape, dtype, buffer=buffer, offset=offset) for name, (shape, dtype, offset) in arrays.items()}
+
+
+def _worker(conn, shm_name: str, arrays, env_fn: Callable[[], OldSchoolRunescapeEnv], start: int, count: int) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    views = _views(shm.buf, arrays)
+    envs = [env_fn() for _ in range(count)]
+    try:
+        while True:
+            command, slot = conn.recv()
+            if command == "close":
+                break
+            try:
+                _execute(envs, views, command, slot, slice(start, start + count))
+            except Exception:
+                conn.send(traceback.format_exc())
+                continue
+            conn.send(None)
+    finally:
+        # The views must be released before the block can be closed
+        del views
+        shm.close()
+        conn.close()
+
+
+def _execute(envs: List[OldSchoolRunescapeEnv], views: Dict[str, np.ndarray], command: str, slot: int,
+             envs_slice: slice) -> None:
+    current_map = views["current_map"][slot, envs_slice]
+    player_pos = views["player_pos"][slot, envs_slice]
+    rewards = views["rewards"][slot, envs_slice]
+    dones = views["dones"][slot, envs_slice]
+    if command == "reset":
+        for i, env in enumerate(envs):
+            observation = env.reset()
+            current_map[i] = observation["current_map"]
+            player_pos[i] = observation["player_pos"]
+        rewards[:] = 0
+        dones[:] = False
+    elif command == "step":
+        actions = views["actions"][slot, envs_slice]
+        for i, env in enumerate(envs):
+            observation, reward, done, _ = env.step(tuple(int(a) for a in actions[i]))
+            if done:
+                observation = env.reset()
+            current_map[i] = observation["current_map"]
+            player_pos[i] = observation["player_pos"]
+            rewards[i] = reward
+            dones[i] = done
+    else:
+        raise ValueError(f"Invalid command: {command}")
+
+
+class EnvPool:
+    """
+    Steps OldSchoolRunescapeEnvs in tensor mode on a pool of worker processes.
+
+    For env logic that cannot be vectorized like VectorOldSchoolRunescapeEnv, each of
+    num_workers processes owns envs_per_worker envs and steps them in a plain loop.
+    Actions, observations, rewards and dones live in one shared memory block laid out
+    as a ring of ring_size slots of (num_envs, ...) arrays: the learner writes the
+    actions of a step into the next slot, each worker writes its envs' results
+    straight into that slot, and only a (command, slot) tuple crosses the pipes, so
+    neither Tiles nor arrays are pickled.
+
+    step_async returns at once, and up to ring_size - 1 steps can be in flight, each
+    in its own slot; step_wait returns their results in the order they were sent.
+    The learner can so compute the actions of the next step, e.g. from the
+    observations of the step before, while the workers are still stepping. For
+    actions that must see the latest observations, alternate between two pools.
+    The arrays returned by step_wait are only overwritten by the ring_size-th step
+    sent after theirs, so they can be read until the next step_wait. Envs that are
+    done are reset within the same step and their reset observation is returned.
+
+    Attributes:
+        num_workers (int): The number of worker processes.
+        envs_per_worker (int): The number of envs every worker owns.
+        num_envs (int): The total number of envs.
+        ring_size (int): The number of slots of the shared ring.
+    """
+
+    def __init__(self, num_workers: int, envs_per_worker: int = 4, ring_size: int = 2,
+                 env_fn: Optional[Callable[[], OldSchoolRunescapeEnv]] = None, context: Optional[str] = None):
+        """
+        Allocates the shared ring and starts the worker processes.
+
+        Args:
+            num_workers (int): The number of worker processes.
+            envs_per_worker (int): The number of envs every worker owns.
+            ring_size (int): The number of slots of the shared ring, at least 2; up to ring_size - 1 steps can be in flight.
+            env_fn (Optional[Callable[[], OldSchoolRunescapeEnv]]): Creates an env in tensor mode; it must be
+                picklable, e.g. a functools.partial. By default OldSchoolRunescapeEnv(observation_mode="tensor").
+            context (Optional[str]): The multiprocessing start method, or None for the platform default.
+        """
+        if ring_size < 2:
+            raise ValueError(f"Invalid ring size: {ring_size}")
+        if env_fn is None:
+            env_fn = functools.partial(OldSchoolRunescapeEnv, observation_mode="tensor")
+        env = env_fn()
+        if env.observation_mode != "tensor":
+            raise ValueError("EnvPool needs envs in tensor observation mode")
+        self.observation_space = env.observation_space
+        self.action_space = env.action_space
+
+        self.num_workers = num_workers
+        self.envs_per_worker = envs_per_worker
+        self.num_envs = num_workers * envs_per_worker
+        self.ring_size = ring_size
+        self._slot = 0
+        self._pending: deque = deque()
+
+        arrays, size = _layout(ring_size, self.num_envs, self.observation_space["current_map"].shape)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._views = _views(self._shm.buf, arrays)
+
+        ctx = mp.get_context(context)
+        self._conns = []
+        self._processes = []
+        for worker in range(num_workers):
+            conn, worker_conn = ctx.Pipe()
+            process = ctx.Process(target=_worker, name=f"EnvPool-{worker}", daemon=True,
+                                  args=(worker_conn, self._shm.name, arrays, env_fn,
+                                        worker * envs_per_worker, envs_per_worker))
+            process.start()
+            worker_conn.close()
+            self._conns.append(conn)
+            self._processes.append(process)
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        """
+        Resets every env.
+
+        Returns:
+            Dict[str, np.ndarray]: The (num_envs, ...) observations, views into the ring.
+        """
+        self._drain()
+        slot = self._next_slot()
+        self._send("reset", slot)
+        self._pending.append(slot)
+        return self.step_wait()[0]
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """
+        Sends a batch of actions to the workers without waiting for the results.
+
+        Args:
+            actions (np.ndarray): The (num_envs, 3) (action_type, x, y) actions.
+        """
+        if len(self._pending) >= self.ring_size - 1:
+            raise RuntimeError(f"At most {self.ring_size - 1} steps can be in flight; call step_wait first")
+        slot = self._next_slot()
+        self._views["actions"][slot] = np.asarray(actions).reshape(self.num_envs, 3)
+        self._send("step", slot)
+        self._pending.append(slot)
+
+    def step_wait(self) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        """
+        Waits for the workers to finish the oldest step sent by step_async.
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+                observations (Dict[str, np.ndarray]): The (num_envs, ...) observations.
+                rewards (np.ndarray): The (num_envs,) float32 rewards.
+                dones (np.ndarray): The (num_envs,) bool dones.
+                All of them are views into the ring, overwritten by the ring_size-th step sent after this one.
+        """
+        if not self._pending:
+            raise RuntimeError("step_wait called without a pending step")
+        slot = self._pending.popleft()
+        errors = [error for error in (conn.recv() for conn in self._conns) if error is not None]
+        if errors:
+            raise RuntimeError(f"An EnvPool worker failed:\n{errors[0]}")
+        observations = {
+            "current_map": self._views["current_map"][slot],
+            "player_pos": self._views["player_pos"][slot]
+        }
+        return observations, self._views["rewards"][slot], self._views["dones"][slot]
+
+    def step(self, actions: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        """
+        Steps every env and waits for the results, see step_async and step_wait.
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self) -> None:
+        """
+        Stops the worker processes and frees the shared ring.
+        """
+        if self._shm is None:
+            return
+        try:
+            self._drain()
+        except RuntimeError:
+            pass  # The workers are stopped all the same
+        self._send("close", None)
+        for process in self._processes:
+            process.join()
+        for conn in self._conns:
+            conn.close()
+        self._views = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> 'EnvPool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _drain(self) -> None:
+        # Every pending step is waited for, even if an earlier one failed, so the pipes stay in sync
+        error = None
+        while self._pending:
+            try:
+                self.step_wait()
+            except RuntimeError as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    def _next_slot(self) -> int:
+        slot = self._slot
+        self._slot = (slot + 1) % self.ring_size
+        return slot
+
+    def _send(self, command: str, slot: Optional[int]) -> None:
+        for conn in self._conns:
+            conn.send((command, slot))
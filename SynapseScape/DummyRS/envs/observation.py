@@ -0,0 +1,123 @@
+from typing import Dict, List, Type
+import numpy as np
+from .interactibles import *
+from .tile import Tile
+
+# Channels of the tensor observation, indexed [channel, y, x].
+MOVEMENT_FLAGS = 0
+PLAYER = 1
+ITEMS = 2
+ENEMIES = 3
+INTERACTIBLE = 4
+CHANNELS = 5
+
+# Interactible type ids; 0 means no interactible object on the tile.
+INTERACTIBLE_IDS: Dict[Type[InteractableObject], int] = {
+    Door: 1,
+    LadderStairs: 2,
+    Chest: 3,
+    BankVault: 4,
+    MineableRock: 5,
+    Tree: 6,
+    FishingSpot: 7,
+}
+
+
+class TileEncoder:
+    """
+    Encodes a map of tiles as a dense (CHANNELS, height, width) uint8 array.
+
+    The channels are the movement flags packed into bits 0-3, the player presence,
+    the number of items and enemies (saturating at 255) and the interactible type
+    id, see INTERACTIBLE_IDS. The array is allocated once; after a full encode only
+    the tiles that changed need to be re-encoded, with encode_tile for Tiles or
+    encode_position for a WorldState.
+
+    Attributes:
+        buffer (np.ndarray): The (CHANNELS, height, width) uint8 observation.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.buffer = np.zeros((CHANNELS, height, width), dtype=np.uint8)
+
+    def encode(self, tiles: List[List[Tile]]) -> np.ndarray:
+        """
+        Encodes every tile of a map.
+
+        Args:
+            tiles (List[List[Tile]]): The tiles, indexed [y][x].
+
+        Returns:
+            np.ndarray: The observation buffer.
+        """
+        for row in tiles:
+            for tile in row:
+                self.encode_tile(tile)
+        return self.buffer
+
+    def encode_tile(self, tile: Tile) -> None:
+        """
+        Encodes a single tile in place.
+
+        Args:
+            tile (Tile): The tile to encode.
+        """
+        flags = 0
+        for i, flag in enumerate(tile.movement_flags):
+            flags |= bool(flag) << i
+        column = self.buffer[:, tile.y, tile.x]
+        column[MOVEMENT_FLAGS] = flags
+        column[PLAYER] = tile.player
+        column[ITEMS] = min(len(tile.items), 255)
+        column[ENEMIES] = min(len(tile.enemies), 255)
+        column[INTERACTIBLE] = interactible_id(tile.interactible_object)
+
+    def encode_state(self, state) -> np.ndarray:
+        """
+        Encodes every tile of a WorldState with a few vectorized copies.
+
+        Args:
+            state (WorldState): The world state.
+
+        Returns:
+            np.ndarray: The observation buffer.
+        """
+        shape = (state.height, state.width)
+        self.buffer[MOVEMENT_FLAGS] = state.movement_flags
+        self.buffer[PLAYER] = state.player
+        self.buffer[ITEMS] = np.minimum(state.items.counts(), 255).reshape(shape)
+        self.buffer[ENEMIES] = np.minimum(state.enemies.counts(), 255).reshape(shape)
+        self.buffer[INTERACTIBLE] = state.interactible_ids
+        return self.buffer
+
+    def encode_position(self, state, x: int, y: int) -> None:
+        """
+        Encodes a single tile of a WorldState in place.
+
+        Args:
+            state (WorldState): The world state.
+            x (int): The x coordinate of the tile.
+            y (int): The y coordinate of the tile.
+        """
+        index = state.index(x, y)
+        column = self.buffer[:, y, x]
+        column[MOVEMENT_FLAGS] = state.movement_flags[y, x]
+        column[PLAYER] = state.player[y, x]
+        column[ITEMS] = min(state.items.count(index), 255)
+        column[ENEMIES] = min(state.enemies.count(index), 255)
+        column[INTERACTIBLE] = state.interactible_ids[y, x]
+
+
+def interactible_id(interactible_object) -> int:
+    """
+    Returns the type id of an interactible object, see INTERACTIBLE_IDS.
+
+    Args:
+        interactible_object (Optional[InteractableObject]): The object, or None.
+
+    Returns:
+        int: The type id, or 0 for no object or an unknown type.
+    """
+    if interactible_object is None:
+        return 0
+    return INTERACTIBLE_IDS.get(type(interactible_object), 0)
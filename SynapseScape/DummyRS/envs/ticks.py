@@ -0,0 +1,128 @@
+import heapq
+from dataclasses import dataclass
+from typing import Any, Callable, FrozenSet, List, Set, Tuple
+
+# The length of a game tick in seconds
+TICK_SECONDS = 0.6
+
+# A scheduled event: (due tick, sequence number, callback, args)
+TickEvent = Tuple[int, int, Callable[..., Any], Tuple[Any, ...]]
+
+
+@dataclass(frozen=True)
+class TickSchedulerSnapshot:
+    """
+    An immutable snapshot of a TickScheduler, see TickScheduler.snapshot.
+
+    Attributes:
+        tick (int): The current tick.
+        next_sequence (int): The sequence number of the next scheduled event.
+        events (Tuple[TickEvent, ...]): The pending events, in heap order.
+        cancelled (FrozenSet[int]): The sequence numbers of the cancelled pending events.
+    """
+    tick: int
+    next_sequence: int
+    events: Tuple[TickEvent, ...]
+    cancelled: FrozenSet[int]
+
+
+class TickScheduler:
+    """
+    Runs callbacks at future game ticks of TICK_SECONDS each.
+
+    Events are kept in a heap ordered by due tick and then by the order they were
+    scheduled in, so advancing the clock only touches the events that are due and
+    costs O(fired events * log(pending events)) however large the world is.
+    Callbacks may schedule further events, e.g. a respawn that re-arms itself; an
+    event scheduled for a tick that is being processed fires in the same advance.
+
+    Attributes:
+        tick (int): The current tick.
+    """
+
+    def __init__(self):
+        self.tick = 0
+        self._queue: List[TickEvent] = []
+        self._cancelled: Set[int] = set()
+        self._next_sequence = 0
+
+    def schedule(self, delay: int, callback: Callable[..., Any], *args: Any) -> int:
+        """
+        Schedules a callback to run a number of ticks from now.
+
+        Args:
+            delay (int): The number of ticks to wait, at least 0.
+            callback (Callable[..., Any]): The function to call with args.
+
+        Returns:
+            int: An id to cancel the event with.
+        """
+        if delay < 0:
+            raise ValueError(f"Invalid delay: {delay}")
+        return self.schedule_at(self.tick + delay, callback, *args)
+
+    def schedule_at(self, tick: int, callback: Callable[..., Any], *args: Any) -> int:
+        """
+        Schedules a callback to run at a tick, the current one at the earliest.
+
+        Returns:
+            int: An id to cancel the event with.
+        """
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        heapq.heappush(self._queue, (max(tick, self.tick), sequence, callback, args))
+        return sequence
+
+    def cancel(self, event_id: int) -> None:
+        """
+        Cancels a pending event. Cancelling an event that already fired does nothing.
+        """
+        if any(sequence == event_id for _, sequence, _, _ in self._queue):
+            self._cancelled.add(event_id)
+
+    def advance(self, ticks: int = 1) -> int:
+        """
+        Advances the clock and runs the events that are due, in order.
+
+        Args:
+            ticks (int): The number of ticks to advance by.
+
+        Returns:
+            int: The number of events that fired.
+        """
+        self.tick += ticks
+        fired = 0
+        while self._queue and self._queue[0][0] <= self.tick:
+            _, sequence, callback, args = heapq.heappop(self._queue)
+            if sequence in self._cancelled:
+                self._cancelled.discard(sequence)
+                continue
+            callback(*args)
+            fired += 1
+        return fired
+
+    def next_tick(self) -> int:
+        """
+        Returns the tick of the next pending event, or -1 if there is none.
+        """
+        while self._queue and self._queue[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._queue)[1])
+        return self._queue[0][0] if self._queue else -1
+
+    def snapshot(self) -> TickSchedulerSnapshot:
+        """
+        Takes an immutable snapshot of the clock and the pending events, in O(pending events).
+        """
+        return TickSchedulerSnapshot(self.tick, self._next_sequence, tuple(self._queue), frozenset(self._cancelled))
+
+    def restore(self, snapshot: TickSchedulerSnapshot) -> None:
+        """
+        Restores the clock and the pending events captured by a snapshot.
+        """
+        self.tick = snapshot.tick
+        self._next_sequence = snapshot.next_sequence
+        self._queue = list(snapshot.events)
+        self._cancelled = set(snapshot.cancelled)
+
+    def __len__(self) -> int:
+        return len(self._queue) - len(self._cancelled)
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple, Dict
-from interactibles import InteractibleObject
+from .interactibles import InteractableObject
 
 @dataclass
 class Tile:
@@ -16,25 +16,17 @@ class Tile:
         player (bool): Whether the player is on the tile.
         movement_flags (Tuple[bool, bool, bool, bool]): A tuple of flags indicating whether the tile is accessible in the four cardinal directions.
         """
-    _x: int
-    _y: int
-    items: List[Item] = field(default_factory=list)
-    enemies: List[Enemy] = field(default_factory=list)
-    interactible_object: Optional[InteractibleObject] = None
+    x: int
+    y: int
+    items: List[str] = field(default_factory=list)
+    enemies: List[str] = field(default_factory=list)
+    interactible_object: Optional[InteractableObject] = None
     player: bool = False
     movement_flags: Tuple[bool, bool, bool, bool] = field(default_factory=lambda: (False, False, False, False))
 
     def __post_init__(self):
         object.__setattr__(self, "movement_flags", tuple(self.movement_flags))
 
-    @property
-    def x(self) -> int:
-        return self._x
-    
-    @property
-    def y(self) -> int:
-        return self._y
-    
     def inaccessible(self):
         """
         Checks if the tile is inaccessible.
@@ -59,7 +51,7 @@ class Tile:
         return Tile(
             x=tile.x,
             y=tile.y,
-            items=tile.items + [item],
+            items=list(tile.items) + [item],
             enemies=tile.enemies,
             interactible_object=tile.interactible_object,
             player=tile.player,
@@ -82,7 +74,7 @@ class Tile:
             x=tile.x,
             y=tile.y,
             items=tile.items,
-            enemies=tile.enemies + [enemy],
+            enemies=list(tile.enemies) + [enemy],
             interactible_object=tile.interactible_object,
             player=tile.player,
             movement_flags=tile.movement_flags
@@ -132,15 +124,41 @@ class Tile:
             movement_flags=tile.movement_flags
         )
 
-@dataclass
-class Map:
-    width: int = 10
-    height: int = 7
-    tiles: List[List[Tile]] = None
-    connections: Dict[str, 'Map'] = None
+
+class TileView(Tile):
+    """
+    A read-only Tile, as built by WorldState.tile and WorldState.tiles.
+
+    Views are cached and shared until their tile changes, so assigning to one raises
+    instead of silently changing nothing, and items and enemies are tuples. Use the
+    new_tile_with_* helpers and WorldState.set_tile to change a tile.
+    """
 
     def __post_init__(self):
-        if self.tiles is None:
-            self.tiles = OldSchoolRunescapeEnv.create_game_map(self.width, self.height)
-        if self.connections is None:
-            self.connections = {}
\ No newline at end of file
+        super().__post_init__()
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"Cannot set {name} on a read-only TileView; use WorldState.set_tile instead")
+        super().__setattr__(name, value)
+
+
+def create_game_map(width: int = 10, height: int = 7) -> List[List[Tile]]:
+    """
+    Creates a game map consisting of tiles in a specified configuration.
+
+    Args:
+        width (int, optional): The width of the game map. Defaults to 10.
+        height (int, optional): The height of the game map. Defaults to 7.
+
+    Returns:
+        List[List[Tile]]: A 2D list of tiles representing the game map.
+    """
+    game_map = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            row.append(Tile(x=x, y=y))
+        game_map.append(row)
+    return game_map
@@ -0,0 +1,147 @@
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from .observation import CHANNELS, MOVEMENT_FLAGS, PLAYER, TileEncoder
+from .worldstate import WorldState
+
+
+class VectorOldSchoolRunescapeEnv(VectorEnv):
+    """
+    N DummyRS worlds stepped in lockstep with NumPy operations.
+
+    The worlds are held in a single (N, CHANNELS, height, width) uint8 array laid
+    out like the tensor observation of OldSchoolRunescapeEnv (see TileEncoder), so
+    the state is its own observation. A step takes an (N, 3) array of
+    (action_type, x, y) actions and applies the moves, their validity checks and the
+    resets of every world at once, without a Python loop over the worlds.
+
+    Like OldSchoolRunescapeEnv, worlds give no reward and never terminate; they are
+    truncated after max_episode_steps steps. Finished worlds are reset on their next
+    step, whose action is ignored (gymnasium's next-step autoreset).
+
+    Attributes:
+        num_envs (int): The number of worlds.
+        max_episode_steps (int): The number of steps after which a world is truncated.
+        start_pos (Tuple[int, int]): The position the player starts at.
+        player_pos (np.ndarray): The (N, 2) int64 (x, y) player positions.
+        elapsed_steps (np.ndarray): The (N,) number of steps taken in the current episode of every world.
+    """
+
+    metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(self, num_envs: int, max_episode_steps: int = 1000, template: Optional[WorldState] = None,
+                 start_pos: Tuple[int, int] = (3, 5)):
+        """
+        Creates the worlds as copies of a template.
+
+        Args:
+            num_envs (int): The number of worlds.
+            max_episode_steps (int): The number of steps after which a world is truncated.
+            template (Optional[WorldState]): The world every episode starts from, an empty 10x7 map by default.
+            start_pos (Tuple[int, int]): The position the player starts at.
+        """
+        super().__init__()
+        if template is None:
+            template = WorldState()
+        self.num_envs = num_envs
+        self.max_episode_steps = max_episode_steps
+        self.start_pos = start_pos
+        self.width, self.height = template.width, template.height
+
+        encoder = TileEncoder(self.width, self.height)
+        encoder.encode_state(template)
+        encoder.buffer[PLAYER] = 0
+        encoder.buffer[PLAYER, start_pos[1], start_pos[0]] = 1
+        self._template = encoder.buffer.copy()
+
+        self.worlds = np.empty((num_envs, CHANNELS, self.height, self.width), dtype=np.uint8)
+        self.player_pos = np.empty((num_envs, 2), dtype=np.int64)
+        self.elapsed_steps = np.zeros(num_envs, dtype=np.int64)
+        self._autoreset = np.zeros(num_envs, dtype=bool)
+        self._arange = np.arange(num_envs)
+
+        self.single_action_space = spaces.Tuple((
+            spaces.Discrete(3),  # Action type: 0 - move, 1 - attack, 2 - interact
+            spaces.Discrete(self.width),  # X coordinate
+            spaces.Discrete(self.height)  # Y coordinate
+        ))
+        self.action_space = spaces.MultiDiscrete(np.tile([3, self.width, self.height], (num_envs, 1)))
+        self.single_observation_space = spaces.Dict({
+            "current_map": spaces.Box(low=0, high=255, shape=(CHANNELS, self.height, self.width), dtype=np.uint8),
+            "player_pos": spaces.MultiDiscrete([self.width, self.height])
+        })
+        self.observation_space = spaces.Dict({
+            "current_map": spaces.Box(low=0, high=255, shape=(num_envs, CHANNELS, self.height, self.width),
+                                      dtype=np.uint8),
+            "player_pos": spaces.MultiDiscrete(np.tile([self.width, self.height], (num_envs, 1)))
+        })
+        self._reset_worlds(np.ones(num_envs, dtype=bool))
+
+    def reset(self, *, seed: Optional[int] = None,
+              options: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """
+        Resets the worlds, all of them or those selected by options["reset_mask"].
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], Dict[str, Any]]: The observations and an empty info dict.
+        """
+        super().reset(seed=seed, options=options)
+        mask = np.ones(self.num_envs, dtype=bool)
+        if options is not None and "reset_mask" in options:
+            mask = np.asarray(options["reset_mask"], dtype=bool)
+        self._reset_worlds(mask)
+        return self._observation(), {}
+
+    def step(self, actions: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        Executes one (action_type, x, y) action in every world.
+
+        Args:
+            actions (np.ndarray): The (N, 3) actions.
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+                observations (Dict[str, np.ndarray]): The batched observations.
+                rewards (np.ndarray): The (N,) float32 rewards.
+                terminations (np.ndarray): The (N,) bool terminations.
+                truncations (np.ndarray): The (N,) bool truncations.
+                infos (Dict[str, Any]): Additional information, empty for now.
+        """
+        actions = np.asarray(actions).reshape(self.num_envs, 3)
+        action_type, x, y = actions[:, 0], actions[:, 1], actions[:, 2]
+        resetting = self._autoreset.copy()
+
+        # Moves to a tile on the map whose movement flags are not all set; attack and interact are not implemented yet
+        valid = (action_type == 0) & ~resetting & (0 <= x) & (x < self.width) & (0 <= y) & (y < self.height)
+        moving = self._arange[valid]
+        x, y = x[valid], y[valid]
+        moving_mask = self.worlds[moving, MOVEMENT_FLAGS, y, x] != WorldState.INACCESSIBLE
+        moving, x, y = moving[moving_mask], x[moving_mask], y[moving_mask]
+        self.worlds[moving, PLAYER, self.player_pos[moving, 1], self.player_pos[moving, 0]] = 0
+        self.worlds[moving, PLAYER, y, x] = 1
+        self.player_pos[moving, 0] = x
+        self.player_pos[moving, 1] = y
+
+        self.elapsed_steps += 1
+        terminations = np.zeros(self.num_envs, dtype=bool)
+        truncations = self.elapsed_steps >= self.max_episode_steps
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+
+        if resetting.any():
+            self._reset_worlds(resetting)
+            truncations[resetting] = False
+        self._autoreset = terminations | truncations
+        return self._observation(), rewards, terminations, truncations, {}
+
+    def _reset_worlds(self, mask: np.ndarray) -> None:
+        self.worlds[mask] = self._template
+        self.player_pos[mask] = self.start_pos
+        self.elapsed_steps[mask] = 0
+        self._autoreset[mask] = False
+
+    def _observation(self) -> Dict[str, np.ndarray]:
+        return {
+            "current_map": self.worlds.copy(),
+            "player_pos": self.player_pos.copy()
+        }
@@ -0,0 +1,443 @@
+import copy
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .interactibles import InteractableObject
+from .observation import interactible_id
+from .tile import Tile, TileView
+
+
+class RaggedColumn:
+    """
+    A CSR-style column holding a variable-length list of ints per tile.
+
+    The values of tile i are values[offsets[i]:offsets[i + 1]]. Reading a tile or its
+    count is two array lookups; adding or removing a value shifts the arrays, which is
+    fine for the rare item drops and enemy spawns.
+
+    Attributes:
+        offsets (np.ndarray): The (tiles + 1,) int32 start offset of every tile's values.
+        values (np.ndarray): The int32 values of all tiles, tile by tile.
+    """
+
+    def __init__(self, size: int):
+        self.offsets = np.zeros(size + 1, dtype=np.int32)
+        self.values = np.zeros(0, dtype=np.int32)
+
+    def get(self, index: int) -> List[int]:
+        """
+        Returns the values of a tile.
+        """
+        return self.values[self.offsets[index]:self.offsets[index + 1]].tolist()
+
+    def count(self, index: int) -> int:
+        """
+        Returns the number of values of a tile.
+        """
+        return int(self.offsets[index + 1] - self.offsets[index])
+
+    def counts(self) -> np.ndarray:
+        """
+        Returns the number of values of every tile.
+        """
+        return np.diff(self.offsets)
+
+    def append(self, index: int, value: int) -> None:
+        """
+        Adds a value to the end of a tile's values.
+        """
+        end = self.offsets[index + 1]
+        self.values = np.insert(self.values, end, value)
+        self.offsets[index + 1:] += 1
+
+    def remove(self, index: int, value: int) -> bool:
+        """
+        Removes the first occurrence of a value from a tile's values.
+
+        Returns:
+            bool: True if the value was found and removed, False otherwise.
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        matches = np.flatnonzero(self.values[start:end] == value)
+        if len(matches) == 0:
+            return False
+        self.values = np.delete(self.values, start + matches[0])
+        self.offsets[index + 1:] -= 1
+        return True
+
+    def set(self, index: int, values: Sequence[int]) -> None:
+        """
+        Replaces the values of a tile.
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        self.values = np.concatenate((self.values[:start], np.asarray(values, dtype=np.int32), self.values[end:]))
+        self.offsets[index + 1:] += len(values) - (end - start)
+
+
+# The state of a single tile: (movement flags, player, interactible object, item ids, enemy ids)
+TileRecord = Tuple[int, bool, Optional[InteractableObject], Tuple[int, ...], Tuple[int, ...]]
+
+
+@dataclass(frozen=True, eq=False)
+class WorldSnapshot:
+    """
+    An immutable snapshot of a WorldState, see WorldState.snapshot.
+
+    Snapshots form a tree: each one only holds the tiles that changed since its
+    parent, with their state before and after, and shares everything else with its
+    ancestors. The root holds every tile of the map.
+
+    Attributes:
+        parent (Optional[WorldSnapshot]): The previous snapshot, None for the root.
+        depth (int): The number of ancestors of the snapshot.
+        changes (Tuple[Tuple[int, Optional[TileRecord], TileRecord], ...]): The (flat index, before, after)
+            records of the tiles that changed since the parent.
+        names (Tuple[str, ...]): The interned item and enemy names.
+        history (object): A token shared by all snapshots of the same WorldState.
+        width (int): The width of the map.
+        height (int): The height of the map.
+    """
+    parent: Optional['WorldSnapshot']
+    depth: int
+    changes: Tuple[Tuple[int, Optional[TileRecord], TileRecord], ...]
+    names: Tuple[str, ...]
+    history: object
+    width: int
+    height: int
+
+
+class WorldState:
+    """
+    The tiles of a map stored as NumPy columns instead of Tile objects.
+
+    Every column is indexed [y, x], or by the flat index y * width + x. Items and
+    enemies are interned into ids (see names) and kept in RaggedColumns, and the
+    interactible objects themselves are kept in a dict keyed by flat index next to
+    their type id column, see observation.INTERACTIBLE_IDS. Moving the player flips
+    two booleans and allocates nothing; a Tile is only built when one is asked for,
+    as a read-only TileView that is cached until its tile changes.
+
+    Once a snapshot has been taken, the mutators record the previous state of every
+    tile they change for the first time, so the next snapshot and a restore cost
+    O(changed tiles) rather than O(map). Columns and interactible objects changed
+    directly must be announced with touch first; interactible objects can also be
+    replaced with set_interactible_object.
+
+    Attributes:
+        width (int): The width of the map.
+        height (int): The height of the map.
+        movement_flags (np.ndarray): The (height, width) uint8 movement flags, packed into bits 0-3.
+        player (np.ndarray): The (height, width) bool player presence.
+        interactible_ids (np.ndarray): The (height, width) uint8 interactible type ids, 0 for none.
+        interactibles (Dict[int, InteractableObject]): The interactible objects, keyed by flat index.
+        items (RaggedColumn): The item name ids of every tile.
+        enemies (RaggedColumn): The enemy name ids of every tile.
+        names (List[str]): The interned item and enemy names, indexed by id.
+    """
+
+    INACCESSIBLE = 0b1111
+
+    def __init__(self, width: int = 10, height: int = 7):
+        self.width = width
+        self.height = height
+        self.movement_flags = np.zeros((height, width), dtype=np.uint8)
+        self.player = np.zeros((height, width), dtype=bool)
+        self.interactible_ids = np.zeros((height, width), dtype=np.uint8)
+        self.interactibles: Dict[int, InteractableObject] = {}
+        self.items = RaggedColumn(width * height)
+        self.enemies = RaggedColumn(width * height)
+        self.names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        self._head: Optional[WorldSnapshot] = None
+        self._journal: Dict[int, TileRecord] = {}
+        self._views: List[Optional[TileView]] = [None] * (width * height)
+        self._rows: List[Optional[Tuple[TileView, ...]]] = [None] * height
+        self._grid: Optional[Tuple[Tuple[TileView, ...], ...]] = None
+
+    def index(self, x: int, y: int) -> int:
+        """
+        Returns the flat index of a tile.
+        """
+        return y * self.width + x
+
+    def inaccessible(self, x: int, y: int) -> bool:
+        """
+        Checks if a tile is inaccessible, i.e. all of its movement flags are set, see Tile.inaccessible.
+        """
+        return self.movement_flags[y, x] == self.INACCESSIBLE
+
+    def set_movement_flags(self, x: int, y: int, flags) -> None:
+        """
+        Sets the movement flags of a tile from four booleans.
+        """
+        packed = 0
+        for i, flag in enumerate(flags):
+            packed |= bool(flag) << i
+        self.touch(x, y)
+        self.movement_flags[y, x] = packed
+
+    def move_player(self, x: int, y: int, to_x: int, to_y: int) -> None:
+        """
+        Moves the player from one tile to another.
+        """
+        self.touch(x, y)
+        self.touch(to_x, to_y)
+        self.player[y, x] = False
+        self.player[to_y, to_x] = True
+
+    def add_item(self, x: int, y: int, item: str) -> None:
+        """
+        Adds an item to a tile.
+        """
+        self.touch(x, y)
+        self.items.append(self.index(x, y), self._intern(item))
+
+    def remove_item(self, x: int, y: int, item: str) -> bool:
+        """
+        Removes an item from a tile.
+
+        Returns:
+            bool: True if the tile held the item, False otherwise.
+        """
+        name_id = self._name_ids.get(item)
+        self.touch(x, y)
+        return name_id is not None and self.items.remove(self.index(x, y), name_id)
+
+    def add_enemy(self, x: int, y: int, enemy: str) -> None:
+        """
+        Adds an enemy to a tile.
+        """
+        self.touch(x, y)
+        self.enemies.append(self.index(x, y), self._intern(enemy))
+
+    def remove_enemy(self, x: int, y: int, enemy: str) -> bool:
+        """
+        Removes an enemy from a tile.
+
+        Returns:
+            bool: True if the tile held the enemy, False otherwise.
+        """
+        name_id = self._name_ids.get(enemy)
+        self.touch(x, y)
+        return name_id is not None and self.enemies.remove(self.index(x, y), name_id)
+
+    def set_interactible_object(self, x: int, y: int, interactible_object: Optional[InteractableObject]) -> None:
+        """
+        Places an interactible object on a tile, or removes it when None.
+        """
+        index = self.index(x, y)
+        self.touch(x, y)
+        if interactible_object is None:
+            self.interactibles.pop(index, None)
+        else:
+            self.interactibles[index] = interactible_object
+        self.interactible_ids[y, x] = interactible_id(interactible_object)
+
+    def tile(self, x: int, y: int) -> TileView:
+        """
+        Returns a read-only view of a tile, built on first access and cached until the tile changes.
+        """
+        index = self.index(x, y)
+        view = self._views[index]
+        if view is None:
+            flags = int(self.movement_flags[y, x])
+            view = self._views[index] = TileView(
+                x=x,
+                y=y,
+                items=tuple(self.names[i] for i in self.items.get(index)),
+                enemies=tuple(self.names[i] for i in self.enemies.get(index)),
+                interactible_object=self.interactibles.get(index),
+                player=bool(self.player[y, x]),
+                movement_flags=tuple(bool(flags >> i & 1) for i in range(4))
+            )
+        return view
+
+    def tiles(self) -> Tuple[Tuple[TileView, ...], ...]:
+        """
+        Returns read-only views of the whole map, indexed [y][x].
+
+        Only the rows holding a tile that changed since the last call are rebuilt, and
+        only their changed tiles get a new view.
+        """
+        if self._grid is None:
+            for y, row in enumerate(self._rows):
+                if row is None:
+                    self._rows[y] = tuple(self.tile(x, y) for x in range(self.width))
+            self._grid = tuple(self._rows)
+        return self._grid
+
+    def set_tile(self, tile: Tile) -> None:
+        """
+        Writes a Tile into the columns, replacing whatever was on its position.
+        """
+        index = self.index(tile.x, tile.y)
+        self.set_movement_flags(tile.x, tile.y, tile.movement_flags)
+        self.player[tile.y, tile.x] = tile.player
+        self.set_interactible_object(tile.x, tile.y, tile.interactible_object)
+        self.items.set(index, [self._intern(item) for item in tile.items])
+        self.enemies.set(index, [self._intern(enemy) for enemy in tile.enemies])
+
+    def touch(self, x: int, y: int) -> None:
+        """
+        Records the state of a tile before it changes, for the next snapshot, and drops its cached view.
+
+        The mutators call this themselves; call it before writing to the columns or
+        mutating the interactible object of a tile directly.
+        """
+        index = self.index(x, y)
+        self._invalidate(index)
+        if self._head is not None and index not in self._journal:
+            self._journal[index] = self._record(index)
+
+    def snapshot(self) -> WorldSnapshot:
+        """
+        Takes an immutable snapshot of the state.
+
+        The first snapshot copies every tile; later ones only hold the tiles changed
+        since the previous snapshot or restore, and return that snapshot itself if
+        nothing changed.
+
+        Returns:
+            WorldSnapshot: The snapshot.
+        """
+        head = self._head
+        if head is None:
+            changes = tuple((index, None, self._record(index)) for index in range(self.width * self.height))
+            self._head = WorldSnapshot(None, 0, changes, tuple(self.names), object(), self.width, self.height)
+            return self._head
+        if not self._journal:
+            return head
+        changes = tuple((index, before, self._record(index)) for index, before in self._journal.items())
+        names = head.names if len(head.names) == len(self.names) else tuple(self.names)
+        self._head = WorldSnapshot(head, head.depth + 1, changes, names, head.history, self.width, self.height)
+        self._journal.clear()
+        return self._head
+
+    def restore(self, snapshot: WorldSnapshot) -> List[int]:
+        """
+        Restores the state captured by a snapshot.
+
+        Changes since the last snapshot are undone, then the snapshot tree is walked
+        from the last snapshot up to the common ancestor with the target and down to
+        the target, so the cost is the number of tiles changed along the way. A
+        snapshot of another WorldState is restored by rebuilding every tile.
+
+        Args:
+            snapshot (WorldSnapshot): The snapshot to restore.
+
+        Returns:
+            List[int]: The flat indices of the tiles that may have changed.
+        """
+        if (snapshot.width, snapshot.height) != (self.width, self.height):
+            raise ValueError(f"Cannot restore a {snapshot.width}x{snapshot.height} snapshot "
+                             f"into a {self.width}x{self.height} world")
+        changed = []
+        for index, before in self._journal.items():
+            self._apply(index, before)
+            changed.append(index)
+        self._journal.clear()
+
+        head = self._head
+        other_history = head is None or head.history is not snapshot.history
+        # Names are only ever appended within a history, so the longer table holds the shorter one
+        if other_history or len(snapshot.names) > len(self.names):
+            self.names = list(snapshot.names)
+            self._name_ids = {name: i for i, name in enumerate(self.names)}
+        if other_history:
+            head = None
+
+        redo = []
+        target = snapshot
+        while target is not None and (head is None or target.depth > head.depth):
+            redo.append(target)
+            target = target.parent
+        while head is not None and head.depth > target.depth:
+            for index, before, _ in head.changes:
+                self._apply(index, before)
+                changed.append(index)
+            head = head.parent
+        while head is not target:
+            for index, before, _ in head.changes:
+                self._apply(index, before)
+                changed.append(index)
+            head = head.parent
+            redo.append(target)
+            target = target.parent
+        for node in reversed(redo):
+            for index, _, after in node.changes:
+                self._apply(index, after)
+                changed.append(index)
+
+        self._head = snapshot
+        return changed
+
+    def _record(self, index: int) -> TileRecord:
+        y, x = divmod(index, self.width)
+        interactible_object = self.interactibles.get(index)
+        return (
+            int(self.movement_flags[y, x]),
+            bool(self.player[y, x]),
+            copy.copy(interactible_object) if interactible_object is not None else None,
+            tuple(self.items.get(index)),
+            tuple(self.enemies.get(index))
+        )
+
+    def _invalidate(self, index: int) -> None:
+        if self._views[index] is not None:
+            self._views[index] = None
+            self._rows[index // self.width] = None
+            self._grid = None
+
+    def _apply(self, index: int, record: TileRecord) -> None:
+        y, x = divmod(index, self.width)
+        self._invalidate(index)
+        movement_flags, player, interactible_object, items, enemies = record
+        self.movement_flags[y, x] = movement_flags
+        self.player[y, x] = player
+        # The record must stay untouched, so the state gets its own copy of the object
+        if interactible_object is None:
+            self.interactibles.pop(index, None)
+        else:
+            self.interactibles[index] = copy.copy(interactible_object)
+        self.interactible_ids[y, x] = interactible_id(interactible_object)
+        if self.items.count(index) or items:
+            self.items.set(index, items)
+        if self.enemies.count(index) or enemies:
+            self.enemies.set(index, enemies)
+
+    def _intern(self, name: str) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+
+@dataclass
+class Map:
+    """
+    A game map, backed by a WorldState.
+
+    Attributes:
+        width (int): The width of the map.
+        height (int): The height of the map.
+        state (WorldState): The tiles of the map.
+        connections (Dict[str, Map]): The maps this map connects to.
+    """
+    width: int = 10
+    height: int = 7
+    state: WorldState = None
+    connections: Dict[str, 'Map'] = None
+
+    def __post_init__(self):
+        if self.state is None:
+            self.state = WorldState(self.width, self.height)
+        if self.connections is None:
+            self.connections = {}
+
+    @property
+    def tiles(self) -> Tuple[Tuple[TileView, ...], ...]:
+        """
+        The read-only tile views of the whole map, indexed [y][x], see WorldState.tiles.
+        """
+        return self.state.tiles()
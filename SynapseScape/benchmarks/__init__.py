@@ -0,0 +1 @@
+from .worlds import WORLDS, generate, serialize
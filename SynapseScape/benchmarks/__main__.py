@@ -0,0 +1,134 @@
+"""
+Runs the walking benchmarks on synthetic worlds and prints a JSON report.
+
+Usage, from the SynapseScape directory:
+    python -m benchmarks [--worlds maze open_field] [--regions 3] [--queries 50] [--seed 0] [--output report.json]
+"""
+from typing import Callable, Dict, List
+from client.game.walking import AStarPathfinder, GlobalCollisionMap, Pathfinder
+from client.game.worldpoint import WorldPoint
+from .worlds import ORIGIN_REGION_X, ORIGIN_REGION_Y, WORLDS, generate, serialize
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+PATHFINDERS: Dict[str, Callable[..., Pathfinder]] = {
+    'bfs': Pathfinder,
+    'astar': AStarPathfinder,
+}
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarizes samples by their mean and p50, p90, p99 and max.
+    """
+    if not samples:
+        return {}
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+    return {'mean': float(np.mean(samples)), 'p50': float(p50), 'p90': float(p90),
+            'p99': float(p99), 'max': float(np.max(samples)), 'n': len(samples)}
+
+
+def timed(function: Callable, repeat: int) -> List[float]:
+    """
+    Returns the wall time of each of repeat calls in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def queries(walkable: np.ndarray, count: int, rng: np.random.Generator) -> List[tuple]:
+    """
+    Draws (start, target) pairs of walkable tiles on the same plane.
+    """
+    pairs = []
+    for _ in range(count):
+        plane = rng.integers(walkable.shape[0])
+        ys, xs = np.nonzero(walkable[plane])
+        a, b = rng.integers(len(xs), size=2)
+        pairs.append(tuple(WorldPoint(int(xs[i]) + ORIGIN_REGION_X * 64, int(ys[i]) + ORIGIN_REGION_Y * 64, int(plane))
+                           for i in (a, b)))
+    return pairs
+
+
+def bench_world(kind: str, regions: int, count: int, seed: int) -> dict:
+    """
+    Benchmarks loading, serializing and searching one synthetic world.
+    """
+    walkable = generate(kind, regions, seed)
+    data = serialize(walkable)
+    report = {'regions': regions * regions, 'bytes': len(data), 'walkable_tiles': int(walkable.sum())}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'collision.bin')
+        with open(path, 'wb') as f:
+            f.write(data)
+        report['load_ms'] = percentiles(timed(lambda: GlobalCollisionMap(data), 10))
+        report['load_file_ms'] = percentiles(timed(lambda: GlobalCollisionMap.from_file(path), 10))
+
+    collision_map = GlobalCollisionMap(bytearray(data))
+    report['round_trip_ms'] = percentiles(timed(lambda: GlobalCollisionMap(collision_map.to_bytes()), 10))
+    assert collision_map.to_bytes() == data
+
+    pairs = queries(walkable, count, np.random.default_rng(seed))
+    report['pathfinders'] = {}
+    for name, pathfinder in PATHFINDERS.items():
+        latencies, expanded, lengths = [], [], []
+        for start, target in pairs:
+            search = pathfinder(collision_map, start, target)
+            begin = time.perf_counter()
+            path = search.find()
+            latencies.append((time.perf_counter() - begin) * 1000)
+            expanded.append(search.expanded)
+            lengths.append(len(path))
+
+        # Tracing slows allocations down, so memory is measured in a separate pass.
+        tracemalloc.start()
+        for start, target in pairs:
+            pathfinder(collision_map, start, target).find()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report['pathfinders'][name] = {
+            'latency_ms': percentiles(latencies),
+            'expanded': percentiles(expanded),
+            'path_length': percentiles(lengths),
+            'unreachable': sum(1 for length in lengths if length == 0),
+            'peak_memory_bytes': peak,
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--worlds', nargs='+', choices=sorted(WORLDS), default=sorted(WORLDS))
+    parser.add_argument('--regions', type=int, default=3, help='width and height of each world in regions')
+    parser.add_argument('--queries', type=int, default=50, help='path queries per world')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the report to this file instead of stdout')
+    args = parser.parse_args()
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': args.seed,
+        'worlds': {kind: bench_world(kind, args.regions, args.queries, args.seed) for kind in args.worlds},
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Synthetic collision worlds for the benchmarks.
+
+A world is a (planes, height, width) boolean array of walkable tiles whose origin is
+the south-west corner of a region. serialize turns it into the collision file
+format read by GlobalCollisionMap: 4098-byte records of a big-endian region id
+followed by the region's n/e flag bits, indexed ((z * 64 + y) * 64 + x) * 2 + w.
+A tile can step north (east) when it and the tile north (east) of it are walkable.
+"""
+from typing import Callable, Dict
+import numpy as np
+
+ORIGIN_REGION_X = 50
+ORIGIN_REGION_Y = 50
+
+
+def serialize(walkable: np.ndarray, region_x: int = ORIGIN_REGION_X, region_y: int = ORIGIN_REGION_Y) -> bytes:
+    """
+    Converts a walkable grid into collision file bytes.
+
+    Args:
+        walkable (np.ndarray): The (planes, height, width) walkable tiles, with height and width multiples of 64.
+        region_x (int): The x of the region holding the grid's south-west corner.
+        region_y (int): The y of the region holding the grid's south-west corner.
+
+    Returns:
+        bytes: The collision data.
+    """
+    planes, height, width = walkable.shape
+    flags = np.zeros((4, height, width, 2), dtype=bool)
+    flags[:planes, :-1, :, 0] = walkable[:, :-1, :] & walkable[:, 1:, :]
+    flags[:planes, :, :-1, 1] = walkable[:, :, :-1] & walkable[:, :, 1:]
+
+    buffer = bytearray()
+    for rx in range(width // 64):
+        for ry in range(height // 64):
+            region = (region_x + rx) << 8 | (region_y + ry)
+            block = flags[:, ry * 64:(ry + 1) * 64, rx * 64:(rx + 1) * 64, :]
+            buffer.extend(region.to_bytes(2, 'big'))
+            buffer.extend(np.packbits(block.reshape(-1), bitorder='big').tobytes())
+    return bytes(buffer)
+
+
+def open_field(regions: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Open ground with 5% scattered obstacles.
+    """
+    return (rng.random((1, regions * 64, regions * 64)) >= 0.05)
+
+
+def maze(regions: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    A perfect maze of one tile wide corridors, carved by a randomized depth-first search.
+    """
+    size = regions * 64
+    walkable = np.zeros((1, size, size), dtype=bool)
+    cells = (size - 1) // 2
+    visited = np.zeros((cells, cells), dtype=bool)
+    stack = [(0, 0)]
+    visited[0, 0] = True
+    walkable[0, 1, 1] = True
+    while stack:
+        x, y = stack[-1]
+        options = [(x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                   if 0 <= x + dx < cells and 0 <= y + dy < cells and not visited[y + dy, x + dx]]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny = options[rng.integers(len(options))]
+        visited[ny, nx] = True
+        walkable[0, 2 * ny + 1, 2 * nx + 1] = True
+        walkable[0, y + ny + 1, x + nx + 1] = True
+        stack.append((nx, ny))
+    return walkable
+
+
+def archipelago(regions: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Round islands in open water, some of them linked by straight one tile wide bridges.
+    """
+    size = regions * 64
+    ys, xs = np.mgrid[0:size, 0:size]
+    walkable = np.zeros((1, size, size), dtype=bool)
+    centres = []
+    for _ in range(regions * regions * 3):
+        cx, cy, r = rng.integers(size), rng.integers(size), rng.integers(6, 24)
+        walkable[0] |= (xs - cx) ** 2 + (ys - cy) ** 2 <= r * r
+        centres.append((cx, cy))
+    for (ax, ay), (bx, by) in zip(centres, centres[1:]):
+        if rng.random() < 0.6:
+            walkable[0, ay, min(ax, bx):max(ax, bx) + 1] = True
+            walkable[0, min(ay, by):max(ay, by) + 1, bx] = True
+    return walkable
+
+
+def buildings(regions: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Walled buildings with doors on open ground, with upper floors on planes 1 and 2.
+    """
+    size = regions * 64
+    walkable = np.zeros((3, size, size), dtype=bool)
+    walkable[0] = True
+    for _ in range(regions * regions * 4):
+        w, h = rng.integers(8, 20, size=2)
+        x, y = rng.integers(1, size - w - 1), rng.integers(1, size - h - 1)
+        walkable[0, y, x:x + w] = walkable[0, y + h - 1, x:x + w] = False
+        walkable[0, y:y + h, x] = walkable[0, y:y + h, x + w - 1] = False
+        walkable[0, y, x + w // 2] = True
+        for plane in (1, 2):
+            walkable[plane, y + 1:y + h - 1, x + 1:x + w - 1] = True
+    return walkable
+
+
+WORLDS: Dict[str, Callable[[int, np.random.Generator], np.ndarray]] = {
+    'open_field': open_field,
+    'maze': maze,
+    'archipelago': archipelago,
+    'buildings': buildings,
+}
+
+
+def generate(kind: str, regions: int, seed: int = 0) -> np.ndarray:
+    """
+    Generates a synthetic world.
+
+    Args:
+        kind (str): The kind of world, one of WORLDS.
+        regions (int): The width and height of the world in regions.
+        seed (int): The seed of the generator, so runs are reproducible.
+
+    Returns:
+        np.ndarray: The (planes, height, width) walkable tiles.
+    """
+    return WORLDS[kind](regions, np.random.default_rng(seed))
@@ -1,6 +1,16 @@
 from .worldpoint import WorldPoint
+from . import worldpointutil
 
 class CollisionMap:
+    N = 1 << 0
+    E = 1 << 1
+    S = 1 << 2
+    W = 1 << 3
+    NE = 1 << 4
+    NW = 1 << 5
+    SE = 1 << 6
+    SW = 1 << 7
+
     def n(self, x: int, y: int, z: int) -> bool:
         raise NotImplementedError()
     
@@ -48,3 +58,19 @@ class CollisionMap:
     
     def sw_wp(self, wp: WorldPoint) -> bool:
         return self.sw(wp.x, wp.y, wp.plane)
+
+    def moves(self, x: int, y: int, z: int) -> int:
+        """
+        Returns the moves that can be made from a tile as a bit mask of the N..SW constants.
+        """
+        return ((self.N if self.n(x, y, z) else 0) | (self.E if self.e(x, y, z) else 0)
+                | (self.S if self.s(x, y, z) else 0) | (self.W if self.w(x, y, z) else 0)
+                | (self.NE if self.ne(x, y, z) else 0) | (self.NW if self.nw(x, y, z) else 0)
+                | (self.SE if self.se(x, y, z) else 0) | (self.SW if self.sw(x, y, z) else 0))
+
+    def packed_moves(self, packed: int) -> int:
+        """
+        Returns the moves that can be made from a packed tile, see moves and worldpointutil.
+        """
+        return self.moves(worldpointutil.unpack_world_x(packed), worldpointutil.unpack_world_y(packed),
+                          worldpointutil.unpack_world_plane(packed))
@@ -1,3 +1,5 @@
 from .actionhandler import *
 from .actionspace import *
-from .utils import *
\ No newline at end of file
+from .utils import *
+from .trajectorypool import *
+from .inputscheduler import *
\ No newline at end of file
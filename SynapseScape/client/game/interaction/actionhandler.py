@@ -1,46 +1,60 @@
-import pyautogui
 import ctypes
 import time
 
 from ctypes import wintypes
-from utils import smooth_move_bezier
+from .inputscheduler import InputEvent, InputScheduler, WindowsBackend
+from .utils import smooth_move_bezier
 
 class OSRSGame:
-    def __init__(self):
-        # Find the game window
+    def __init__(self, backend=None, scheduler=None, window_rect=None):
+        # Find the game window, unless its (left, top, right, bottom) rect is given
         self.game_window = None
-        user32 = ctypes.windll.user32
-        
-        #user32.EnumWindows(self.enum_windows_callback, 0)
-        ENUM_WINDOWS_PROC = ctypes.WINFUNCTYPE(ctypes.c_bool, wintypes.HWND, wintypes.LPARAM)
-        user32.EnumWindows(ENUM_WINDOWS_PROC(self.enum_windows_callback), 0)
+        if window_rect is None:
+            user32 = ctypes.windll.user32
 
-        if not self.game_window:
-            raise Exception("Could not find Runelite window")
+            #user32.EnumWindows(self.enum_windows_callback, 0)
+            ENUM_WINDOWS_PROC = ctypes.WINFUNCTYPE(ctypes.c_bool, wintypes.HWND, wintypes.LPARAM)
+            user32.EnumWindows(ENUM_WINDOWS_PROC(self.enum_windows_callback), 0)
 
-        # Get the game window position and size
-        self.left, self.top, self.right, self.bottom = self.get_window_rect()
+            if not self.game_window:
+                raise Exception("Could not find Runelite window")
+
+            # Get the game window position and size
+            window_rect = self.get_window_rect()
+        self.left, self.top, self.right, self.bottom = window_rect
+
+        # Input is sent from the scheduler's timing thread, so none of the methods below block;
+        # they return a ScheduledSequence to wait on or cancel. Coordinates are relative to the window,
+        # and the window position is added here, as backends take absolute screen coordinates.
+        if scheduler is None:
+            scheduler = InputScheduler(backend if backend is not None else WindowsBackend())
+        self.scheduler = scheduler
 
     def press_key(self, key):
         # Press a keyboard key
-        ctypes.windll.user32.keybd_event(ord(key), 0, 0, 0)
-        ctypes.windll.user32.keybd_event(ord(key), 0, 2, 0)
+        return self.scheduler.schedule([InputEvent(0.0, 'key', (key,))])
 
     def move_mouse(self, x, y):
         # Move the mouse to a position within the game window
-        pyautogui.moveTo(self.left + x, self.top + y)
+        return self.scheduler.schedule([InputEvent(0.0, 'move', (self.left + x, self.top + y))])
+
+    def smooth_move_mouse(self, start_pos, end_pos, duration=0.25, complexity=None, steps=None, pool=None):
+        # Move the mouse along a Bezier curve between two positions given as fractions of the window size;
+        # complexity and steps default to 4 and 50, or to the pool's, see smooth_move_bezier
+        window_size = (self.right - self.left, self.bottom - self.top)
+        return smooth_move_bezier(start_pos, end_pos, duration, complexity, steps, window_size, pool, self.scheduler,
+                                  origin=(self.left, self.top))
 
     def click_mouse(self, button='left'):
         # Click the mouse button within the game window
         button = button.lower()
-        if button == 'left':
-            ctypes.windll.user32.mouse_event(0x0002, 0, 0, 0, 0)
-            ctypes.windll.user32.mouse_event(0x0004, 0, 0, 0, 0)
-        elif button == 'right':
-            ctypes.windll.user32.mouse_event(0x0008, 0, 0, 0, 0)
-            ctypes.windll.user32.mouse_event(0x0010, 0, 0, 0, 0)
-        else:
+        if button not in ('left', 'right'):
             raise ValueError(f"Invalid button: {button}")
+        return self.scheduler.schedule([InputEvent(0.0, 'click', (button,))])
+
+    def close(self):
+        # Stop the input scheduler's timing thread
+        self.scheduler.close()
 
     def enum_windows_callback(self, hwnd, lParam):
         # Callback function for EnumWindows that checks for the game window
@@ -77,9 +91,10 @@ class OSRSGame:
             print(f"Cursor position relative to game window center: ({game_x}, {game_y})")
             time.sleep(0.1)
 
-game = OSRSGame()
-size = (game.right - game.left, game.bottom - game.top)
-print(size)
-game.show_cursor_position()
-#game.move_mouse(734, 672)
-#smooth_move_bezier((-.25, 0.5), (.75, .5), duration=2, complexity=4, steps=50, window_size=size)
\ No newline at end of file
+if __name__ == '__main__':
+    game = OSRSGame()
+    size = (game.right - game.left, game.bottom - game.top)
+    print(size)
+    game.show_cursor_position()
+    #game.move_mouse(734, 672)
+    #game.smooth_move_mouse((-.25, 0.5), (.75, .5), duration=2, complexity=4, steps=50).wait()
\ No newline at end of file
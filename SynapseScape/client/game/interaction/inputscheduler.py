@@ -0,0 +1,253 @@
+# inputscheduler.py
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass
+class InputEvent:
+    """A mouse move, mouse click or key press, due `at` seconds after its sequence is scheduled"""
+    at: float
+    kind: str
+    args: tuple = ()
+
+
+class InputBackend:
+    """Sends input to the OS; subclasses implement move, click and press_key
+
+    move takes absolute screen coordinates in pixels, from the top-left corner of the
+    primary screen. Backends never offset them; OSRSGame adds the game window
+    position to its window-relative coordinates before scheduling.
+    """
+
+    def move(self, x, y):
+        raise NotImplementedError()
+
+    def click(self, button='left'):
+        raise NotImplementedError()
+
+    def press_key(self, key):
+        raise NotImplementedError()
+
+
+class NullBackend(InputBackend):
+    """Drops every event, for dry runs and timing measurements"""
+
+    def move(self, x, y):
+        pass
+
+    def click(self, button='left'):
+        pass
+
+    def press_key(self, key):
+        pass
+
+
+class RecordingBackend(InputBackend):
+    """Records every event with the time it was dispatched, for tests"""
+
+    def __init__(self):
+        self.events = []
+
+    def move(self, x, y):
+        self.events.append((time.perf_counter(), 'move', (x, y)))
+
+    def click(self, button='left'):
+        self.events.append((time.perf_counter(), 'click', (button,)))
+
+    def press_key(self, key):
+        self.events.append((time.perf_counter(), 'key', (key,)))
+
+
+class PyAutoGUIBackend(InputBackend):
+    """Sends input with pyautogui, which is imported on first use"""
+
+    def __init__(self):
+        import pyautogui
+        self.pyautogui = pyautogui
+
+    def move(self, x, y):
+        self.pyautogui.moveTo(x, y, _pause=False)
+
+    def click(self, button='left'):
+        self.pyautogui.click(button=button, _pause=False)
+
+    def press_key(self, key):
+        self.pyautogui.press(key, _pause=False)
+
+
+class WindowsBackend(InputBackend):
+    """Sends input with the user32 calls OSRSGame uses"""
+
+    def __init__(self):
+        import ctypes
+        self.user32 = ctypes.windll.user32
+
+    def move(self, x, y):
+        self.user32.SetCursorPos(int(x), int(y))
+
+    def click(self, button='left'):
+        button = button.lower()
+        if button == 'left':
+            self.user32.mouse_event(0x0002, 0, 0, 0, 0)
+            self.user32.mouse_event(0x0004, 0, 0, 0, 0)
+        elif button == 'right':
+            self.user32.mouse_event(0x0008, 0, 0, 0, 0)
+            self.user32.mouse_event(0x0010, 0, 0, 0, 0)
+        else:
+            raise ValueError(f"Invalid button: {button}")
+
+    def press_key(self, key):
+        self.user32.keybd_event(ord(key), 0, 0, 0)
+        self.user32.keybd_event(ord(key), 0, 2, 0)
+
+
+@dataclass(eq=False)
+class ScheduledSequence:
+    """A handle on a scheduled event sequence, to cancel it or wait for it"""
+    remaining: int
+    cancelled: bool = False
+    error: Exception = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+    def cancel(self):
+        """Drop the events of the sequence that have not been dispatched yet"""
+        self.cancelled = True
+        self.done.set()
+
+    def wait(self, timeout=None):
+        """Block until the sequence has been dispatched or cancelled"""
+        return self.done.wait(timeout)
+
+
+class InputScheduler:
+    """Dispatch timed input event sequences from a dedicated timing thread
+
+    schedule() returns immediately; the timing thread sleeps until shortly before
+    each deadline and spins for the last `spin` seconds, which is far more precise
+    than sleeping alone. Sequences can be cancelled, e.g. when the game state
+    changes. The lateness of every dispatched event (jitter) and the time the
+    backend takes to send it (latency) are recorded. If the backend raises, the
+    rest of the sequence is cancelled and the exception is stored on its handle.
+    """
+
+    def __init__(self, backend=None, spin=0.002, max_samples=10000):
+        self.backend = backend if backend is not None else NullBackend()
+        self.spin = spin
+        self.jitter = []
+        self.latency = []
+        self.max_samples = max_samples
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='InputScheduler', daemon=True)
+        self._thread.start()
+
+    def schedule(self, events, delay=0.0):
+        """Queue a sequence of InputEvents to start `delay` seconds from now"""
+        now = time.perf_counter()
+        events = list(events)
+        handle = ScheduledSequence(len(events))
+        if not events:
+            handle.done.set()
+            return handle
+        with self._condition:
+            for event in events:
+                heapq.heappush(self._queue, (now + delay + event.at, next(self._sequence), event, handle))
+            self._condition.notify()
+        return handle
+
+    def cancel_all(self):
+        """Cancel every scheduled sequence"""
+        with self._condition:
+            for _, _, _, handle in self._queue:
+                handle.cancel()
+            self._queue.clear()
+            self._condition.notify()
+
+    def stats(self):
+        """Return percentiles of the recorded jitter and latency, in milliseconds"""
+        def summary(samples):
+            if not samples:
+                return {}
+            samples = np.asarray(samples) * 1000
+            p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+            return {'mean': float(samples.mean()), 'p50': float(p50), 'p90': float(p90),
+                    'p99': float(p99), 'max': float(samples.max()), 'n': len(samples)}
+        return {'jitter_ms': summary(self.jitter), 'latency_ms': summary(self.latency)}
+
+    def close(self):
+        """Cancel everything and stop the timing thread"""
+        self.cancel_all()
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def move_events(points, duration, start=0.0):
+        """Spread mouse moves along a trajectory evenly over `duration` seconds"""
+        if len(points) == 0:
+            return []
+        duration_per_step = duration / len(points)
+        return [InputEvent(start + i * duration_per_step, 'move', (point[0], point[1])) for i, point in enumerate(points)]
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and self._queue and self._queue[0][3].cancelled:
+                    heapq.heappop(self._queue)
+                if not self._running:
+                    return
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+                deadline = self._queue[0][0]
+                remaining = deadline - time.perf_counter()
+                if remaining > self.spin:
+                    self._condition.wait(remaining - self.spin)
+                    continue
+                _, _, event, handle = heapq.heappop(self._queue)
+
+            while time.perf_counter() < deadline:
+                pass
+            if handle.cancelled:
+                continue
+            started = time.perf_counter()
+            try:
+                self._dispatch(event)
+            except Exception as e:
+                handle.error = e
+                handle.cancel()
+                continue
+            self._record(self.jitter, started - deadline)
+            self._record(self.latency, time.perf_counter() - started)
+            handle.remaining -= 1
+            if handle.remaining == 0:
+                handle.done.set()
+
+    def _dispatch(self, event):
+        if event.kind == 'move':
+            self.backend.move(*event.args)
+        elif event.kind == 'click':
+            self.backend.click(*event.args)
+        elif event.kind == 'key':
+            self.backend.press_key(*event.args)
+        else:
+            raise ValueError(f"Invalid input event: {event.kind}")
+
+    def _record(self, samples, value):
+        samples.append(value)
+        if len(samples) > self.max_samples:
+            del samples[:len(samples) - self.max_samples]
@@ -0,0 +1,96 @@
+# trajectorypool.py
+import threading
+from collections import deque
+import numpy as np
+
+from .utils import generate_bezier_curves
+
+
+class TrajectoryPool:
+    """Keep a bounded pool of pre-generated mouse trajectories, refilled by a background thread
+
+    Trajectories are generated from (0, 0) to (reference_length, 0) pixels and stored
+    normalized to the unit segment from (0, 0) to (1, 0). take() maps one onto the
+    real start and end points with a rotation and scale, so no curve is generated on
+    the action path unless the pool has run dry.
+    """
+
+    def __init__(self, size=256, steps=50, complexity=4, reference_length=400.0, batch_size=32, rng=None):
+        self.size = size
+        self.steps = steps
+        self.complexity = complexity
+        self.reference_length = reference_length
+        self.batch_size = batch_size
+        self.rng = rng if rng is not None else np.random.default_rng()
+        # Generators are not thread-safe, so misses on the caller's thread use their own
+        self._miss_rng = np.random.default_rng(self.rng.integers(1 << 63))
+        self.hits = 0
+        self.misses = 0
+        self._trajectories = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        """Start the background refill thread"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name='TrajectoryPool', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refill thread and wait for it to exit"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def fill(self):
+        """Generate trajectories on the calling thread until the pool is full, before start() or after stop()"""
+        while len(self._trajectories) < self.size:
+            self._trajectories.extend(self._generate(min(self.batch_size, self.size - len(self._trajectories))))
+
+    def take(self, start_pos, end_pos):
+        """Return a (steps, 2) trajectory from start_pos to end_pos, in pixels"""
+        try:
+            trajectory = self._trajectories.popleft()
+            self.hits += 1
+        except IndexError:
+            trajectory = self._generate(1, self._miss_rng)[0]
+            self.misses += 1
+        with self._condition:
+            self._condition.notify()
+
+        # Treating points as complex numbers, multiplying by (end - start) rotates and
+        # scales the unit segment onto the real one
+        start = complex(start_pos[0], start_pos[1])
+        points = start + trajectory * (complex(end_pos[0], end_pos[1]) - start)
+        return np.stack([points.real, points.imag], axis=1)
+
+    def __len__(self):
+        return len(self._trajectories)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _generate(self, count, rng=None):
+        curves = generate_bezier_curves(np.zeros((count, 2)), np.tile([self.reference_length, 0.0], (count, 1)),
+                                        self.complexity, self.steps, (1, 1), rng if rng is not None else self.rng)
+        return list((curves[..., 0] + 1j * curves[..., 1]) / self.reference_length)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and len(self._trajectories) > max(self.size - self.batch_size, 0):
+                    self._condition.wait()
+                if not self._running:
+                    return
+            self._trajectories.extend(self._generate(min(self.batch_size, self.size - len(self._trajectories))))
@@ -1,69 +1,115 @@
 # utils.py
-import random
 import math
-import ctypes
+from functools import lru_cache
 import numpy as np
-import pyautogui
 
+from .inputscheduler import InputScheduler, PyAutoGUIBackend
 
-import random
-import numpy as np
-import pyautogui
+_rng = np.random.default_rng()
+_scheduler = None
+
+
+def default_scheduler():
+    """Return the InputScheduler shared by callers that do not pass their own, sending input with pyautogui"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = InputScheduler(PyAutoGUIBackend())
+    return _scheduler
 
-def generate_bezier_curve(start_pos, end_pos, complexity=8, steps=50, window_size=(800, 600)):
+
+def generate_bezier_curve(start_pos, end_pos, complexity=8, steps=50, window_size=(800, 600), rng=None):
     """Generate a smooth Bezier curve given start and end points using random midpoint displacement"""
-    # Initialize the curve with the start and end points
-    curve_points = [start_pos, end_pos]
+    return list(map(tuple, generate_bezier_curves([start_pos], [end_pos], complexity, steps, window_size, rng)[0].tolist()))
+
 
-    # Recursively apply midpoint displacement to generate the curve
+def generate_bezier_curves(start_positions, end_positions, complexity=8, steps=50, window_size=(800, 600), rng=None):
+    """Generate one Bezier curve per (start, end) pair at once, as a (curves, steps, 2) array
+
+    The control points of all curves are displaced together, and every curve is then
+    evaluated with a single product against the cached Bernstein basis of its degree.
+    """
+    if rng is None:
+        rng = _rng
+    starts = np.asarray(start_positions, dtype=np.float64).reshape(-1, 2)
+    ends = np.asarray(end_positions, dtype=np.float64).reshape(-1, 2)
+
+    # Recursively apply midpoint displacement to generate the control points,
+    # doubling the number of segments of every curve per iteration
+    curve_points = np.stack([starts, ends], axis=1)
+    displacements = rng.uniform(-10, 10, size=(len(curve_points), (1 << complexity) - 1, 2))
     for i in range(complexity):
-        new_points = []
-        for j in range(len(curve_points) - 1):
-            p1, p2 = curve_points[j], curve_points[j + 1]
-            mid_x = int((p1[0] + p2[0]) / 2 + random.uniform(-10, 10))
-            mid_y = int((p1[1] + p2[1]) / 2 + random.uniform(-10, 10))
-            new_points.append(p1)
-            new_points.append((mid_x, mid_y))
-        new_points.append(end_pos)
+        segments = curve_points.shape[1] - 1
+        mids = np.trunc((curve_points[:, :-1] + curve_points[:, 1:]) / 2
+                        + displacements[:, segments - 1:2 * segments - 1])
+        new_points = np.empty((curve_points.shape[0], 2 * curve_points.shape[1] - 1, 2))
+        new_points[:, 0::2] = curve_points
+        new_points[:, 1::2] = mids
         curve_points = new_points
 
     # Scale the curve points to match the game window size
-    window_width, window_height = window_size
-    scale_factor_x = window_width / 1.0
-    scale_factor_y = window_height / 1.0
-    curve_points_scaled = [(int(p[0] * scale_factor_x), int(p[1] * scale_factor_y)) for p in curve_points]
+    curve_points_scaled = np.trunc(curve_points * np.asarray(window_size, dtype=np.float64))
 
-    # Generate the final Bezier curve with a higher number of steps
-    final_curve_points = []
-    for t in np.linspace(0, 1, steps):
-        x, y = _bezier(t, curve_points_scaled)
-        final_curve_points.append((x, y))
+    # Generate the final Bezier curves with a higher number of steps
+    basis = bernstein_matrix(curve_points_scaled.shape[1] - 1, steps)
+    return np.matmul(basis, curve_points_scaled)
 
-    # Return the final curve points
-    return final_curve_points
 
+def smooth_move_bezier(start_pos, end_pos, duration=0.25, complexity=None, steps=None, window_size=(800, 600),
+                       pool=None, scheduler=None, origin=(0, 0)):
+    """Move the mouse cursor smoothly along a Bezier curve generated using random midpoint displacement
 
-def smooth_move_bezier(start_pos, end_pos, duration=0.25, complexity=4, steps=50, window_size=(800, 600)):
-    """Move the mouse cursor smoothly along a Bezier curve generated using random midpoint displacement"""
+    complexity and steps default to 4 and 50. Given a TrajectoryPool, the curve is
+    taken from the pool instead of being generated, so they default to the pool's and
+    a ValueError is raised if they are given and differ from the pool's.
+    The curve is in window pixels and shifted by origin, the screen position of the
+    window's top-left corner, as input backends take absolute screen coordinates.
+    The moves are dispatched by an InputScheduler, default_scheduler() unless one is
+    given, so this returns at once with a ScheduledSequence to wait on or cancel.
+    """
     # Generate the Bezier curve
-    curve_points = generate_bezier_curve(start_pos, end_pos, complexity, steps, window_size)
+    if pool is not None:
+        for name, value in (('complexity', complexity), ('steps', steps)):
+            if value is not None and value != getattr(pool, name):
+                raise ValueError(f"{name}={value} conflicts with the pool's {name}={getattr(pool, name)}")
+        curve_points = pool.take((start_pos[0] * window_size[0], start_pos[1] * window_size[1]),
+                                 (end_pos[0] * window_size[0], end_pos[1] * window_size[1])).tolist()
+    else:
+        curve_points = generate_bezier_curve(start_pos, end_pos, 4 if complexity is None else complexity,
+                                             50 if steps is None else steps, window_size)
+
+    curve_points = [(x + origin[0], y + origin[1]) for x, y in curve_points]
+
+    # Move the mouse cursor along the Bezier curve, spreading the moves evenly over the duration
+    if scheduler is None:
+        scheduler = default_scheduler()
+    return scheduler.schedule(InputScheduler.move_events(curve_points, duration))
+
 
-    # Calculate the duration between each step
-    duration_per_step = duration / len(curve_points)
+@lru_cache(maxsize=64)
+def bernstein_matrix(n, steps):
+    """Return the (steps, n + 1) Bernstein basis of degree n sampled at steps evenly spaced t in [0, 1]
 
-    # Move the mouse cursor along the Bezier curve
-    for point in curve_points:
-        pyautogui.moveTo(point[0], point[1], duration=duration_per_step)
+    The coefficients are computed in log space, so they neither overflow nor lose
+    precision for the hundreds of control points a high complexity produces. The
+    matrix is cached and read-only.
+    """
+    t = np.linspace(0, 1, steps)[:, None]
+    i = np.arange(n + 1)[None, :]
+    log_binomial = np.array([math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1) for k in range(n + 1)])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_basis = log_binomial + i * np.log(t) + (n - i) * np.log1p(-t)
+    basis = np.exp(log_basis)
+    # 0 * log(0) is nan above, but 0 ** 0 is 1 at the endpoints
+    basis[t[:, 0] == 0] = np.eye(1, n + 1, 0)
+    basis[t[:, 0] == 1] = np.eye(1, n + 1, n)
+    basis.setflags(write=False)
+    return basis
 
 
 def _bezier(t, control_points):
     """Calculate the position of a point on a Bezier curve given a parameter t and a list of control points"""
-    n = len(control_points) - 1
-    x = 0
-    y = 0
-    for i in range(n + 1):
-        coeff = math.factorial(n) / (math.factorial(i) * math.factorial(n - i))
-        coeff *= (1 - t)**(n - i) * t**i
-        x += coeff * control_points[i][0]
-        y += coeff * control_points[i][1]
-    return x, y
+    # De Casteljau's algorithm, which is numerically stable for any number of control points
+    points = np.asarray(control_points, dtype=np.float64)
+    while len(points) > 1:
+        points = (1 - t) * points[:-1] + t * points[1:]
+    return float(points[0, 0]), float(points[0, 1])
@@ -1,4 +1,16 @@
 from .bitset4d import BitSet4D
 from .coordmap import CoordMap
 from .globalcollisionmap import GlobalCollisionMap
-from .pathfinder import Pathfinder
\ No newline at end of file
+from .pathfinder import Pathfinder
+from .astar import AStarPathfinder
+from .regiongraph import RegionGraph, HierarchicalPathfinder
+from .movementmask import MovementMaskMap
+from .reachability import ReachabilityIndex
+from .regiontable import RegionTable
+from .distancefield import DistanceField
+from .pathcache import PathCache
+from .landmarks import LandmarkTable
+from .dstarlite import DStarLitePathfinder
+from .pathservice import PathService
+from .transport import Transport, TransportIndex
+from .waypoints import WaypointSimplifier
\ No newline at end of file
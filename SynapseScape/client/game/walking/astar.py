@@ -0,0 +1,112 @@
+from heapq import heappop, heappush
+from itertools import count
+from typing import Dict, List, Optional
+from .coordmap import CoordMap
+from .landmarks import LandmarkTable
+from .pathfinder import Pathfinder
+from .reachability import ReachabilityIndex
+from .transport import TransportIndex
+from ..collisionmap import CollisionMap
+from ..worldpoint import WorldPoint
+from .. import worldpointutil
+
+
+class AStarPathfinder(Pathfinder):
+    """
+    A* variant of the Pathfinder, searching the same CollisionMap graph.
+
+    Every step, straight or diagonal, costs one tick, so the Chebyshev distance
+    (WorldPoint.distance_to_2d, worldpointutil.distance_2d) is an admissible and consistent heuristic and the
+    returned paths have the same length as the breadth-first ones.
+
+    Frontier entries are ordered by (f, h, manhattan) where f = g + h. Preferring the
+    lowest h among equal f keeps the search diving towards the target instead of
+    widening, and preferring the lowest manhattan distance among equal h takes the
+    diagonal steps first, like the breadth-first paths do.
+
+    Given a LandmarkTable, the heuristic is the larger of the Chebyshev distance and
+    the ALT bound, which is still admissible and consistent but much tighter around
+    walls and rivers, as long as the table matches the collision map. A stale table
+    (see LandmarkTable.stale) is ignored, so paths stay optimal after collision
+    changes, just with more tiles expanded.
+
+    Given a TransportIndex, steps through transports cost their cost in ticks. A
+    transport that covers more tiles than its cost (a teleport) can beat the
+    Chebyshev distance, so the heuristic is capped by the cheapest way of finishing
+    through one of them, cost + Chebyshev(destination, target). The landmark table
+    only knows the tile grid, so it is not used together with transports.
+
+    Attributes:
+        boundary (List[tuple]): The heap-ordered frontier.
+        costs (Dict[int, int]): The best known step count from the start to each visited tile, keyed by packed WorldPoint.
+        expanded (int): The number of tiles taken off the frontier by the last search.
+        landmarks (Optional[LandmarkTable]): The landmark distances used to tighten the heuristic.
+    """
+
+    def __init__(self, collision_map: CollisionMap, start: WorldPoint, target: WorldPoint,
+                 reachability: Optional[ReachabilityIndex] = None, landmarks: Optional[LandmarkTable] = None,
+                 transports: Optional[TransportIndex] = None):
+        super().__init__(collision_map, start, target, reachability, transports)
+        self.boundary = []
+        self.costs: Dict[int, int] = {}
+        self.landmarks = landmarks
+        self._sequence = count()
+        self._target = target.pack()
+        self._target_landmarks = None
+        if landmarks is not None and not landmarks.stale and transports is None:
+            self._target_landmarks = landmarks.vector(self._target)
+        self._shortcut: Optional[int] = None
+        if transports is not None:
+            self._shortcut = min((cost + worldpointutil.distance_2d(destination, self._target)
+                                  for destination, cost in transports.shortcuts()), default=None)
+
+    def _search(self) -> List[WorldPoint]:
+        if self.landmarks is not None and self.landmarks.stale:
+            self._target_landmarks = None
+        start = self.start.pack()
+        self.costs[start] = 0
+        self.predecessors.put(start, None, CoordMap.START)
+        self._push(start, 0)
+
+        while self.boundary:
+            _, _, _, _, cost, node = heappop(self.boundary)
+            if cost > self.costs[node]:
+                continue
+            self.expanded += 1
+
+            if node == self._target:
+                return self._get_path(node)
+
+            self._add_neighbours(node)
+
+        return []
+
+    def heuristic(self, position: int) -> int:
+        """
+        Estimates the number of steps left from the given position to the target.
+
+        Args:
+            position (int): The packed position to estimate from.
+
+        Returns:
+            int: A lower bound on the number of steps to the target.
+        """
+        h = worldpointutil.distance_2d(position, self._target)
+        if self._target_landmarks is not None:
+            h = max(h, LandmarkTable.bound(self.landmarks.vector(position), self._target_landmarks))
+        if self._shortcut is not None and self._shortcut < h:
+            h = self._shortcut
+        return h
+
+    def _add_neighbour(self, position: int, neighbour: int, code: int, step: int = 1):
+        cost = self.costs[position] + step
+        if cost < self.costs.get(neighbour, cost + 1):
+            self.costs[neighbour] = cost
+            self.predecessors.put(neighbour, position, code)
+            self._push(neighbour, cost)
+
+    def _push(self, position: int, cost: int):
+        h = self.heuristic(position)
+        manhattan = (abs(worldpointutil.unpack_world_x(position) - self.target.x)
+                     + abs(worldpointutil.unpack_world_y(position) - self.target.y))
+        heappush(self.boundary, (cost + h, h, manhattan, next(self._sequence), cost, position))
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from bitarray import bitarray
 from typing import Any, Union
+import numpy as np
 
 @dataclass
 class BitSet4D:
@@ -18,6 +19,8 @@ class BitSet4D:
         __post_init__(self): Initializes the bits attribute if not already set.
         from_buffer(cls, buffer: bytearray, sizeX: int, sizeY: int, sizeZ: int, sizeW: int) -> BitSet4D:
             Creates a new BitSet4D instance from a bytearray.
+        wrap_buffer(cls, buffer: memoryview, sizeX: int, sizeY: int, sizeZ: int, sizeW: int) -> BitSet4D:
+            Creates a new BitSet4D instance that shares the memory of a writable buffer.
         write(self, buffer: bytearray) -> None:
             Writes the bits of the BitSet4D instance to a bytearray.
         index(self, x: int, y: int, z: int, w: int) -> int:
@@ -28,6 +31,16 @@ class BitSet4D:
             Sets the boolean value at the specified 4-dimensional coordinates.
         set_all(self, value: bool) -> None:
             Sets all bits to the specified value.
+        packed(self) -> np.ndarray:
+            Returns a uint8 NumPy view of the packed bits.
+        to_array(self) -> np.ndarray:
+            Unpacks all bits into a boolean array indexed [x, y, z, w].
+        get_many(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, w: np.ndarray) -> np.ndarray:
+            Gets the boolean values at many 4-dimensional coordinates at once.
+        set_many(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, w: np.ndarray, values: np.ndarray) -> None:
+            Sets the boolean values at many 4-dimensional coordinates at once.
+        index_many(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, w: np.ndarray) -> np.ndarray:
+            Computes the 1D indices corresponding to many 4D coordinates.
     """
     sizeX: int
     sizeY: int
@@ -66,6 +79,28 @@ class BitSet4D:
         bits = bits[:sizeX * sizeY * sizeZ * sizeW]
         return cls(sizeX=sizeX, sizeY=sizeY, sizeZ=sizeZ, sizeW=sizeW, bits=bits)
 
+    @classmethod
+    def wrap_buffer(cls, buffer: memoryview, sizeX: int, sizeY: int, sizeZ: int, sizeW: int) -> 'BitSet4D':
+        """
+        Creates a new BitSet4D instance that shares the memory of a writable buffer.
+
+        Args:
+            buffer (memoryview): The buffer to use as bit storage, exactly as large as the specified dimensions.
+            sizeX (int): The size of the first dimension.
+            sizeY (int): The size of the second dimension.
+            sizeZ (int): The size of the third dimension.
+            sizeW (int): The size of the fourth dimension.
+
+        Returns:
+            BitSet4D: A new BitSet4D instance backed by the buffer.
+
+        Raises:
+            ValueError: If the size of the buffer does not match the specified dimensions.
+        """
+        if len(buffer) * 8 != sizeX * sizeY * sizeZ * sizeW:
+            raise ValueError(f"Buffer of {len(buffer)} bytes does not fit {sizeX}x{sizeY}x{sizeZ}x{sizeW} bits")
+        return cls(sizeX=sizeX, sizeY=sizeY, sizeZ=sizeZ, sizeW=sizeW, bits=bitarray(buffer=buffer))
+
     def write(self, buffer: bytearray) -> None:
         """
         Writes the bit values to a bytearray.
@@ -112,6 +147,65 @@ class BitSet4D:
         """
         self.bits.setall(value)
 
+    def packed(self) -> np.ndarray:
+        """
+        Returns a uint8 NumPy view of the packed bits, sharing memory with the bitarray.
+
+        Returns:
+            np.ndarray: The packed bits, eight per byte in the bitarray's bit order.
+        """
+        return np.frombuffer(self.bits, dtype=np.uint8)
+
+    def to_array(self) -> np.ndarray:
+        """
+        Unpacks all bits into a boolean array with a single vectorized unpack.
+
+        Returns:
+            np.ndarray: A (sizeX, sizeY, sizeZ, sizeW) boolean array.
+        """
+        bits = np.unpackbits(self.packed(), count=len(self.bits), bitorder=self.bits.endian)
+        return bits.view(bool).reshape(self.sizeZ, self.sizeY, self.sizeX, self.sizeW).transpose(2, 1, 0, 3)
+
+    def get_many(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, w: np.ndarray) -> np.ndarray:
+        """
+        Gets the boolean values at many 4-dimensional coordinates at once.
+
+        Args:
+            x (np.ndarray): The first dimension coordinates.
+            y (np.ndarray): The second dimension coordinates.
+            z (np.ndarray): The third dimension coordinates.
+            w (np.ndarray): The fourth dimension coordinates.
+
+        Returns:
+            np.ndarray: The boolean values at the specified coordinates.
+
+        Raises:
+            IndexError: If any of the coordinates are out of bounds.
+        """
+        index = self.index_many(x, y, z, w)
+        shift = 7 - (index & 7) if self.bits.endian == 'big' else index & 7
+        return (self.packed()[index >> 3] >> shift.astype(np.uint8)) & 1 != 0
+
+    def set_many(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, w: np.ndarray, values: np.ndarray) -> None:
+        """
+        Sets the boolean values at many 4-dimensional coordinates at once.
+
+        Args:
+            x (np.ndarray): The first dimension coordinates.
+            y (np.ndarray): The second dimension coordinates.
+            z (np.ndarray): The third dimension coordinates.
+            w (np.ndarray): The fourth dimension coordinates.
+            values (np.ndarray): The boolean values to set, or a single value for all coordinates.
+
+        Raises:
+            IndexError: If any of the coordinates are out of bounds.
+        """
+        index = self.index_many(x, y, z, w)
+        packed = self.packed()
+        bits = np.unpackbits(packed, count=len(self.bits), bitorder=self.bits.endian)
+        bits[index] = np.asarray(values, dtype=bool)
+        packed[:] = np.packbits(bits, bitorder=self.bits.endian)
+
     def index(self, x: int, y: int, z: int, w: int) -> int:
         """
         Computes the 1D index corresponding to the 4D coordinates.
@@ -136,3 +230,27 @@ class BitSet4D:
         index = index * self.sizeX + x
         index = index * self.sizeW + w
         return index
+
+    def index_many(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, w: np.ndarray) -> np.ndarray:
+        """
+        Computes the 1D indices corresponding to many 4D coordinates.
+
+        Args:
+            x (np.ndarray): The x-coordinates.
+            y (np.ndarray): The y-coordinates.
+            z (np.ndarray): The z-coordinates.
+            w (np.ndarray): The w-coordinates.
+
+        Returns:
+            np.ndarray: The computed 1D indices.
+
+        Raises:
+            IndexError: If any of the coordinates are out of bounds.
+        """
+        x, y, z, w = np.broadcast_arrays(*(np.asarray(a, dtype=np.int64) for a in (x, y, z, w)))
+        out_of_bounds = ((x < 0) | (y < 0) | (z < 0) | (w < 0) | (x >= self.sizeX) | (y >= self.sizeY)
+                         | (z >= self.sizeZ) | (w >= self.sizeW))
+        if out_of_bounds.any():
+            i = np.flatnonzero(out_of_bounds)[0]
+            raise IndexError(f"({x.flat[i]}, {y.flat[i]}, {z.flat[i]}, {w.flat[i]})")
+        return ((z * self.sizeY + y) * self.sizeX + x) * self.sizeW + w
@@ -1,15 +1,28 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass, field
-from ..worldpoint import WorldPoint
+from .. import worldpointutil
+
+REGION_SIZE = 64 * 64 * 4
+POOL_SIZE = 8
+
+_EMPTY_REGION = bytes(REGION_SIZE)
+_pool: List['CoordMap'] = []
+_OFFSETS = (0, 0, worldpointutil.N, worldpointutil.NE, worldpointutil.E, worldpointutil.SE,
+            worldpointutil.S, worldpointutil.SW, worldpointutil.W, worldpointutil.NW)
 
 @dataclass
 class CoordMap:
     """
     A mapping of WorldPoints to custom coordinates in various directions.
 
+    WorldPoints are passed packed into ints, see worldpointutil, so that a search never
+    has to allocate one.
+
     Attributes:
         regions (Dict[int, Optional[bytearray]]): A dictionary of region indices to the corresponding bytearrays of direction codes.
-        custom (Dict[WorldPoint, WorldPoint]): A dictionary of WorldPoints to custom coordinates.
+        custom (Dict[int, Optional[int]]): A dictionary of WorldPoints to custom coordinates.
+        stamps (Dict[int, int]): The generation each region was last cleared in.
+        generation (int): The current generation; regions stamped with an older one are cleared on their next access.
         NONE (int): A constant representing no direction.
         CUSTOM (int): A constant representing a custom direction.
         N (int): A constant representing the north direction.
@@ -20,18 +33,25 @@ class CoordMap:
         SW (int): A constant representing the south-west direction.
         W (int): A constant representing the west direction.
         NW (int): A constant representing the north-west direction.
+        START (int): A constant marking the start of a search, which has no predecessor.
 
     Methods:
-        contains_key(self, key: WorldPoint) -> bool:
+        contains_key(self, key: int) -> bool:
             Checks if the given WorldPoint is contained in the CoordMap.
-        get(self, key: WorldPoint) -> Optional[WorldPoint]:
+        get(self, key: int) -> Optional[int]:
             Retrieves the custom coordinate corresponding to the given WorldPoint.
-        put(self, key: WorldPoint, value: WorldPoint, code: int = 1) -> None:
+        put(self, key: int, value: Optional[int], code: int = 1) -> None:
             Associates a custom coordinate with the given WorldPoint and direction code.
-        index(self, world_point: WorldPoint) -> int:
+        index(self, world_point: int) -> int:
             Computes the index corresponding to the given WorldPoint.
-        region(self, world_point: WorldPoint) -> Optional[bytearray]:
+        region(self, world_point: int) -> Optional[bytearray]:
             Retrieves the bytearray corresponding to the region containing the given WorldPoint.
+        reset(self) -> None:
+            Empties the CoordMap without freeing its region buffers.
+        acquire(cls) -> CoordMap:
+            Takes an empty CoordMap from the pool, or creates one if the pool is empty.
+        release(self) -> None:
+            Empties the CoordMap and returns it to the pool.
 
     """
 
@@ -45,16 +65,19 @@ class CoordMap:
     SW: int = 7
     W: int = 8
     NW: int = 9
+    START: int = 10
 
     regions: Dict[int, Optional[bytearray]] = field(default_factory=dict)
-    custom: Dict[WorldPoint, WorldPoint] = field(default_factory=dict)
+    custom: Dict[int, Optional[int]] = field(default_factory=dict)
+    stamps: Dict[int, int] = field(default_factory=dict)
+    generation: int = 0
 
-    def contains_key(self, key: WorldPoint) -> bool:
+    def contains_key(self, key: int) -> bool:
         """
         Checks if the given WorldPoint is contained in the CoordMap.
 
         Args:
-            key (WorldPoint): The WorldPoint to check.
+            key (int): The packed WorldPoint to check.
 
         Returns:
             bool: True if the WorldPoint is contained in the CoordMap, False otherwise.
@@ -62,46 +85,33 @@ class CoordMap:
         region = self.region(key)
         return region is not None and region[self.index(key)] != 0
 
-    def get(self, key: WorldPoint) -> Optional[WorldPoint]:
+    def get(self, key: int) -> Optional[int]:
         """
         Retrieves the custom coordinate corresponding to the given WorldPoint.
 
         Args:
-            key (WorldPoint): The WorldPoint to retrieve the custom coordinate for.
+            key (int): The packed WorldPoint to retrieve the custom coordinate for.
 
         Returns:
-            Optional[WorldPoint]: The custom coordinate corresponding to the WorldPoint, or None if not found.
+            Optional[int]: The packed custom coordinate corresponding to the WorldPoint, or None if not found.
         """
         region = self.region(key)
         if region is not None:
             code = region[self.index(key)]
             if code == 1:
                 return self.custom.get(key)
-            elif code == 2:
-                return key.dy(1)
-            elif code == 3:
-                return key.dx(1).dy(1)
-            elif code == 4:
-                return key.dx(1)
-            elif code == 5:
-                return key.dx(1).dy(-1)
-            elif code == 6:
-                return key.dy(-1)
-            elif code == 7:
-                return key.dx(-1).dy(-1)
-            elif code == 8:
-                return key.dx(-1)
-            elif code == 9:
-                return key.dx(-1).dy(1)
+            if code == 10:
+                return None
+            return key + _OFFSETS[code]
         return key
 
-    def put(self, key: WorldPoint, value: WorldPoint, code: int = 1) -> None:
+    def put(self, key: int, value: Optional[int], code: int = 1) -> None:
         """
         Associates a custom coordinate with the given WorldPoint and direction code.
 
         Args:
-            key (WorldPoint): The WorldPoint to associate with a custom coordinate.
-            value (WorldPoint): The custom coordinate to associate with the WorldPoint.
+            key (int): The packed WorldPoint to associate with a custom coordinate.
+            value (Optional[int]): The packed custom coordinate to associate with the WorldPoint.
             code (int): The direction code to associate with the WorldPoint. Defaults to 1.
         """
         region = self.region(key)
@@ -110,31 +120,69 @@ class CoordMap:
             if code == 1:
                 self.custom[key] = value
 
-    def index(self, world_point: WorldPoint) -> int:
+    def index(self, world_point: int) -> int:
         """
         Computes the index corresponding to the given WorldPoint.
 
         Args:
-            world_point (WorldPoint): The WorldPoint to compute the index for.
+            world_point (int): The packed WorldPoint to compute the index for.
 
         Returns:
             int: The index corresponding to the WorldPoint.
         """
-        return world_point.getX() % 64 + world_point.getY() % 64 * 64 + world_point.getPlane() % 64 * 64 * 64
+        return worldpointutil.get_region_index(world_point)
 
-    def region(self, world_point: WorldPoint) -> Optional[bytearray]:
+    def region(self, world_point: int) -> Optional[bytearray]:
         """
         Retrieves the bytearray corresponding to the region containing the given WorldPoint.
 
         Args:
-            world_point (WorldPoint): The WorldPoint to retrieve the bytearray for.
+            world_point (int): The packed WorldPoint to retrieve the bytearray for.
 
         Returns:
             Optional[bytearray]: The bytearray corresponding to the region containing the WorldPoint, or None if not found.
         """
-        region_index = world_point.getX() // 64 * 256 + world_point.getY() // 64
+        region_index = worldpointutil.get_region_id(world_point)
         region = self.regions.get(region_index)
         if region is None:
-            region = bytearray(16384)
+            region = bytearray(REGION_SIZE)
             self.regions[region_index] = region
+            self.stamps[region_index] = self.generation
+        elif self.stamps[region_index] != self.generation:
+            region[:] = _EMPTY_REGION
+            self.stamps[region_index] = self.generation
         return region
+
+    def reset(self) -> None:
+        """
+        Empties the CoordMap without freeing its region buffers.
+
+        Bumping the generation marks every region as stale; a stale region is cleared in
+        place the next time it is accessed instead of being reallocated.
+        """
+        self.generation += 1
+        if self.custom:
+            self.custom.clear()
+
+    @classmethod
+    def acquire(cls) -> 'CoordMap':
+        """
+        Takes an empty CoordMap from the pool, or creates one if the pool is empty.
+
+        Returns:
+            CoordMap: An empty CoordMap.
+        """
+        try:
+            return _pool.pop()
+        except IndexError:
+            return cls()
+
+    def release(self) -> None:
+        """
+        Empties the CoordMap and returns it to the pool so a later search can reuse its buffers.
+
+        The CoordMap must not be used after it has been released.
+        """
+        self.reset()
+        if len(_pool) < POOL_SIZE:
+            _pool.append(self)
@@ -0,0 +1,134 @@
+from typing import Dict, Iterable, List, Optional
+from .coordmap import CoordMap
+from .pathfinder import Pathfinder
+from .reachability import ReachabilityIndex
+from .transport import TransportIndex
+from ..collisionmap import CollisionMap
+from ..worldpoint import WorldPoint
+from .. import worldpointutil
+import numpy as np
+
+
+class DistanceField(Pathfinder):
+    """
+    A resumable breadth-first flood from one origin that answers many path queries.
+
+    The flood keeps its predecessors and the step distance of every tile it has
+    reached, so asking for the nearest of N candidates, the distance to a tile or
+    the path to a tile only expands the tiles that no earlier query expanded.
+
+    Breadth-first search reaches tiles in order of distance, so the first candidate
+    reached is the nearest one.
+
+    Attributes:
+        targets (Set[WorldPoint]): The candidates find() searches for.
+        radius (Optional[int]): The maximum step distance to flood to, or None for no limit.
+        distances (Dict[int, np.ndarray]): The (4, 64, 64) int32 step distances of every region reached, indexed [plane, y, x], -1 where not reached.
+    """
+
+    def __init__(self, collision_map: CollisionMap, origin: WorldPoint, targets: Iterable[WorldPoint] = (),
+                 radius: Optional[int] = None, reachability: Optional[ReachabilityIndex] = None,
+                 transports: Optional[TransportIndex] = None):
+        super().__init__(collision_map, origin, None, reachability, transports)
+        self.targets = set(targets)
+        self.radius = radius
+        self.distances: Dict[int, np.ndarray] = {}
+        self._distance = 0
+        self._flat: Dict[int, np.ndarray] = {}
+        self._watching = set()
+        self._reached: Optional[int] = None
+        # The flood outlives any single query, so it owns its predecessors instead of borrowing pooled ones
+        self.predecessors = CoordMap()
+        self.boundary.append(origin.pack())
+        self.predecessors.put(origin.pack(), None, CoordMap.START)
+        self._set_distance(origin.pack(), 0)
+
+    def find(self) -> List[WorldPoint]:
+        return self.nearest(self.targets)
+
+    def nearest(self, targets: Iterable[WorldPoint]) -> List[WorldPoint]:
+        """
+        Finds the path to whichever of the candidates is the fewest steps away.
+
+        Args:
+            targets (Iterable[WorldPoint]): The candidate tiles.
+
+        Returns:
+            List[WorldPoint]: The path from the origin to the nearest candidate, or [] if none can be reached.
+        """
+        candidates = {target.pack() for target in targets
+                      if self.reachability is None or self.reachability.is_reachable(self.start, target)}
+        reached = [candidate for candidate in candidates if self.predecessors.contains_key(candidate)]
+        if reached:
+            return self._get_path(min(reached, key=self._packed_distance))
+
+        self._watching, self._reached = candidates, None
+        while self.boundary and self._reached is None:
+            self._expand()
+        self._watching = set()
+        return self._get_path(self._reached) if self._reached is not None else []
+
+    def flood(self) -> Dict[int, np.ndarray]:
+        """
+        Expands every tile within the radius.
+
+        Returns:
+            Dict[int, np.ndarray]: The step distances of every region reached.
+        """
+        while self.boundary:
+            self._expand()
+        return self.distances
+
+    def distance(self, point: WorldPoint) -> Optional[int]:
+        """
+        Returns the step distance from the origin to a tile the flood has reached.
+
+        Args:
+            point (WorldPoint): The tile.
+
+        Returns:
+            Optional[int]: The step distance, or None if the tile has not been reached (yet).
+        """
+        return self._packed_distance(point.pack())
+
+    def path_to(self, point: WorldPoint) -> List[WorldPoint]:
+        """
+        Returns the path from the origin to a tile, flooding further if needed.
+
+        Args:
+            point (WorldPoint): The tile.
+
+        Returns:
+            List[WorldPoint]: The path from the origin to the tile, or [] if it cannot be reached.
+        """
+        return self.nearest([point])
+
+    def _expand(self) -> None:
+        node = self.boundary.popleft()
+        self.expanded += 1
+        self._distance = self._packed_distance(node)
+        if self.radius is None or self._distance < self.radius:
+            self._add_neighbours(node)
+
+    def _add_neighbour(self, position: int, neighbour: int, code: int, step: int = 1):
+        if not self.predecessors.contains_key(neighbour):
+            self.predecessors.put(neighbour, position, code)
+            self._set_distance(neighbour, self._distance + 1)
+            self.boundary.append(neighbour)
+            if self._reached is None and neighbour in self._watching:
+                self._reached = neighbour
+
+    def _packed_distance(self, packed: int) -> Optional[int]:
+        distances = self._flat.get(worldpointutil.get_region_id(packed))
+        if distances is None:
+            return None
+        distance = distances.item(worldpointutil.get_region_index(packed))
+        return distance if distance >= 0 else None
+
+    def _set_distance(self, packed: int, distance: int) -> None:
+        region = worldpointutil.get_region_id(packed)
+        distances = self._flat.get(region)
+        if distances is None:
+            self.distances[region] = np.full((4, 64, 64), -1, dtype=np.int32)
+            distances = self._flat[region] = self.distances[region].reshape(-1)
+        distances[worldpointutil.get_region_index(packed)] = distance
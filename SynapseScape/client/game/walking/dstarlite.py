@@ -0,0 +1,199 @@
+from heapq import heappop, heappush
+from itertools import count
+from typing import Dict, List, Optional, Set, Tuple
+from .pathfinder import Pathfinder
+from .reachability import ReachabilityIndex
+from ..collisionmap import CollisionMap
+from ..worldpoint import WorldPoint
+from .. import worldpointutil
+
+INFINITY = float('inf')
+
+_STEPS = ((CollisionMap.N, worldpointutil.N), (CollisionMap.E, worldpointutil.E),
+          (CollisionMap.S, worldpointutil.S), (CollisionMap.W, worldpointutil.W),
+          (CollisionMap.NE, worldpointutil.NE), (CollisionMap.NW, worldpointutil.NW),
+          (CollisionMap.SE, worldpointutil.SE), (CollisionMap.SW, worldpointutil.SW))
+
+
+class DStarLitePathfinder(Pathfinder):
+    """
+    An incremental Pathfinder (D* Lite) that repairs its path when collision flags change.
+
+    The search runs backwards from the target, so the step distances it keeps (g)
+    stay valid while the player walks towards the target: call move_to as the player
+    moves and find again to get the rest of the path. Collision changes made through
+    GlobalCollisionMap.set are queued by a listener and applied on the next find,
+    which only re-expands the tiles whose distance the change affected, instead of
+    searching from scratch.
+
+    A changed flag can only change the moves of the 3x3 tiles around it, so only those
+    tiles are updated. A replaced region (set_many, create_region) resets the search.
+
+    Moves are symmetric on the collision map, so the tiles a tile can step to are also
+    the tiles that can step to it.
+
+    Attributes:
+        g (Dict[int, float]): The step distance to the target of every tile the search has settled, keyed by packed WorldPoint.
+        rhs (Dict[int, float]): The one-step lookahead of g for every tile the search has seen.
+        expanded (int): The number of tiles taken off the frontier by every find so far.
+    """
+
+    def __init__(self, collision_map: CollisionMap, start: WorldPoint, target: WorldPoint,
+                 reachability: Optional[ReachabilityIndex] = None):
+        # Pathfinder.__init__ is not called: the search keeps its own g and rhs instead of predecessors
+        self.collision_map = collision_map
+        self.start = start
+        self.target = target
+        self.reachability = reachability
+        self.transports = None
+        self.expanded = 0
+        self.boundary = []
+        self.g: Dict[int, float] = {}
+        self.rhs: Dict[int, float] = {}
+        self._keys: Dict[int, Tuple[float, float]] = {}
+        self._moves: Dict[int, int] = {}
+        self._sequence = count()
+        self._km = 0
+        self._last = start.pack()
+        self._pending: Set[int] = set()
+        self._stale = False
+        self._listening = hasattr(collision_map, 'add_listener')
+        self._reset()
+        if self._listening:
+            collision_map.add_listener(self._on_change)
+
+    def find(self) -> List[WorldPoint]:
+        """
+        Applies the queued collision changes and returns the path from the current start to the target.
+
+        Returns:
+            List[WorldPoint]: The path, or [] if the target cannot be reached.
+        """
+        if not self._is_reachable():
+            return []
+        self._apply_changes()
+        return self._search()
+
+    def move_to(self, start: WorldPoint) -> None:
+        """
+        Moves the start of the search, e.g. to the tile the player has walked to.
+
+        Args:
+            start (WorldPoint): The new start.
+        """
+        packed = start.pack()
+        self._km += worldpointutil.distance_2d(self._last, packed)
+        self._last = packed
+        self.start = start
+
+    def close(self) -> None:
+        """
+        Stops listening to the collision map. The pathfinder no longer sees collision changes afterwards.
+        """
+        if self._listening:
+            self.collision_map.remove_listener(self._on_change)
+            self._listening = False
+
+    def _search(self) -> List[WorldPoint]:
+        start = self.start.pack()
+        while self.boundary:
+            k1, k2, _, node = self.boundary[0]
+            if self._keys.get(node) != (k1, k2):
+                heappop(self.boundary)
+                continue
+            g_start, rhs_start = self.g.get(start, INFINITY), self.rhs.get(start, INFINITY)
+            if (k1, k2) >= self._key(start) and rhs_start == g_start:
+                break
+
+            heappop(self.boundary)
+            del self._keys[node]
+            self.expanded += 1
+            key = self._key(node)
+            g, rhs = self.g.get(node, INFINITY), self.rhs.get(node, INFINITY)
+            if (k1, k2) < key:
+                self._push(node, key)
+            elif g > rhs:
+                self.g[node] = rhs
+                for neighbour in self._neighbours(node):
+                    self._update(neighbour)
+            else:
+                self.g[node] = INFINITY
+                self._update(node)
+                for neighbour in self._neighbours(node):
+                    self._update(neighbour)
+        return self._get_path(start)
+
+    def _reset(self) -> None:
+        target = self.target.pack()
+        self.boundary.clear()
+        self.g.clear()
+        self.rhs.clear()
+        self._keys.clear()
+        self._moves.clear()
+        self._km = 0
+        self._last = self.start.pack()
+        self.rhs[target] = 0
+        self._push(target, self._key(target))
+
+    def _apply_changes(self) -> None:
+        if self._stale:
+            self._stale = False
+            self._pending.clear()
+            self._reset()
+            return
+
+        tiles = set()
+        for tile in self._pending:
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    tiles.add(worldpointutil.dx_dy(tile, dx, dy))
+        self._pending.clear()
+        for tile in tiles:
+            self._moves.pop(tile, None)
+        for tile in tiles:
+            self._update(tile)
+
+    def _on_change(self, region: int, tile: Optional[WorldPoint]) -> None:
+        if tile is None:
+            self._stale = True
+        else:
+            self._pending.add(tile.pack())
+
+    def _key(self, node: int) -> Tuple[float, float]:
+        best = min(self.g.get(node, INFINITY), self.rhs.get(node, INFINITY))
+        return best + worldpointutil.distance_2d(self._last, node) + self._km, best
+
+    def _push(self, node: int, key: Tuple[float, float]) -> None:
+        self._keys[node] = key
+        heappush(self.boundary, (key[0], key[1], next(self._sequence), node))
+
+    def _update(self, node: int) -> None:
+        if node != self.target.pack():
+            rhs = INFINITY
+            g = self.g
+            for neighbour in self._neighbours(node):
+                cost = g.get(neighbour, INFINITY) + 1
+                if cost < rhs:
+                    rhs = cost
+            self.rhs[node] = rhs
+        self._keys.pop(node, None)
+        if self.g.get(node, INFINITY) != self.rhs.get(node, INFINITY):
+            self._push(node, self._key(node))
+
+    def _neighbours(self, node: int) -> List[int]:
+        moves = self._moves.get(node)
+        if moves is None:
+            moves = self._moves[node] = self.collision_map.packed_moves(node)
+        return [node + offset for move, offset in _STEPS if moves & move]
+
+    def _get_path(self, node: int) -> List[WorldPoint]:
+        if self.g.get(node, INFINITY) == INFINITY:
+            return []
+        target = self.target.pack()
+        path = [WorldPoint.from_packed(node)]
+        while node != target:
+            node = min(self._neighbours(node), key=lambda neighbour: self.g.get(neighbour, INFINITY))
+            if self.g.get(node, INFINITY) == INFINITY:
+                return []
+            path.append(WorldPoint.from_packed(node))
+        return path
@@ -1,23 +1,47 @@
 from ..collisionmap import CollisionMap
-from typing import Optional
+from typing import Callable, List, Optional, Union
 from bitarray import bitarray
 from .bitset4d import BitSet4D
+from .regiontable import RegionTable
+from ..worldpoint import WorldPoint
+from .. import worldpointutil
 import numpy as np
+import mmap
+import os
 
 class GlobalCollisionMap(CollisionMap):
-    def __init__(self, data: bytes):
+    def __init__(self, data: Union[bytes, bytearray, mmap.mmap]):
         """
         Constructs a GlobalCollisionMap from the given byte data.
 
+        Only the region headers are read up front; each region is materialized on its
+        first lookup, see RegionTable.
+
         Args:
-            data (bytes): The byte data to construct the GlobalCollisionMap from.
+            data (Union[bytes, bytearray, mmap.mmap]): The byte data to construct the GlobalCollisionMap from.
+        """
+        self.regions = RegionTable(data)
+        self.listeners: List[Callable[[int, Optional[WorldPoint]], None]] = []
+
+    @classmethod
+    def from_file(cls, path: str) -> 'GlobalCollisionMap':
         """
-        self.regions = [None] * 65536
-        buffer = np.frombuffer(data, dtype=np.byte)
-        while buffer.size > 0:
-            region = buffer[0] << 8 | (buffer[1] & 0xff)
-            self.regions[region] = BitSet4D.from_buffer(buffer[2:], 64, 64, 4, 2)
-            buffer = buffer[4098:]
+        Constructs a GlobalCollisionMap from a memory-mapped collision file.
+
+        The file is mapped copy-on-write: regions are read in place from the mapping,
+        so processes loading the same file share its page cache, and a set() only
+        copies the pages it writes to, without ever modifying the file.
+
+        Args:
+            path (str): The path of the collision file.
+
+        Returns:
+            GlobalCollisionMap: The collision map backed by the file.
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b'')
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
 
     def to_bytes(self) -> bytes:
         """
@@ -26,11 +50,10 @@ class GlobalCollisionMap(CollisionMap):
         Returns:
             bytes: The GlobalCollisionMap represented as bytes.
         """
-        region_count = sum(1 for region in self.regions if region is not None)
-        buffer = bytearray(region_count * 4098)
-        for i, region in enumerate(self.regions):
-            if region is not None:
-                buffer[i*4098:(i+1)*4098] = region.to_bytes(i)
+        buffer = bytearray()
+        for region in self.regions.ids():
+            buffer.extend(region.to_bytes(2, 'big'))
+            self.regions[region].write(buffer)
         return bytes(buffer)
 
     def set(self, x: int, y: int, z: int, w: int, value: bool) -> None:
@@ -44,9 +67,11 @@ class GlobalCollisionMap(CollisionMap):
             w (int): The w coordinate.
             value (bool): The value to set.
         """
-        region = self.regions[x // 64 * 256 + y // 64]
-        if region is not None:
+        region_id = x // 64 * 256 + y // 64
+        region = self.regions[region_id]
+        if region is not None and region.get(x % 64, y % 64, z, w) != value:
             region.set(x % 64, y % 64, z, w, value)
+            self._notify(region_id, WorldPoint(x, y, z))
 
     def get(self, x: int, y: int, z: int, w: int) -> bool:
         """
@@ -66,6 +91,87 @@ class GlobalCollisionMap(CollisionMap):
             return region.get(x % 64, y % 64, z, w)
         return False
 
+    def get_packed(self, packed: int, w: int) -> bool:
+        """
+        Retrieves the value at the specified packed coordinates, see worldpointutil.
+
+        Args:
+            packed (int): The packed x, y and z coordinates.
+            w (int): The w coordinate.
+
+        Returns:
+            bool: The value at the specified coordinates.
+        """
+        region = self.regions[worldpointutil.get_region_id(packed)]
+        if region is not None:
+            return region.bits[worldpointutil.get_region_index(packed) << 1 | w]
+        return False
+
+    def get_many(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, w: np.ndarray) -> np.ndarray:
+        """
+        Retrieves the values at many coordinates at once.
+
+        Args:
+            x (np.ndarray): The x coordinates.
+            y (np.ndarray): The y coordinates.
+            z (np.ndarray): The z coordinates.
+            w (np.ndarray): The w coordinates.
+
+        Returns:
+            np.ndarray: The values at the specified coordinates, False outside of loaded regions.
+        """
+        x, y, z, w = np.broadcast_arrays(*(np.asarray(a, dtype=np.int64) for a in (x, y, z, w)))
+        values = np.zeros(x.shape, dtype=bool)
+        region_ids = x // 64 * 256 + y // 64
+        for region_id in np.unique(region_ids):
+            region = self.regions[int(region_id)]
+            if region is not None:
+                selected = region_ids == region_id
+                values[selected] = region.get_many(x[selected] % 64, y[selected] % 64, z[selected], w[selected])
+        return values
+
+    def set_many(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, w: np.ndarray, values: np.ndarray) -> None:
+        """
+        Sets the values at many coordinates at once.
+
+        Coordinates outside of loaded regions are ignored. Listeners are notified once
+        per changed region rather than once per tile.
+
+        Args:
+            x (np.ndarray): The x coordinates.
+            y (np.ndarray): The y coordinates.
+            z (np.ndarray): The z coordinates.
+            w (np.ndarray): The w coordinates.
+            values (np.ndarray): The values to set, or a single value for all coordinates.
+        """
+        x, y, z, w, values = np.broadcast_arrays(*(np.asarray(a, dtype=np.int64) for a in (x, y, z, w)),
+                                                 np.asarray(values, dtype=bool))
+        region_ids = x // 64 * 256 + y // 64
+        for region_id in np.unique(region_ids):
+            region = self.regions[int(region_id)]
+            if region is not None:
+                selected = region_ids == region_id
+                local = (x[selected] % 64, y[selected] % 64, z[selected], w[selected])
+                if (region.get_many(*local) != values[selected]).any():
+                    region.set_many(*local, values[selected])
+                    self._notify(int(region_id), None)
+
+    def region_view(self, region_id: int, plane: int) -> np.ndarray:
+        """
+        Unpacks the flags of one plane of a region.
+
+        Args:
+            region_id (int): The id of the region.
+            plane (int): The plane to unpack.
+
+        Returns:
+            np.ndarray: A (64, 64, 2) boolean array indexed [x, y, w], all False if the region is not loaded.
+        """
+        region = self.regions[region_id]
+        if region is None:
+            return np.zeros((64, 64, 2), dtype=bool)
+        return region.to_array()[:, :, plane, :]
+
     def create_region(self, region: int) -> None:
         """
         Creates a new region at the specified index.
@@ -75,6 +181,32 @@ class GlobalCollisionMap(CollisionMap):
         """
         self.regions[region] = BitSet4D(64, 64, 4, 2)
         self.regions[region].set_all(True)
+        self._notify(region, None)
+
+    def add_listener(self, listener: Callable[[int, Optional[WorldPoint]], None]) -> None:
+        """
+        Registers a callback that is invoked whenever collision data changes.
+
+        The callback receives the id of the changed region and the changed tile, or None
+        when the whole region was replaced.
+
+        Args:
+            listener (Callable[[int, Optional[WorldPoint]], None]): The callback to register.
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[int, Optional[WorldPoint]], None]) -> None:
+        """
+        Unregisters a callback previously passed to add_listener.
+
+        Args:
+            listener (Callable[[int, Optional[WorldPoint]], None]): The callback to unregister.
+        """
+        self.listeners.remove(listener)
+
+    def _notify(self, region: int, tile: Optional[WorldPoint]) -> None:
+        for listener in self.listeners:
+            listener(region, tile)
 
     def n(self, x: int, y: int, z: int) -> bool:
         return self.get(x, y, z, 0)
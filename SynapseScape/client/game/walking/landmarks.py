@@ -0,0 +1,220 @@
+from typing import Dict, List, Optional, Sequence
+from .distancefield import DistanceField
+from ..collisionmap import CollisionMap
+from ..worldpoint import WorldPoint
+from .. import worldpointutil
+import hashlib
+import os
+import numpy as np
+
+FORMAT_VERSION = 1
+UNREACHABLE = 0xFFFF
+
+
+def collision_hash(data: bytes) -> str:
+    """
+    Hashes serialized collision data, see GlobalCollisionMap.to_bytes.
+
+    Args:
+        data (bytes): The collision data.
+
+    Returns:
+        str: The hex digest identifying the collision data.
+    """
+    return hashlib.sha1(data).hexdigest()
+
+
+class LandmarkTable:
+    """
+    Precomputed step distances from a set of landmark tiles, for the ALT heuristic.
+
+    By the triangle inequality, |d(L, t) - d(L, n)| is a lower bound on the distance
+    from n to t for every landmark L. Around walls, rivers and cliffs this bound is
+    far tighter than the Chebyshev distance, so AStarPathfinder expands fewer tiles.
+
+    The distances are stored per region and plane, only for the planes a landmark
+    flood reached, as an (L, 4096) uint16 array indexed by the region-local index
+    x + 64 * y, with UNREACHABLE for tiles a landmark cannot reach. A table is
+    tied to the collision data it was built from by collision_hash.
+
+    Any collision change can shorten or lengthen distances anywhere, after which the
+    bound may overestimate. A table watching its collision map (see watch; build
+    and load_or_build watch the map they are given) marks itself stale on the first
+    change, and AStarPathfinder ignores stale tables until they are rebuilt.
+
+    Attributes:
+        landmarks (List[WorldPoint]): The landmark tiles.
+        distances (Dict[int, np.ndarray]): The landmark distances, keyed by region id << 2 | plane.
+        collision_hash (str): The hash of the collision data the table was built from.
+        stale (bool): Whether the collision map changed since the table was built.
+    """
+
+    def __init__(self, landmarks: List[WorldPoint], distances: Dict[int, np.ndarray], collision_hash: str):
+        self.landmarks = landmarks
+        self.distances = distances
+        self.collision_hash = collision_hash
+        self.stale = False
+        self._watching: Optional[CollisionMap] = None
+
+    @classmethod
+    def build(cls, collision_map: CollisionMap, landmarks: Sequence[WorldPoint], collision_hash: str) -> 'LandmarkTable':
+        """
+        Floods the whole map from every landmark. This is meant to be run offline.
+
+        Args:
+            collision_map (CollisionMap): The collision map to flood.
+            landmarks (Sequence[WorldPoint]): The landmark tiles.
+            collision_hash (str): The hash of the collision data, see collision_hash.
+
+        Returns:
+            LandmarkTable: The landmark distances.
+        """
+        distances: Dict[int, np.ndarray] = {}
+        for i, landmark in enumerate(landmarks):
+            for region, field in DistanceField(collision_map, landmark).flood().items():
+                for plane in range(4):
+                    reached = field[plane].reshape(-1)
+                    if (reached < 0).all():
+                        continue
+                    key = region << 2 | plane
+                    table = distances.get(key)
+                    if table is None:
+                        table = distances[key] = np.full((len(landmarks), 4096), UNREACHABLE, dtype=np.uint16)
+                    table[i] = np.where(reached < 0, UNREACHABLE, np.minimum(reached, UNREACHABLE - 1))
+        table = cls(list(landmarks), distances, collision_hash)
+        table.watch(collision_map)
+        return table
+
+    @staticmethod
+    def default_path(collision_path: str) -> str:
+        """
+        Returns where the landmark table of a collision file is stored, next to the file.
+
+        Args:
+            collision_path (str): The path of the collision file.
+
+        Returns:
+            str: The path of the landmark table.
+        """
+        return collision_path + '.landmarks.npz'
+
+    def save(self, path: str) -> None:
+        """
+        Writes the table to a compressed .npz file.
+
+        Args:
+            path (str): The path to write to.
+        """
+        keys = np.array(sorted(self.distances), dtype=np.int64)
+        tables = np.stack([self.distances[key] for key in keys.tolist()]) if len(keys) else \
+            np.zeros((0, len(self.landmarks), 4096), dtype=np.uint16)
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, version=np.array(FORMAT_VERSION), hash=np.array(self.collision_hash),
+                                landmarks=np.array([(p.x, p.y, p.plane) for p in self.landmarks], dtype=np.int32).reshape(-1, 3),
+                                keys=keys, distances=tables)
+
+    @classmethod
+    def load(cls, path: str, collision_hash: Optional[str] = None) -> Optional['LandmarkTable']:
+        """
+        Reads a table written by save.
+
+        Args:
+            path (str): The path to read from.
+            collision_hash (Optional[str]): If given, the hash the table must have been built with.
+
+        Returns:
+            Optional[LandmarkTable]: The table, or None if the file is missing, of another format version or built from other collision data.
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if int(data['version']) != FORMAT_VERSION:
+                return None
+            if collision_hash is not None and str(data['hash']) != collision_hash:
+                return None
+            landmarks = [WorldPoint(int(x), int(y), int(plane)) for x, y, plane in data['landmarks']]
+            distances = dict(zip(data['keys'].tolist(), data['distances']))
+            return cls(landmarks, distances, str(data['hash']))
+
+    @classmethod
+    def load_or_build(cls, collision_path: str, collision_map: CollisionMap, landmarks: Sequence[WorldPoint]) -> 'LandmarkTable':
+        """
+        Loads the table stored next to a collision file, rebuilding and saving it if it is missing or stale.
+
+        Args:
+            collision_path (str): The path of the collision file.
+            collision_map (CollisionMap): The collision map loaded from the file.
+            landmarks (Sequence[WorldPoint]): The landmark tiles to build with.
+
+        Returns:
+            LandmarkTable: The landmark distances.
+        """
+        with open(collision_path, 'rb') as f:
+            digest = collision_hash(f.read())
+        path = cls.default_path(collision_path)
+        table = cls.load(path, digest)
+        if table is None or table.landmarks != list(landmarks):
+            table = cls.build(collision_map, landmarks, digest)
+            table.save(path)
+        else:
+            table.watch(collision_map)
+        return table
+
+    def watch(self, collision_map: CollisionMap) -> None:
+        """
+        Marks the table stale on the next change of a collision map that supports listeners.
+
+        Args:
+            collision_map (CollisionMap): The collision map the table was built from.
+        """
+        self.unwatch()
+        if hasattr(collision_map, 'add_listener'):
+            collision_map.add_listener(self._on_change)
+            self._watching = collision_map
+
+    def unwatch(self) -> None:
+        """
+        Stops watching the collision map passed to watch.
+        """
+        if self._watching is not None:
+            self._watching.remove_listener(self._on_change)
+            self._watching = None
+
+    def _on_change(self, region: int, tile: Optional[WorldPoint]) -> None:
+        self.stale = True
+
+    def vector(self, packed: int) -> Optional[List[int]]:
+        """
+        Returns the distances from every landmark to a tile.
+
+        Args:
+            packed (int): The packed tile.
+
+        Returns:
+            Optional[List[int]]: The distance from each landmark, UNREACHABLE where it cannot reach the tile, or None if no landmark reaches the tile's region and plane.
+        """
+        key = worldpointutil.get_region_id(packed) << 2 | worldpointutil.unpack_world_plane(packed)
+        table = self.distances.get(key)
+        if table is None:
+            return None
+        return table[:, worldpointutil.get_region_index(packed) & 4095].tolist()
+
+    @staticmethod
+    def bound(a: Optional[List[int]], b: Optional[List[int]]) -> int:
+        """
+        Computes the ALT lower bound on the distance between two tiles from their landmark vectors.
+
+        Args:
+            a (Optional[List[int]]): The landmark vector of the first tile.
+            b (Optional[List[int]]): The landmark vector of the second tile.
+
+        Returns:
+            int: A lower bound on the number of steps between the tiles.
+        """
+        if a is None or b is None:
+            return 0
+        bound = 0
+        for da, db in zip(a, b):
+            if da != UNREACHABLE and db != UNREACHABLE and abs(da - db) > bound:
+                bound = abs(da - db)
+        return bound
@@ -0,0 +1,164 @@
+from typing import Callable, Dict, List, Optional
+from .regiontable import RegionTable
+from .globalcollisionmap import GlobalCollisionMap
+from ..collisionmap import CollisionMap
+from ..worldpoint import WorldPoint
+from .. import worldpointutil
+import numpy as np
+
+
+class MovementMaskMap(CollisionMap):
+    """
+    A CollisionMap that stores the eight legal moves of every tile as a single byte.
+
+    The masks are derived from the n/e flag planes of a GlobalCollisionMap, one
+    4 * 64 * 64 byte layer per region, indexed by x + 64 * y + 4096 * plane. Every
+    query, including the diagonal ones, is a single byte lookup instead of up to four
+    flag lookups.
+
+    The layer listens to the GlobalCollisionMap it was built from: a changed flag
+    recomputes the masks of the 3x3 tiles around it, and a replaced region rebuilds
+    the region and its eight neighbours.
+
+    Attributes:
+        collision_map (GlobalCollisionMap): The collision map the masks are derived from.
+        masks (Dict[int, bytearray]): The movement masks of every loaded region.
+    """
+
+    def __init__(self, collision_map: GlobalCollisionMap):
+        self.collision_map = collision_map
+        self.masks: Dict[int, bytearray] = {}
+        for region in collision_map.regions.ids():
+            self.build_region(region)
+        collision_map.add_listener(self._on_change)
+
+    def build_region(self, region: int) -> None:
+        """
+        Recomputes the movement masks of a whole region with vectorized operations.
+
+        Args:
+            region (int): The id of the region to build.
+        """
+        if self.collision_map.regions[region] is None:
+            self.masks.pop(region, None)
+            return
+
+        # Flags of the region padded with a one tile border from its eight neighbours,
+        # indexed [plane, y + 1, x + 1, flag].
+        flags = np.zeros((4, 66, 66, 2), dtype=bool)
+        region_x, region_y = region >> 8, region & 0xFF
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if not (0 <= region_x + dx < 256 and 0 <= region_y + dy < 256):
+                    continue
+                neighbour = self._flags((region_x + dx) << 8 | (region_y + dy))
+                if neighbour is None:
+                    continue
+                src_x = slice(63, 64) if dx < 0 else slice(0, 1) if dx > 0 else slice(0, 64)
+                src_y = slice(63, 64) if dy < 0 else slice(0, 1) if dy > 0 else slice(0, 64)
+                dst_x = slice(0, 1) if dx < 0 else slice(65, 66) if dx > 0 else slice(1, 65)
+                dst_y = slice(0, 1) if dy < 0 else slice(65, 66) if dy > 0 else slice(1, 65)
+                flags[:, dst_y, dst_x] = neighbour[:, src_y, src_x]
+
+        north, east = flags[..., 0], flags[..., 1]
+
+        def n(dx: int, dy: int) -> np.ndarray:
+            return north[:, 1 + dy:65 + dy, 1 + dx:65 + dx]
+
+        def e(dx: int, dy: int) -> np.ndarray:
+            return east[:, 1 + dy:65 + dy, 1 + dx:65 + dx]
+
+        s, w = n(0, -1), e(-1, 0)
+        masks = np.zeros((4, 64, 64), dtype=np.uint8)
+        masks |= n(0, 0) * np.uint8(self.N)
+        masks |= e(0, 0) * np.uint8(self.E)
+        masks |= s * np.uint8(self.S)
+        masks |= w * np.uint8(self.W)
+        masks |= (n(0, 0) & e(0, 1) & e(0, 0) & n(1, 0)) * np.uint8(self.NE)
+        masks |= (n(0, 0) & e(-1, 1) & w & n(-1, 0)) * np.uint8(self.NW)
+        masks |= (s & e(0, -1) & e(0, 0) & n(1, -1)) * np.uint8(self.SE)
+        masks |= (s & e(-1, -1) & w & n(-1, -1)) * np.uint8(self.SW)
+        self.masks[region] = bytearray(masks.tobytes())
+
+    @property
+    def regions(self) -> RegionTable:
+        return self.collision_map.regions
+
+    def add_listener(self, listener: Callable[[int, Optional[WorldPoint]], None]) -> None:
+        """
+        Registers a callback on the underlying collision map.
+
+        The masks listen first, so the callback already sees the updated masks.
+
+        Args:
+            listener (Callable[[int, Optional[WorldPoint]], None]): The callback to register.
+        """
+        self.collision_map.add_listener(listener)
+
+    def remove_listener(self, listener: Callable[[int, Optional[WorldPoint]], None]) -> None:
+        """
+        Unregisters a callback from the underlying collision map.
+
+        Args:
+            listener (Callable[[int, Optional[WorldPoint]], None]): The callback to unregister.
+        """
+        self.collision_map.remove_listener(listener)
+
+    def moves(self, x: int, y: int, z: int) -> int:
+        mask = self.masks.get(x // 64 * 256 + y // 64)
+        if mask is None:
+            return 0
+        return mask[x % 64 + y % 64 * 64 + z * 4096]
+
+    def packed_moves(self, packed: int) -> int:
+        mask = self.masks.get(worldpointutil.get_region_id(packed))
+        if mask is None:
+            return 0
+        return mask[worldpointutil.get_region_index(packed)]
+
+    def n(self, x: int, y: int, z: int) -> bool:
+        return self.moves(x, y, z) & self.N != 0
+
+    def e(self, x: int, y: int, z: int) -> bool:
+        return self.moves(x, y, z) & self.E != 0
+
+    def s(self, x: int, y: int, z: int) -> bool:
+        return self.moves(x, y, z) & self.S != 0
+
+    def w(self, x: int, y: int, z: int) -> bool:
+        return self.moves(x, y, z) & self.W != 0
+
+    def ne(self, x: int, y: int, z: int) -> bool:
+        return self.moves(x, y, z) & self.NE != 0
+
+    def nw(self, x: int, y: int, z: int) -> bool:
+        return self.moves(x, y, z) & self.NW != 0
+
+    def se(self, x: int, y: int, z: int) -> bool:
+        return self.moves(x, y, z) & self.SE != 0
+
+    def sw(self, x: int, y: int, z: int) -> bool:
+        return self.moves(x, y, z) & self.SW != 0
+
+    def _flags(self, region: int) -> Optional[np.ndarray]:
+        bits = self.collision_map.regions[region]
+        if bits is None:
+            return None
+        return bits.to_array().transpose(2, 1, 0, 3)
+
+    def _on_change(self, region: int, tile: Optional[WorldPoint]) -> None:
+        if tile is None:
+            region_x, region_y = region >> 8, region & 0xFF
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    if 0 <= region_x + dx < 256 and 0 <= region_y + dy < 256:
+                        neighbour = (region_x + dx) << 8 | (region_y + dy)
+                        if neighbour == region or neighbour in self.masks:
+                            self.build_region(neighbour)
+            return
+
+        for x in range(tile.x - 1, tile.x + 2):
+            for y in range(tile.y - 1, tile.y + 2):
+                mask = self.masks.get(x // 64 * 256 + y // 64)
+                if mask is not None:
+                    mask[x % 64 + y % 64 * 64 + tile.plane * 4096] = self.collision_map.moves(x, y, tile.plane)
@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+from .astar import AStarPathfinder
+from .globalcollisionmap import GlobalCollisionMap
+from .pathfinder import Pathfinder
+from .reachability import ReachabilityIndex
+from ..worldpoint import WorldPoint
+
+
+class PathCache:
+    """
+    A bounded LRU cache of paths in front of a Pathfinder.
+
+    Entries are keyed by (start, target), or by (start region, target) when
+    key_by_region is set; a region-keyed entry answers any start that lies on its
+    path with the remainder of the path, which is a shortest path as well. A query
+    without a path is always keyed by its exact start, since other starts in the
+    same region may still reach the target.
+
+    The cache listens to the collision map and only drops the entries whose path
+    passes through a changed region. Entries without a path depend on every region,
+    so they are dropped on any change.
+
+    Attributes:
+        collision_map (GlobalCollisionMap): The collision map to search on and listen to, or a MovementMaskMap wrapping one.
+        pathfinder (Callable[..., Pathfinder]): Creates the Pathfinder run on a miss.
+        max_size (int): The maximum number of cached paths.
+        key_by_region (bool): Whether entries are keyed by the region of the start instead of the start itself.
+        reachability (Optional[ReachabilityIndex]): Passed on to the Pathfinder.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that ran the Pathfinder.
+        invalidations (int): The number of entries dropped because of collision changes.
+    """
+
+    def __init__(self, collision_map: GlobalCollisionMap,
+                 pathfinder: Callable[..., Pathfinder] = AStarPathfinder, max_size: int = 1024,
+                 key_by_region: bool = False, reachability: Optional[ReachabilityIndex] = None):
+        self.collision_map = collision_map
+        self.pathfinder = pathfinder
+        self.max_size = max_size
+        self.key_by_region = key_by_region
+        self.reachability = reachability
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._paths: 'OrderedDict[Tuple[Hashable, WorldPoint], List[WorldPoint]]' = OrderedDict()
+        self._regions: Dict[Tuple[Hashable, WorldPoint], Set[int]] = {}
+        self._by_region: Dict[int, Set[Tuple[Hashable, WorldPoint]]] = {}
+        self._unreachable: Set[Tuple[Hashable, WorldPoint]] = set()
+        collision_map.add_listener(self._on_change)
+
+    def find(self, start: WorldPoint, target: WorldPoint) -> List[WorldPoint]:
+        """
+        Returns a path from start to target, searching only if no cached path applies.
+
+        Args:
+            start (WorldPoint): The start of the path.
+            target (WorldPoint): The target of the path.
+
+        Returns:
+            List[WorldPoint]: The path, or [] if the target cannot be reached.
+        """
+        key = (start.get_region_id() if self.key_by_region else start, target)
+        path = self._lookup(key, start)
+        if path is None and self.key_by_region:
+            path = self._lookup((start, target), start)
+        if path is not None:
+            self.hits += 1
+            return path
+
+        self.misses += 1
+        path = self.pathfinder(self.collision_map, start, target, self.reachability).find()
+        # Another start in the same region may well reach the target, so no path is only cached for this start
+        self._put(key if path else (start, target), path)
+        return list(path)
+
+    def clear(self) -> None:
+        """
+        Drops every cached path.
+        """
+        self._paths.clear()
+        self._regions.clear()
+        self._by_region.clear()
+        self._unreachable.clear()
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def _lookup(self, key: Tuple[Hashable, WorldPoint], start: WorldPoint) -> Optional[List[WorldPoint]]:
+        path = self._paths.get(key)
+        if path is None:
+            return None
+        offset = self._offset(path, start, key)
+        if offset is None:
+            return None
+        self._paths.move_to_end(key)
+        return path[offset:]
+
+    def _offset(self, path: List[WorldPoint], start: WorldPoint, key: Tuple[Hashable, WorldPoint]) -> Optional[int]:
+        if not path:
+            return 0 if key[0] == start else None
+        if path[0] == start:
+            return 0
+        if self.key_by_region:
+            try:
+                return path.index(start)
+            except ValueError:
+                return None
+        return None
+
+    def _put(self, key: Tuple[Hashable, WorldPoint], path: List[WorldPoint]) -> None:
+        if key in self._paths:
+            self._remove(key)
+        self._paths[key] = path
+        if path:
+            regions = {point.get_region_id() for point in path}
+            # A diagonal step also depends on the flags of the two tiles it cuts past.
+            for a, b in zip(path, path[1:]):
+                if a.x != b.x and a.y != b.y:
+                    regions.add(WorldPoint(a.x, b.y, a.plane).get_region_id())
+                    regions.add(WorldPoint(b.x, a.y, a.plane).get_region_id())
+            self._regions[key] = regions
+            for region in regions:
+                self._by_region.setdefault(region, set()).add(key)
+        else:
+            self._unreachable.add(key)
+        while len(self._paths) > self.max_size:
+            self._remove(next(iter(self._paths)))
+
+    def _remove(self, key: Tuple[Hashable, WorldPoint]) -> None:
+        del self._paths[key]
+        self._unreachable.discard(key)
+        for region in self._regions.pop(key, ()):
+            keys = self._by_region[region]
+            keys.discard(key)
+            if not keys:
+                del self._by_region[region]
+
+    def _on_change(self, region: int, tile: Optional[WorldPoint]) -> None:
+        stale = self._by_region.get(region, set()) | self._unreachable
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
@@ -1,26 +1,46 @@
 from collections import deque
-from typing import List
+from typing import List, Optional
 from .coordmap import CoordMap
+from .reachability import ReachabilityIndex
+from .transport import TransportIndex
 from ..collisionmap import CollisionMap
 from ..worldpoint import WorldPoint
+from .. import worldpointutil
 
 
 class Pathfinder:
-    def __init__(self, collision_map: CollisionMap, start: WorldPoint, target: WorldPoint):
+    def __init__(self, collision_map: CollisionMap, start: WorldPoint, target: WorldPoint,
+                 reachability: Optional[ReachabilityIndex] = None, transports: Optional[TransportIndex] = None):
         self.collision_map = collision_map
         self.start = start
         self.target = target
+        self.reachability = reachability
+        self.transports = transports
         self.boundary = deque()
-        self.predecessors = CoordMap()
+        self.predecessors: Optional[CoordMap] = None
+        self.expanded = 0
 
     def find(self) -> List[WorldPoint]:
-        self.boundary.append(self.start)
-        self.predecessors[self.start] = None
+        if not self._is_reachable():
+            return []
+        # The predecessors only live for one search, so their buffers go back to the pool right after it
+        self.predecessors = CoordMap.acquire()
+        try:
+            return self._search()
+        finally:
+            self.predecessors.release()
+            self.predecessors = None
+
+    def _search(self) -> List[WorldPoint]:
+        start, target = self.start.pack(), self.target.pack()
+        self.boundary.append(start)
+        self.predecessors.put(start, None, CoordMap.START)
 
         while self.boundary:
             node = self.boundary.popleft()
+            self.expanded += 1
 
-            if node == self.target:
+            if node == target:
                 path = self._get_path(node)
                 return path
 
@@ -28,58 +48,50 @@ class Pathfinder:
 
         return []
 
-    def _add_neighbours(self, position: WorldPoint):
-        if self.collision_map.w(position.x, position.y, position.plane):
-            neighbor = position.dx(-1)
-            if neighbor not in self.predecessors:
-                self.predecessors.put_east(neighbor)
-                self.boundary.append(neighbor)
-
-        if self.collision_map.e(position.x, position.y, position.plane):
-            neighbor = position.dx(1)
-            if neighbor not in self.predecessors:
-                self.predecessors.put_west(neighbor)
-                self.boundary.append(neighbor)
-
-        if self.collision_map.s(position.x, position.y, position.plane):
-            neighbor = position.dy(-1)
-            if neighbor not in self.predecessors:
-                self.predecessors.put_north(neighbor)
-                self.boundary.append(neighbor)
-
-        if self.collision_map.n(position.x, position.y, position.plane):
-            neighbor = position.dy(1)
-            if neighbor not in self.predecessors:
-                self.predecessors.put_south(neighbor)
-                self.boundary.append(neighbor)
-
-        if self.collision_map.sw(position.x, position.y, position.plane):
-            neighbor = position.dx(-1).dy(-1)
-            if neighbor not in self.predecessors:
-                self.predecessors.put_northeast(neighbor)
-                self.boundary.append(neighbor)
-
-        if self.collision_map.se(position.x, position.y, position.plane):
-            neighbor = position.dx(1).dy(-1)
-            if neighbor not in self.predecessors:
-                self.predecessors.put_northwest(neighbor)
-                self.boundary.append(neighbor)
-
-        if self.collision_map.nw(position.x, position.y, position.plane):
-            neighbor = position.dx(-1).dy(1)
-            if neighbor not in self.predecessors:
-                self.predecessors.put_southeast(neighbor)
-                self.boundary.append(neighbor)
-
-        if self.collision_map.ne(position.x, position.y, position.plane):
-            neighbor = position.dx(1).dy(1)
-            if neighbor not in self.predecessors:
-                self.predecessors.put_southwest(neighbor)
-                self.boundary.append(neighbor)
-
-    def _get_path(self, node: WorldPoint) -> List[WorldPoint]:
+    def _is_reachable(self) -> bool:
+        return self.reachability is None or self.reachability.is_reachable(self.start, self.target)
+
+    def _add_neighbours(self, position: int):
+        moves = self.collision_map.packed_moves(position)
+
+        if moves & CollisionMap.W:
+            self._add_neighbour(position, position + worldpointutil.W, CoordMap.E)
+
+        if moves & CollisionMap.E:
+            self._add_neighbour(position, position + worldpointutil.E, CoordMap.W)
+
+        if moves & CollisionMap.S:
+            self._add_neighbour(position, position + worldpointutil.S, CoordMap.N)
+
+        if moves & CollisionMap.N:
+            self._add_neighbour(position, position + worldpointutil.N, CoordMap.S)
+
+        if moves & CollisionMap.SW:
+            self._add_neighbour(position, position + worldpointutil.SW, CoordMap.NE)
+
+        if moves & CollisionMap.SE:
+            self._add_neighbour(position, position + worldpointutil.SE, CoordMap.NW)
+
+        if moves & CollisionMap.NW:
+            self._add_neighbour(position, position + worldpointutil.NW, CoordMap.SE)
+
+        if moves & CollisionMap.NE:
+            self._add_neighbour(position, position + worldpointutil.NE, CoordMap.SW)
+
+        if self.transports is not None:
+            # Breadth-first search counts a transport as one step whatever its cost; AStarPathfinder honours the costs.
+            for destination, cost in self.transports.edges.get(position, ()):
+                self._add_neighbour(position, destination, CoordMap.CUSTOM, cost)
+
+    def _add_neighbour(self, position: int, neighbour: int, code: int, step: int = 1):
+        if not self.predecessors.contains_key(neighbour):
+            self.predecessors.put(neighbour, position, code)
+            self.boundary.append(neighbour)
+
+    def _get_path(self, node: int) -> List[WorldPoint]:
         path = []
         while node is not None:
-            path.insert(0, node)
-            node = self.predecessors[node]
+            path.append(WorldPoint.from_packed(node))
+            node = self.predecessors.get(node)
+        path.reverse()
         return path
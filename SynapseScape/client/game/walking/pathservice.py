@@ -0,0 +1,149 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+from .astar import AStarPathfinder
+from .globalcollisionmap import GlobalCollisionMap
+from .pathfinder import Pathfinder
+from ..worldpoint import WorldPoint
+import asyncio
+import os
+
+_collision_map: Optional[GlobalCollisionMap] = None
+_pathfinder: Optional[Callable[..., Pathfinder]] = None
+
+
+def _init_worker(collision_path: str, pathfinder: Callable[..., Pathfinder]) -> None:
+    global _collision_map, _pathfinder
+    _collision_map = GlobalCollisionMap.from_file(collision_path)
+    _pathfinder = pathfinder
+
+
+def _find_batch(queries: List[Tuple[int, int]]) -> List[List[int]]:
+    paths = []
+    for start, target in queries:
+        path = _pathfinder(_collision_map, WorldPoint.from_packed(start), WorldPoint.from_packed(target)).find()
+        paths.append([point.pack() for point in path])
+    return paths
+
+
+class PathService:
+    """
+    Answers path queries of many bots on a pool of worker processes.
+
+    Every worker maps the same collision file with GlobalCollisionMap.from_file, so
+    the workers share its pages through the page cache instead of each holding a
+    copy, and memory does not grow with the number of bots using the service.
+
+    Queries are sent to the workers in chunks of chunk_size and answered with
+    futures, or with awaitables by the *_async methods, so an asyncio loop such as
+    the websocket server never blocks on a search. Paths cross the process boundary
+    as packed WorldPoints, see worldpointutil.
+
+    Attributes:
+        collision_path (str): The path of the collision file the workers load.
+        workers (int): The number of worker processes.
+        chunk_size (int): The maximum number of queries sent to a worker at once.
+    """
+
+    def __init__(self, collision_path: str, workers: Optional[int] = None,
+                 pathfinder: Callable[..., Pathfinder] = AStarPathfinder, chunk_size: int = 16):
+        """
+        Starts the worker processes.
+
+        Args:
+            collision_path (str): The path of the collision file the workers load.
+            workers (Optional[int]): The number of worker processes, or None for one per core.
+            pathfinder (Callable[..., Pathfinder]): Creates the Pathfinder the workers run; it must be picklable, e.g. a class.
+            chunk_size (int): The maximum number of queries sent to a worker at once.
+        """
+        self.collision_path = collision_path
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(collision_path, pathfinder))
+
+    def submit(self, start: WorldPoint, target: WorldPoint) -> 'Future[List[WorldPoint]]':
+        """
+        Queues a single path query.
+
+        Args:
+            start (WorldPoint): The start of the path.
+            target (WorldPoint): The target of the path.
+
+        Returns:
+            Future[List[WorldPoint]]: The path, or [] if the target cannot be reached.
+        """
+        return self.submit_batch([(start, target)])[0]
+
+    def submit_batch(self, queries: Sequence[Tuple[WorldPoint, WorldPoint]]) -> List['Future[List[WorldPoint]]']:
+        """
+        Queues a batch of path queries, split into chunks across the workers.
+
+        Args:
+            queries (Sequence[Tuple[WorldPoint, WorldPoint]]): The (start, target) pairs.
+
+        Returns:
+            List[Future[List[WorldPoint]]]: The path of each query, in the order of the queries.
+        """
+        futures = [Future() for _ in queries]
+        for offset in range(0, len(queries), self.chunk_size):
+            chunk = [(start.pack(), target.pack()) for start, target in queries[offset:offset + self.chunk_size]]
+            self._executor.submit(_find_batch, chunk).add_done_callback(
+                lambda done, results=futures[offset:offset + len(chunk)]: self._resolve(done, results))
+        return futures
+
+    async def find_async(self, start: WorldPoint, target: WorldPoint) -> List[WorldPoint]:
+        """
+        Awaits a single path query without blocking the event loop.
+
+        Args:
+            start (WorldPoint): The start of the path.
+            target (WorldPoint): The target of the path.
+
+        Returns:
+            List[WorldPoint]: The path, or [] if the target cannot be reached.
+        """
+        return await asyncio.wrap_future(self.submit(start, target))
+
+    async def find_batch_async(self, queries: Sequence[Tuple[WorldPoint, WorldPoint]]) -> List[List[WorldPoint]]:
+        """
+        Awaits a batch of path queries without blocking the event loop.
+
+        Args:
+            queries (Sequence[Tuple[WorldPoint, WorldPoint]]): The (start, target) pairs.
+
+        Returns:
+            List[List[WorldPoint]]: The path of each query, in the order of the queries.
+        """
+        return list(await asyncio.gather(*(asyncio.wrap_future(future) for future in self.submit_batch(queries))))
+
+    def close(self) -> None:
+        """
+        Stops the worker processes once the queued queries are answered.
+        """
+        self._executor.shutdown()
+
+    def __enter__(self) -> 'PathService':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def _resolve(done: Future, results: List[Future]) -> None:
+        if done.cancelled():
+            # The chunk was dropped before a worker took it, e.g. by shutdown(cancel_futures=True)
+            for result in results:
+                # Notifying moves the future to the state wait() and as_completed() count as done
+                result.cancel()
+                result.set_running_or_notify_cancel()
+            return
+        error = done.exception()
+        paths = done.result() if error is None else [None] * len(results)
+        for result, path in zip(results, paths):
+            # Callers may have cancelled their future in the meantime
+            if not result.set_running_or_notify_cancel():
+                continue
+            if error is not None:
+                result.set_exception(error)
+            else:
+                result.set_result([WorldPoint.from_packed(packed) for packed in path])
@@ -0,0 +1,344 @@
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+from .globalcollisionmap import GlobalCollisionMap
+from .transport import Transport, TransportIndex
+from ..worldpoint import WorldPoint
+import numpy as np
+
+# Component ids start above every (region, label) key, so they never collide with a key that is its own component
+COMPONENT_BASE = 1 << 30
+
+
+class ReachabilityIndex:
+    """
+    A connected-component labeling of the walkable graph of a GlobalCollisionMap, per plane.
+
+    A diagonal step is only legal when both of the straight steps around it are, so
+    the components of the eight-way graph are those of the four-way graph given by
+    the n/e flags. Every region stores the label of each of its 4 * 64 * 64 tiles,
+    computed with vectorized min-label propagation and pointer jumping; the label of
+    a tile is the index x + 64 * y + 4096 * plane of a tile in the same component.
+    Components that touch across region borders are linked in a graph over
+    (region, label) keys, and the component of every linked key is cached, so that
+    is_reachable is a couple of array and dict lookups.
+
+    Changed regions are relabelled lazily, on the first query after the change. Only
+    the links of the relabelled regions are rebuilt, and only the components they
+    were part of are recomputed, with breadth-first searches over the key graph that
+    stop as soon as they meet; when a change splits a component, only its smaller
+    sides are walked in full.
+
+    Given a TransportIndex, the components at both ends of every transport are merged
+    too, so routes across planes are not rejected; transports added to the index
+    later are merged on the next query. Transports are one-way, so a tile may be
+    reported reachable when only the reverse route exists, but a reachable tile is
+    never reported unreachable.
+
+    Attributes:
+        collision_map (GlobalCollisionMap): The collision map the index is built over.
+        transports (Optional[TransportIndex]): The transports linking components.
+        labels (Dict[int, np.ndarray]): The (4, 64, 64) uint16 tile labels of every loaded region, indexed [plane, y, x].
+    """
+
+    def __init__(self, collision_map: GlobalCollisionMap, transports: Optional[TransportIndex] = None):
+        self.collision_map = collision_map
+        self.transports = transports
+        self.labels: Dict[int, np.ndarray] = {}
+        self._graph: Dict[int, Set[int]] = {}
+        self._roots: Dict[int, int] = {}
+        self._members: Dict[int, Set[int]] = {}
+        self._transport_regions: Dict[int, List[Transport]] = {}
+        self._transport_version = 0
+        self._next_component = COMPONENT_BASE
+        self._built = False
+        self._dirty: Set[int] = set(collision_map.regions.ids())
+        collision_map.add_listener(self._on_change)
+
+    def is_reachable(self, a: WorldPoint, b: WorldPoint) -> bool:
+        """
+        Checks whether a path exists between two tiles.
+
+        Args:
+            a (WorldPoint): The first tile.
+            b (WorldPoint): The second tile.
+
+        Returns:
+            bool: True if b can be reached from a, False otherwise.
+        """
+        if a == b:
+            return True
+        component = self.component(a)
+        return component is not None and component == self.component(b)
+
+    def component(self, point: WorldPoint) -> Optional[int]:
+        """
+        Returns an identifier of the connected component containing a tile.
+
+        Args:
+            point (WorldPoint): The tile.
+
+        Returns:
+            Optional[int]: The component identifier, or None if the tile is not in a loaded region.
+        """
+        self.update()
+        key = self._key(point)
+        return self._roots.get(key, key) if key is not None else None
+
+    def update(self) -> None:
+        """
+        Relabels the regions that changed since the last query and recomputes the components they were part of.
+
+        Transports added since the last query are merged as well.
+        """
+        if self._dirty:
+            self._update_regions()
+        if self.transports is not None and self.transports.version != self._transport_version:
+            self._update_transports()
+
+    def _update_regions(self) -> None:
+        dirty, self._dirty = self._dirty, set()
+        if not self._built:
+            for region in dirty:
+                self._label(region)
+            self._build()
+            return
+
+        removed: Set[int] = set()
+        for region in dirty:
+            labels = self.labels.get(region)
+            if labels is not None:
+                removed.update((region << 14 | np.unique(labels).astype(np.int64)).tolist())
+            self._label(region)
+        seeds, affected = self._unlink(removed)
+        added: List[int] = []
+        for region in dirty:
+            for a, b in self._borders(region):
+                added += self._link(a, b)
+            for transport in self._transport_regions.get(region, ()):
+                added += self._link_transport(transport)
+        seeds.update(key for key in added if key >> 14 in dirty)
+        self._recompute(seeds, affected)
+
+    def _update_transports(self) -> None:
+        # A TransportIndex only grows, so the new transports can only join components
+        linked = {transport for transports in self._transport_regions.values() for transport in transports}
+        for transport in self.transports:
+            if transport in linked:
+                continue
+            linked.add(transport)
+            for region in {transport.origin.get_region_id(), transport.destination.get_region_id()}:
+                self._transport_regions.setdefault(region, []).append(transport)
+            keys = self._link_transport(transport)
+            if keys:
+                self._assign(keys, {self._roots[key] for key in keys if key in self._roots})
+        self._transport_version = self.transports.version
+
+    def _key(self, point: WorldPoint) -> Optional[int]:
+        region = point.get_region_id()
+        labels = self.labels.get(region)
+        if labels is None:
+            return None
+        return region << 14 | labels.item(point.plane, point.get_region_y(), point.get_region_x())
+
+    def _label(self, region: int) -> None:
+        bits = self.collision_map.regions[region]
+        if bits is None:
+            self.labels.pop(region, None)
+            return
+        flags = bits.to_array().transpose(2, 1, 0, 3)
+        north, east = flags[:, :63, :, 0], flags[:, :, :63, 1]
+        labels = np.arange(4 * 64 * 64, dtype=np.int64).reshape(4, 64, 64)
+        while True:
+            propagated = labels.copy()
+            below, above = labels[:, :63, :], labels[:, 1:, :]
+            np.minimum(propagated[:, :63, :], np.where(north, above, below), out=propagated[:, :63, :])
+            np.minimum(propagated[:, 1:, :], np.where(north, below, above), out=propagated[:, 1:, :])
+            left, right = labels[:, :, :63], labels[:, :, 1:]
+            np.minimum(propagated[:, :, :63], np.where(east, right, left), out=propagated[:, :, :63])
+            np.minimum(propagated[:, :, 1:], np.where(east, left, right), out=propagated[:, :, 1:])
+            flat = propagated.ravel()
+            propagated = flat[flat].reshape(4, 64, 64)
+            if np.array_equal(propagated, labels):
+                break
+            labels = propagated
+        self.labels[region] = labels.astype(np.uint16)
+
+    def _link(self, region: int, neighbour: int) -> List[int]:
+        labels, neighbour_labels = self.labels.get(region), self.labels.get(neighbour)
+        if labels is None or neighbour_labels is None:
+            return []
+        flags = self.collision_map.regions[region].to_array()
+        if neighbour == region + 256:
+            open_ = flags[63, :, :, 1].T
+            inner, outer = labels[:, :, 63][open_], neighbour_labels[:, :, 0][open_]
+        else:
+            open_ = flags[:, 63, :, 0].T
+            inner, outer = labels[:, 63, :][open_], neighbour_labels[:, 0, :][open_]
+        pairs = np.stack([region << 14 | inner.astype(np.int64), neighbour << 14 | outer.astype(np.int64)], axis=1)
+        keys = []
+        for a, b in np.unique(pairs, axis=0).tolist():
+            self._graph.setdefault(a, set()).add(b)
+            self._graph.setdefault(b, set()).add(a)
+            keys += (a, b)
+        return keys
+
+    def _link_transport(self, transport: Transport) -> List[int]:
+        a, b = self._key(transport.origin), self._key(transport.destination)
+        if a is None or b is None or a == b:
+            return []
+        self._graph.setdefault(a, set()).add(b)
+        self._graph.setdefault(b, set()).add(a)
+        return [a, b]
+
+    @staticmethod
+    def _borders(region: int) -> List[Tuple[int, int]]:
+        borders = []
+        for a, b in ((region, region + 256), (region - 256, region), (region, region + 1), (region - 1, region)):
+            if 0 <= a and b < 65536 and (b == a + 256 or a & 0xFF != 0xFF):
+                borders.append((a, b))
+        return borders
+
+    def _build(self) -> None:
+        self._graph, self._roots, self._members, self._transport_regions = {}, {}, {}, {}
+        for transport in (self.transports or ()):
+            for region in {transport.origin.get_region_id(), transport.destination.get_region_id()}:
+                self._transport_regions.setdefault(region, []).append(transport)
+            self._link_transport(transport)
+        self._transport_version = self.transports.version if self.transports is not None else 0
+        for region in self.labels:
+            for a, b in self._borders(region):
+                if a == region:
+                    self._link(a, b)
+        for key in self._graph:
+            if key in self._roots:
+                continue
+            component = self._new_component()
+            members = self._members[component] = {key}
+            self._roots[key] = component
+            boundary = [key]
+            while boundary:
+                for neighbour in self._graph[boundary.pop()]:
+                    if neighbour not in self._roots:
+                        self._roots[neighbour] = component
+                        members.add(neighbour)
+                        boundary.append(neighbour)
+        self._built = True
+
+    def _unlink(self, removed: Set[int]) -> Tuple[Set[int], Set[int]]:
+        # Drops the keys of relabelled regions, returning the keys that lost a link to them and the components they were in
+        frontier, affected = set(), set()
+        for key in removed:
+            for neighbour in self._graph.pop(key, ()):
+                if neighbour not in removed:
+                    self._graph[neighbour].discard(key)
+                    frontier.add(neighbour)
+            component = self._roots.pop(key, None)
+            if component is not None:
+                self._members[component].discard(key)
+                affected.add(component)
+        return frontier, affected
+
+    def _recompute(self, seeds: Set[int], affected: Set[int]) -> None:
+        # Every remaining key of an affected component is connected to a seed, a key that lost or gained links.
+        # Breadth-first searches run from all seeds in turn, one key each, and are merged when they meet, so a search
+        # that runs out of keys has found a whole component. Once a single search is left, the rest of the affected
+        # components belongs to it without being walked. New links can also join unaffected components, which are
+        # attached to the searches whole.
+        owner: Dict[int, int] = {}
+        parents: List[int] = []
+        boundaries: List[deque] = []
+        visited: List[List[int]] = []
+        attached: List[Set[int]] = []
+        attached_by: Dict[int, int] = {}
+        active: Set[int] = set()
+
+        def find(search: int) -> int:
+            while parents[search] != search:
+                parents[search] = search = parents[parents[search]]
+            return search
+
+        def merge(a: int, b: int) -> int:
+            a, b = find(a), find(b)
+            if a == b:
+                return a
+            if len(visited[a]) < len(visited[b]):
+                a, b = b, a
+            parents[b] = a
+            boundaries[a].extend(boundaries[b])
+            visited[a].extend(visited[b])
+            attached[a] |= attached[b]
+            active.discard(b)
+            return a
+
+        for seed in seeds:
+            search = owner[seed] = len(parents)
+            parents.append(search)
+            boundaries.append(deque([seed]))
+            visited.append([seed])
+            attached.append(set())
+            active.add(search)
+        for seed in seeds:
+            for neighbour in self._graph.get(seed, ()):
+                component = self._roots.get(neighbour)
+                if component is not None and component not in affected:
+                    search = find(owner[seed])
+                    if component in attached_by:
+                        search = merge(search, attached_by[component])
+                    attached[search].add(component)
+                    attached_by[component] = search
+
+        finished = []
+        while len(active) > 1:
+            for search in list(active):
+                if search not in active:
+                    continue
+                if not boundaries[search]:
+                    active.discard(search)
+                    finished.append(search)
+                    continue
+                for neighbour in self._graph.get(boundaries[search].popleft(), ()):
+                    other = owner.get(neighbour)
+                    if other is None:
+                        if self._roots.get(neighbour, -1) in affected or neighbour not in self._roots:
+                            owner[neighbour] = search
+                            visited[search].append(neighbour)
+                            boundaries[search].append(neighbour)
+                    elif find(other) != search:
+                        search = merge(search, other)
+
+        for search in finished:
+            self._assign(visited[search], attached[search])
+        for search in active:
+            self._assign(visited[search], attached[search] | affected)
+        for component in affected:
+            if not self._members.get(component, True):
+                del self._members[component]
+
+    def _assign(self, keys: List[int], components: Set[int]) -> None:
+        # Gives the keys and the members of the components one id, that of the largest component so the fewest keys move
+        components = [component for component in components if self._members.get(component)]
+        if components:
+            component = max(components, key=lambda c: len(self._members[c]))
+        else:
+            component = self._new_component()
+            self._members[component] = set()
+        members = self._members[component]
+        for other in components:
+            if other != component:
+                for key in self._members.pop(other):
+                    self._roots[key] = component
+                    members.add(key)
+        for key in keys:
+            previous = self._roots.get(key)
+            if previous is not None and previous != component:
+                self._members[previous].discard(key)
+            self._roots[key] = component
+            members.add(key)
+
+    def _new_component(self) -> int:
+        component = self._next_component
+        self._next_component += 1
+        return component
+
+    def _on_change(self, region: int, tile: Optional[WorldPoint]) -> None:
+        self._dirty.add(region)
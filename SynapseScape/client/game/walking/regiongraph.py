@@ -0,0 +1,397 @@
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from .astar import AStarPathfinder
+from .globalcollisionmap import GlobalCollisionMap
+from .reachability import ReachabilityIndex
+from ..collisionmap import CollisionMap
+from ..worldpoint import WorldPoint
+
+
+class RegionCollisionMap(CollisionMap):
+    """
+    A view of a CollisionMap that only allows movement between tiles of a single 64x64 region.
+
+    Attributes:
+        collision_map (CollisionMap): The underlying collision map.
+        region (int): The id of the region movement is confined to.
+    """
+
+    def __init__(self, collision_map: CollisionMap, region: int):
+        self.collision_map = collision_map
+        self.region = region
+        self.min_x = (region >> 8) << 6
+        self.min_y = (region & 0xFF) << 6
+
+    def contains(self, x: int, y: int) -> bool:
+        return 0 <= x - self.min_x < 64 and 0 <= y - self.min_y < 64
+
+    def n(self, x: int, y: int, z: int) -> bool:
+        return self.contains(x, y) and self.contains(x, y + 1) and self.collision_map.n(x, y, z)
+
+    def e(self, x: int, y: int, z: int) -> bool:
+        return self.contains(x, y) and self.contains(x + 1, y) and self.collision_map.e(x, y, z)
+
+    def moves(self, x: int, y: int, z: int) -> int:
+        if not self.contains(x, y):
+            return 0
+        moves = self.collision_map.moves(x, y, z)
+        if x == self.min_x:
+            moves &= ~(self.W | self.NW | self.SW)
+        elif x == self.min_x + 63:
+            moves &= ~(self.E | self.NE | self.SE)
+        if y == self.min_y:
+            moves &= ~(self.S | self.SE | self.SW)
+        elif y == self.min_y + 63:
+            moves &= ~(self.N | self.NE | self.NW)
+        return moves
+
+
+class RegionGraph:
+    """
+    An abstract graph over the 64x64 regions of a GlobalCollisionMap (HPA*).
+
+    Every maximal run of passable tiles along the border of two regions contributes
+    entrances, pairs of adjacent tiles on either side of the border. A wall inside a
+    region can cut a run apart, so a run gets one entrance for every distinct pair of
+    components (see components) its tiles belong to on the two sides. Entrances of
+    the same region are connected with their walking distance inside that region,
+    and the two tiles of an entrance are connected with a single step.
+
+    The graph is built lazily, one region at a time, and the parts belonging to a region
+    are dropped whenever its collision bits change, so they are rebuilt on the next
+    query that crosses it.
+
+    Attributes:
+        collision_map (GlobalCollisionMap): The collision map the graph is built over, or a MovementMaskMap wrapping one.
+    """
+
+    def __init__(self, collision_map: GlobalCollisionMap):
+        self.collision_map = collision_map
+        self._borders: Dict[Tuple[int, int], List[Tuple[WorldPoint, WorldPoint]]] = {}
+        self._transitions: Dict[int, Dict[WorldPoint, List[WorldPoint]]] = {}
+        self._edges: Dict[int, Dict[WorldPoint, Dict[WorldPoint, int]]] = {}
+        self._components: Dict[int, List[int]] = {}
+        collision_map.add_listener(self._on_change)
+
+    def build(self) -> None:
+        """
+        Eagerly builds the abstract graph for every loaded region.
+        """
+        for region in self.collision_map.regions.ids():
+            self.edges(region)
+
+    def invalidate(self, region: int) -> None:
+        """
+        Drops the cached entrances and distances of a region so they are rebuilt on demand.
+
+        The four neighbouring regions share the borders of the region, so their
+        intra-region distances are dropped as well.
+
+        Args:
+            region (int): The id of the changed region.
+        """
+        for key in [key for key in self._borders if region in key]:
+            del self._borders[key]
+        for plane in range(4):
+            self._components.pop(region << 2 | plane, None)
+        for affected in [region, *self._adjacent(region)]:
+            self._transitions.pop(affected, None)
+            self._edges.pop(affected, None)
+
+    def transitions(self, region: int) -> Dict[WorldPoint, List[WorldPoint]]:
+        """
+        Returns the entrance tiles of a region mapped to the tiles they lead to in neighbouring regions.
+
+        Args:
+            region (int): The id of the region.
+
+        Returns:
+            Dict[WorldPoint, List[WorldPoint]]: The entrance tiles of the region.
+        """
+        transitions = self._transitions.get(region)
+        if transitions is None:
+            transitions = {}
+            east, north = region + 256, region + 1
+            west, south = region - 256, region - 1
+            pairs = []
+            if east < 65536:
+                pairs.extend(self._border(region, east))
+            if region & 0xFF != 0xFF:
+                pairs.extend(self._border(region, north))
+            if west >= 0:
+                pairs.extend((inner, outer) for outer, inner in self._border(west, region))
+            if region & 0xFF != 0:
+                pairs.extend((inner, outer) for outer, inner in self._border(south, region))
+            for inner, outer in pairs:
+                transitions.setdefault(inner, []).append(outer)
+            self._transitions[region] = transitions
+        return transitions
+
+    def edges(self, region: int) -> Dict[WorldPoint, Dict[WorldPoint, int]]:
+        """
+        Returns the walking distances between the entrance tiles of a region.
+
+        Args:
+            region (int): The id of the region.
+
+        Returns:
+            Dict[WorldPoint, Dict[WorldPoint, int]]: The distances between entrances that can reach each other inside the region.
+        """
+        edges = self._edges.get(region)
+        if edges is None:
+            edges = {}
+            entrances = list(self.transitions(region))
+            for plane in {entrance.plane for entrance in entrances}:
+                adjacency = self.adjacency(region, plane)
+                on_plane = [entrance for entrance in entrances if entrance.plane == plane]
+                for entrance in on_plane:
+                    distances = self._distances(adjacency, entrance, on_plane)
+                    distances.pop(entrance, None)
+                    edges[entrance] = distances
+            self._edges[region] = edges
+        return edges
+
+    def adjacency(self, region: int, plane: int) -> List[List[int]]:
+        """
+        Lists the single-step moves that stay inside a region, by region-local tile index.
+
+        Reading the collision map once per region and plane lets every flood over the
+        region run on plain lists.
+
+        Args:
+            region (int): The id of the region.
+            plane (int): The plane of the region.
+
+        Returns:
+            List[List[int]]: For every local index x + 64 * y, the local indices reachable in one step.
+        """
+        bounded = RegionCollisionMap(self.collision_map, region)
+        offsets = ((CollisionMap.W, -1), (CollisionMap.E, 1), (CollisionMap.S, -64), (CollisionMap.N, 64),
+                   (CollisionMap.SW, -65), (CollisionMap.SE, -63), (CollisionMap.NW, 63), (CollisionMap.NE, 65))
+        adjacency = []
+        for y in range(bounded.min_y, bounded.min_y + 64):
+            for x in range(bounded.min_x, bounded.min_x + 64):
+                index = len(adjacency)
+                moves = bounded.moves(x, y, plane)
+                adjacency.append([index + offset for move, offset in offsets if moves & move])
+        return adjacency
+
+    def components(self, region: int, plane: int) -> List[int]:
+        """
+        Labels the tiles of a region by the part of the region they can walk to without leaving it.
+
+        Args:
+            region (int): The id of the region.
+            plane (int): The plane of the region.
+
+        Returns:
+            List[int]: For every local index x + 64 * y, the smallest local index of a tile it can reach inside the region.
+        """
+        key = region << 2 | plane
+        labels = self._components.get(key)
+        if labels is None:
+            adjacency = self.adjacency(region, plane)
+            labels = [-1] * 4096
+            for seed in range(4096):
+                if labels[seed] >= 0:
+                    continue
+                labels[seed] = seed
+                boundary = [seed]
+                while boundary:
+                    for neighbour in adjacency[boundary.pop()]:
+                        if labels[neighbour] < 0:
+                            labels[neighbour] = seed
+                            boundary.append(neighbour)
+            self._components[key] = labels
+        return labels
+
+    def flood(self, region: int, origin: WorldPoint, targets: Iterable[WorldPoint]) -> Dict[WorldPoint, int]:
+        """
+        Computes the walking distances from a tile to other tiles of its region without leaving it.
+
+        Args:
+            region (int): The id of the region to stay in.
+            origin (WorldPoint): The tile to start from.
+            targets (Iterable[WorldPoint]): The tiles to measure the distance to.
+
+        Returns:
+            Dict[WorldPoint, int]: The distances of the targets that can be reached.
+        """
+        return self._distances(self.adjacency(region, origin.plane), origin, targets)
+
+    @staticmethod
+    def _distances(adjacency: List[List[int]], origin: WorldPoint, targets: Iterable[WorldPoint]) -> Dict[WorldPoint, int]:
+        distances = [-1] * 4096
+        start = origin.get_region_x() + 64 * origin.get_region_y()
+        distances[start] = 0
+        boundary = deque([start])
+        while boundary:
+            index = boundary.popleft()
+            distance = distances[index] + 1
+            for neighbour in adjacency[index]:
+                if distances[neighbour] < 0:
+                    distances[neighbour] = distance
+                    boundary.append(neighbour)
+        result = {}
+        for target in targets:
+            distance = distances[target.get_region_x() + 64 * target.get_region_y()]
+            if target.plane == origin.plane and distance >= 0:
+                result[target] = distance
+        return result
+
+    def _border(self, region: int, other: int) -> List[Tuple[WorldPoint, WorldPoint]]:
+        key = (region, other)
+        border = self._borders.get(key)
+        if border is None:
+            border = []
+            if self.collision_map.regions[region] is not None and self.collision_map.regions[other] is not None:
+                min_x, min_y = (region >> 8) << 6, (region & 0xFF) << 6
+                east = other == region + 256
+                for plane in range(4):
+                    run: List[WorldPoint] = []
+                    for i in range(65):
+                        tile = WorldPoint(min_x + 63, min_y + i, plane) if east else WorldPoint(min_x + i, min_y + 63, plane)
+                        if i < 64 and (self.collision_map.e_wp(tile) if east else self.collision_map.n_wp(tile)):
+                            run.append(tile)
+                        elif run:
+                            border.extend(self._entrances(region, other, run, east))
+                            run = []
+            self._borders[key] = border
+        return border
+
+    def _entrances(self, region: int, other: int, run: List[WorldPoint], east: bool) -> List[Tuple[WorldPoint, WorldPoint]]:
+        # The tiles of a run are grouped by the components they belong to on both sides, one entrance per group
+        pairs = [(inner, inner.dx(1) if east else inner.dy(1)) for inner in run]
+        if len(run) == 1:
+            return pairs
+        inner_labels = self.components(region, run[0].plane)
+        outer_labels = self.components(other, run[0].plane)
+        groups: Dict[Tuple[int, int], List[Tuple[WorldPoint, WorldPoint]]] = {}
+        for inner, outer in pairs:
+            key = (inner_labels[inner.get_region_x() + 64 * inner.get_region_y()],
+                   outer_labels[outer.get_region_x() + 64 * outer.get_region_y()])
+            groups.setdefault(key, []).append((inner, outer))
+        return [group[len(group) // 2] for group in groups.values()]
+
+    @staticmethod
+    def _adjacent(region: int) -> List[int]:
+        adjacent = []
+        if region + 256 < 65536:
+            adjacent.append(region + 256)
+        if region - 256 >= 0:
+            adjacent.append(region - 256)
+        if region & 0xFF != 0xFF:
+            adjacent.append(region + 1)
+        if region & 0xFF != 0:
+            adjacent.append(region - 1)
+        return adjacent
+
+    def _on_change(self, region: int, tile: Optional[WorldPoint]) -> None:
+        self.invalidate(region)
+
+
+class HierarchicalPathfinder:
+    """
+    Plans a route on a RegionGraph first and then refines it inside the regions it crosses.
+
+    The start and target are linked to the entrances of their own regions with a
+    region-confined flood, the abstract graph is searched with A*, and every
+    abstract edge inside a region is refined with an AStarPathfinder confined to that
+    region. The cost of a query therefore grows with the number of regions crossed
+    rather than with the number of tiles.
+
+    A path is found whenever one exists within the loaded regions, but it is not
+    guaranteed to be the shortest one, since the abstract graph only keeps one
+    entrance per connected part of a border run.
+
+    Attributes:
+        region_graph (RegionGraph): The abstract graph to plan on.
+        start (WorldPoint): The start of the path.
+        target (WorldPoint): The target of the path.
+        reachability (Optional[ReachabilityIndex]): An index checked before searching, to answer unreachable targets at once.
+        expanded (int): The number of abstract nodes taken off the frontier by the last search.
+    """
+
+    def __init__(self, region_graph: RegionGraph, start: WorldPoint, target: WorldPoint,
+                 reachability: Optional[ReachabilityIndex] = None):
+        self.region_graph = region_graph
+        self.start = start
+        self.target = target
+        self.reachability = reachability
+        self.expanded = 0
+
+    def find(self) -> List[WorldPoint]:
+        if self.reachability is not None and not self.reachability.is_reachable(self.start, self.target):
+            return []
+
+        abstract_path = self._find_abstract()
+        if not abstract_path:
+            return []
+
+        path = [abstract_path[0]]
+        for a, b in zip(abstract_path, abstract_path[1:]):
+            if a.get_region_id() != b.get_region_id():
+                path.append(b)
+                continue
+            bounded = RegionCollisionMap(self.region_graph.collision_map, a.get_region_id())
+            segment = AStarPathfinder(bounded, a, b).find()
+            if not segment:
+                return []
+            path.extend(segment[1:])
+        return path
+
+    def _find_abstract(self) -> List[WorldPoint]:
+        graph = self.region_graph
+        start_region = self.start.get_region_id()
+        target_region = self.target.get_region_id()
+        if graph.collision_map.regions[start_region] is None or graph.collision_map.regions[target_region] is None:
+            return []
+
+        start_targets = list(graph.transitions(start_region))
+        if target_region == start_region:
+            start_targets.append(self.target)
+        start_edges = graph.flood(start_region, self.start, start_targets)
+        target_edges = graph.flood(target_region, self.target, graph.transitions(target_region))
+
+        costs = {self.start: 0}
+        predecessors: Dict[WorldPoint, Optional[WorldPoint]] = {self.start: None}
+        closed: Set[WorldPoint] = set()
+        sequence = count()
+        boundary = [(self.start.distance_to_2d(self.target), next(sequence), self.start)]
+        while boundary:
+            _, _, node = heappop(boundary)
+            if node in closed:
+                continue
+            closed.add(node)
+            self.expanded += 1
+
+            if node == self.target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = predecessors[node]
+                path.reverse()
+                return path
+
+            for neighbour, step in self._abstract_edges(node, start_edges, target_edges):
+                cost = costs[node] + step
+                if cost < costs.get(neighbour, cost + 1):
+                    costs[neighbour] = cost
+                    predecessors[neighbour] = node
+                    heappush(boundary, (cost + neighbour.distance_to_2d(self.target), next(sequence), neighbour))
+        return []
+
+    def _abstract_edges(self, node: WorldPoint, start_edges: Dict[WorldPoint, int],
+                        target_edges: Dict[WorldPoint, int]) -> Iterator[Tuple[WorldPoint, int]]:
+        if node == self.start:
+            yield from start_edges.items()
+        if node == self.target:
+            return
+        region = node.get_region_id()
+        yield from self.region_graph.edges(region).get(node, {}).items()
+        for outer in self.region_graph.transitions(region).get(node, ()):
+            yield outer, 1
+        if node in target_edges:
+            yield self.target, target_edges[node]
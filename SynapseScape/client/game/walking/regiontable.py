@@ -0,0 +1,69 @@
+from typing import Dict, Iterator, List, Optional, Union
+from .bitset4d import BitSet4D
+
+REGION_HEADER_SIZE = 2
+REGION_DATA_SIZE = 64 * 64 * 4 * 2 // 8
+REGION_SIZE = REGION_HEADER_SIZE + REGION_DATA_SIZE
+
+
+class RegionTable:
+    """
+    The BitSet4D regions of a collision map, indexed by region id and materialized on first access.
+
+    The collision data is a sequence of 4098-byte records: a big-endian region id
+    followed by the 4096 bytes of the region's bits. Construction only reads the
+    headers, in a single pass, to index the offset of every record. A region is
+    turned into a BitSet4D the first time it is looked up; when the data is a
+    writable buffer (a bytearray or a copy-on-write mmap) the BitSet4D shares its
+    memory instead of copying it.
+
+    Attributes:
+        data (Union[bytes, bytearray, memoryview]): The collision data the regions are read from.
+        offsets (Dict[int, int]): The offset of every region record that has not been replaced.
+        loaded (Dict[int, BitSet4D]): The regions that have been materialized or replaced.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview] = b''):
+        self.data = data
+        self.view = memoryview(data)
+        self.offsets: Dict[int, int] = {}
+        self.loaded: Dict[int, BitSet4D] = {}
+        for offset in range(0, len(self.view) - REGION_SIZE + 1, REGION_SIZE):
+            self.offsets[self.view[offset] << 8 | self.view[offset + 1]] = offset
+
+    def __len__(self) -> int:
+        return 65536
+
+    def __getitem__(self, region: int) -> Optional[BitSet4D]:
+        bits = self.loaded.get(region)
+        if bits is None:
+            offset = self.offsets.get(region)
+            if offset is None:
+                return None
+            buffer = self.view[offset + REGION_HEADER_SIZE:offset + REGION_SIZE]
+            if buffer.readonly:
+                bits = BitSet4D.from_buffer(buffer, 64, 64, 4, 2)
+            else:
+                bits = BitSet4D.wrap_buffer(buffer, 64, 64, 4, 2)
+            self.loaded[region] = bits
+        return bits
+
+    def __setitem__(self, region: int, bits: Optional[BitSet4D]) -> None:
+        self.offsets.pop(region, None)
+        if bits is None:
+            self.loaded.pop(region, None)
+        else:
+            self.loaded[region] = bits
+
+    def __iter__(self) -> Iterator[Optional[BitSet4D]]:
+        for region in range(65536):
+            yield self[region]
+
+    def ids(self) -> List[int]:
+        """
+        Lists the ids of the regions that have collision data, without materializing them.
+
+        Returns:
+            List[int]: The sorted region ids.
+        """
+        return sorted(self.offsets.keys() | self.loaded.keys())
@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple
+from ..worldpoint import WorldPoint
+from .. import worldpointutil
+import csv
+
+
+@dataclass(frozen=True)
+class Transport:
+    """
+    A one-way edge of the walking graph between two tiles that are not grid neighbours.
+
+    Attributes:
+        origin (WorldPoint): The tile the transport is used from.
+        destination (WorldPoint): The tile the transport leads to.
+        cost (int): The number of ticks it takes to use the transport.
+        kind (str): What the transport is, e.g. door, ladder, stairs or teleport.
+        name (str): A description of the transport, e.g. the name of the object to interact with.
+    """
+    origin: WorldPoint
+    destination: WorldPoint
+    cost: int = 1
+    kind: str = ''
+    name: str = ''
+
+
+class TransportIndex:
+    """
+    The transports of the world, indexed by the packed tile they are used from.
+
+    Searches look up the outgoing transports of a tile with a single dict probe in
+    edges, which holds (packed destination, cost) pairs so that no Transport or
+    WorldPoint is touched in the search loop.
+
+    A transport file is a tab-separated table with a header row naming the columns
+    origin_x, origin_y, origin_plane, destination_x, destination_y, destination_plane,
+    cost, kind and name; the last three are optional. Blank lines and lines starting
+    with # are skipped.
+
+    Attributes:
+        transports (Dict[int, List[Transport]]): The transports, keyed by packed origin.
+        edges (Dict[int, Tuple[Tuple[int, int], ...]]): The (packed destination, cost) pairs of the transports, keyed by packed origin.
+        version (int): The number of transports added so far, for indexes built from the transports to tell they changed.
+    """
+
+    def __init__(self):
+        self.transports: Dict[int, List[Transport]] = {}
+        self.edges: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+        self.version = 0
+
+    @classmethod
+    def from_file(cls, path: str) -> 'TransportIndex':
+        """
+        Loads the transports of a tab-separated transport file.
+
+        Args:
+            path (str): The path of the transport file.
+
+        Returns:
+            TransportIndex: The indexed transports.
+
+        Raises:
+            ValueError: If a row is missing a coordinate or has a cost below 1.
+        """
+        index = cls()
+        with open(path, newline='') as f:
+            lines = (line for line in f if line.strip() and not line.startswith('#'))
+            for row in csv.DictReader(lines, delimiter='\t'):
+                try:
+                    origin = WorldPoint(int(row['origin_x']), int(row['origin_y']), int(row['origin_plane']))
+                    destination = WorldPoint(int(row['destination_x']), int(row['destination_y']),
+                                             int(row['destination_plane']))
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ValueError(f'Invalid transport row {row}') from e
+                index.add(Transport(origin, destination, int(row.get('cost') or 1),
+                                    row.get('kind') or '', row.get('name') or ''))
+        return index
+
+    def add(self, transport: Transport) -> None:
+        """
+        Adds a transport to the index.
+
+        Args:
+            transport (Transport): The transport to add.
+
+        Raises:
+            ValueError: If the cost of the transport is below 1.
+        """
+        if transport.cost < 1:
+            raise ValueError(f'Transport cost must be at least 1, got {transport.cost}')
+        origin = transport.origin.pack()
+        self.transports.setdefault(origin, []).append(transport)
+        self.edges[origin] = self.edges.get(origin, ()) + ((transport.destination.pack(), transport.cost),)
+        self.version += 1
+
+    def outgoing(self, point: WorldPoint) -> List[Transport]:
+        """
+        Returns the transports that can be used from a tile.
+
+        Args:
+            point (WorldPoint): The tile.
+
+        Returns:
+            List[Transport]: The transports used from the tile.
+        """
+        return self.transports.get(point.pack(), [])
+
+    def between(self, origin: WorldPoint, destination: WorldPoint) -> List[Transport]:
+        """
+        Returns the transports leading from one tile to another, e.g. to tell which one a path step used.
+
+        Args:
+            origin (WorldPoint): The tile the transport is used from.
+            destination (WorldPoint): The tile the transport leads to.
+
+        Returns:
+            List[Transport]: The matching transports.
+        """
+        return [transport for transport in self.outgoing(origin) if transport.destination == destination]
+
+    def shortcuts(self) -> Iterator[Tuple[int, int]]:
+        """
+        Yields the (packed destination, cost) of every transport that covers more tiles than its cost in ticks.
+
+        Only these transports can make a route shorter than the Chebyshev distance between its ends.
+        """
+        for origin, edges in self.edges.items():
+            for destination, cost in edges:
+                if worldpointutil.distance_2d(origin, destination) > cost:
+                    yield destination, cost
+
+    def __len__(self) -> int:
+        return sum(len(transports) for transports in self.transports.values())
+
+    def __iter__(self) -> Iterator[Transport]:
+        for transports in self.transports.values():
+            yield from transports
@@ -0,0 +1,122 @@
+from typing import List, Tuple
+from ..collisionmap import CollisionMap
+from ..worldpoint import WorldPoint
+import math
+
+
+class WaypointSimplifier:
+    """
+    Compresses a tile-by-tile path into the few tiles that have to be clicked to walk it.
+
+    A waypoint can be skipped when the player, clicking the next waypoint, walks
+    there the direct way: each step goes diagonally towards the target while both
+    coordinates differ and the diagonal is open, and straight otherwise. can_walk
+    replays those steps on the CollisionMap, so walking between two waypoints takes
+    the Chebyshev distance in steps and never more than the original path.
+
+    Steps that are not grid moves, such as transports or plane changes, are always
+    kept as waypoints on both ends.
+
+    Attributes:
+        collision_map (CollisionMap): The collision map to check the walks against.
+        radius (int): The maximum Chebyshev distance between two waypoints, i.e. how far away a tile can be clicked on the minimap.
+    """
+
+    def __init__(self, collision_map: CollisionMap, radius: int = 15):
+        self.collision_map = collision_map
+        self.radius = radius
+
+    def simplify(self, path: List[WorldPoint]) -> List[WorldPoint]:
+        """
+        Greedily picks the farthest walkable tile within the radius as the next waypoint.
+
+        Args:
+            path (List[WorldPoint]): The path, as returned by a Pathfinder.
+
+        Returns:
+            List[WorldPoint]: The waypoints, starting with the first tile of the path and ending with the last.
+        """
+        if len(path) < 2:
+            return list(path)
+
+        # breaks[i] is True if the step from path[i - 1] to path[i] is not a grid move.
+        breaks = [False] + [a.plane != b.plane or a.distance_to_2d(b) != 1 for a, b in zip(path, path[1:])]
+        waypoints = [path[0]]
+        i = 0
+        while i < len(path) - 1:
+            if breaks[i + 1]:
+                i += 1
+                waypoints.append(path[i])
+                continue
+            best = i + 1
+            for j in range(i + 2, len(path)):
+                if breaks[j] or path[i].distance_to_2d(path[j]) > self.radius:
+                    break
+                if self.can_walk(path[i], path[j]):
+                    best = j
+            i = best
+            waypoints.append(path[i])
+        return waypoints
+
+    def can_walk(self, start: WorldPoint, end: WorldPoint) -> bool:
+        """
+        Checks whether walking directly from start to end is possible.
+
+        Every step has to bring the Chebyshev distance to end down by one, so a walk
+        that would have to sidestep a blocked diagonal is rejected.
+
+        Args:
+            start (WorldPoint): The tile to walk from.
+            end (WorldPoint): The tile to walk to.
+
+        Returns:
+            bool: True if the direct walk reaches end in the Chebyshev distance, False if it gets blocked.
+        """
+        if start.plane != end.plane:
+            return False
+        x, y, z = start.x, start.y, start.plane
+        while (x, y) != (end.x, end.y):
+            dx = (end.x > x) - (end.x < x)
+            dy = (end.y > y) - (end.y < y)
+            moves = self.collision_map.moves(x, y, z)
+            # Only a straight step along the longer axis brings the Chebyshev distance down
+            longer_x = abs(end.x - x) > abs(end.y - y)
+            longer_y = abs(end.y - y) > abs(end.x - x)
+            if dx and dy and moves & _DIAGONALS[(dx, dy)]:
+                x, y = x + dx, y + dy
+            elif longer_x and moves & (CollisionMap.E if dx > 0 else CollisionMap.W):
+                x += dx
+            elif longer_y and moves & (CollisionMap.N if dy > 0 else CollisionMap.S):
+                y += dy
+            else:
+                return False
+        return True
+
+    @staticmethod
+    def to_minimap(waypoints: List[WorldPoint], pixels_per_tile: float = 4.0,
+                   yaw: float = 0.0) -> List[Tuple[int, int]]:
+        """
+        Converts waypoints into minimap click offsets, each relative to the previous waypoint.
+
+        The player stands on the previous waypoint when the next one is clicked, and
+        the minimap is centred on the player, so each offset is relative to the
+        minimap centre at the time of its click.
+
+        Args:
+            waypoints (List[WorldPoint]): The waypoints, starting with the player's tile.
+            pixels_per_tile (float): The minimap zoom, 4 pixels per tile by default.
+            yaw (float): The direction the camera faces in radians, clockwise from north.
+
+        Returns:
+            List[Tuple[int, int]]: The (x, y) screen offsets from the minimap centre, y growing downwards.
+        """
+        cos, sin = math.cos(yaw), math.sin(yaw)
+        offsets = []
+        for a, b in zip(waypoints, waypoints[1:]):
+            east, north = (b.x - a.x) * pixels_per_tile, (b.y - a.y) * pixels_per_tile
+            offsets.append((round(east * cos - north * sin), -round(east * sin + north * cos)))
+        return offsets
+
+
+_DIAGONALS = {(1, 1): CollisionMap.NE, (-1, 1): CollisionMap.NW,
+              (1, -1): CollisionMap.SE, (-1, -1): CollisionMap.SW}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from enum import IntEnum
+from . import worldpointutil
 
 class Direction(IntEnum):
     NORTH = 0
@@ -22,6 +23,14 @@ class WorldPoint:
         return WorldPoint(((region_id >> 8) << 6) + region_x,
                           ((region_id & 0xFF) << 6) + region_y, plane)
 
+    @staticmethod
+    def from_packed(packed: int) -> WorldPoint:
+        return WorldPoint(worldpointutil.unpack_world_x(packed), worldpointutil.unpack_world_y(packed),
+                          worldpointutil.unpack_world_plane(packed))
+
+    def pack(self) -> int:
+        return worldpointutil.pack_world_point(self.x, self.y, self.plane)
+
     def dx(self, dx: int) -> WorldPoint:
         return WorldPoint(self.x + dx, self.y, self.plane)
 
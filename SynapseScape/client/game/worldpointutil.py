@@ -0,0 +1,60 @@
+"""
+Helpers for WorldPoints packed into a single int, for hot loops that should not allocate.
+
+A packed WorldPoint holds x in bits 0-14, y in bits 15-29 and the plane in bits 30-31.
+As long as a step stays inside the world, moving a packed point is a single addition
+of one of the offsets below.
+"""
+
+X_BITS = 15
+Y_BITS = 15
+X_MASK = (1 << X_BITS) - 1
+Y_MASK = (1 << Y_BITS) - 1
+PLANE_MASK = 0x3
+
+DX = 1
+DY = 1 << X_BITS
+
+N = DY
+E = DX
+S = -DY
+W = -DX
+NE = DX + DY
+NW = -DX + DY
+SE = DX - DY
+SW = -DX - DY
+
+
+def pack_world_point(x: int, y: int, plane: int) -> int:
+    return (x & X_MASK) | ((y & Y_MASK) << X_BITS) | ((plane & PLANE_MASK) << (X_BITS + Y_BITS))
+
+
+def unpack_world_x(packed: int) -> int:
+    return packed & X_MASK
+
+
+def unpack_world_y(packed: int) -> int:
+    return (packed >> X_BITS) & Y_MASK
+
+
+def unpack_world_plane(packed: int) -> int:
+    return (packed >> (X_BITS + Y_BITS)) & PLANE_MASK
+
+
+def dx_dy(packed: int, dx: int, dy: int) -> int:
+    return packed + dx * DX + dy * DY
+
+
+def get_region_id(packed: int) -> int:
+    return ((packed & X_MASK) >> 6) << 8 | ((packed >> X_BITS) & Y_MASK) >> 6
+
+
+def get_region_index(packed: int) -> int:
+    """
+    Returns the index x + 64 * y + 4096 * plane of a packed point inside its region.
+    """
+    return (packed & 63) | ((packed >> X_BITS) & 63) << 6 | ((packed >> (X_BITS + Y_BITS)) & PLANE_MASK) << 12
+
+
+def distance_2d(a: int, b: int) -> int:
+    return max(abs((a & X_MASK) - (b & X_MASK)), abs(((a >> X_BITS) & Y_MASK) - ((b >> X_BITS) & Y_MASK)))
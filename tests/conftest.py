@@ -0,0 +1,50 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# The packages are imported the way main.ipynb does, from the SynapseScape directory.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "SynapseScape"))
+
+from benchmarks.worlds import ORIGIN_REGION_X, ORIGIN_REGION_Y, serialize  # noqa: E402
+from client.game.collisionmap import CollisionMap  # noqa: E402
+from client.game.walking import GlobalCollisionMap  # noqa: E402
+from client.game.worldpoint import WorldPoint  # noqa: E402
+
+# The south-west corner of the synthetic worlds, see benchmarks.worlds
+X0 = ORIGIN_REGION_X * 64
+Y0 = ORIGIN_REGION_Y * 64
+
+_STEPS = {(0, 1): CollisionMap.N, (1, 0): CollisionMap.E, (0, -1): CollisionMap.S, (-1, 0): CollisionMap.W,
+          (1, 1): CollisionMap.NE, (-1, 1): CollisionMap.NW, (1, -1): CollisionMap.SE, (-1, -1): CollisionMap.SW}
+
+
+def point(x: int, y: int, plane: int = 0) -> WorldPoint:
+    """
+    Returns the tile at an offset from the south-west corner of the synthetic worlds.
+    """
+    return WorldPoint(X0 + x, Y0 + y, plane)
+
+
+def world(walkable: np.ndarray) -> GlobalCollisionMap:
+    """
+    Builds the collision map of a (planes, height, width) walkable grid, see benchmarks.worlds.serialize.
+    """
+    return GlobalCollisionMap(serialize(walkable))
+
+
+def assert_walkable(collision_map: CollisionMap, path) -> None:
+    """
+    Asserts that every step of a path is a single legal move.
+    """
+    for a, b in zip(path, path[1:]):
+        move = _STEPS[(b.x - a.x, b.y - a.y)]
+        assert collision_map.moves(a.x, a.y, a.plane) & move, (a, b)
+
+
+@pytest.fixture
+def walkable() -> np.ndarray:
+    """
+    A region of open ground for a test to put walls into.
+    """
+    return np.ones((1, 64, 64), dtype=bool)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from benchmarks.worlds import maze, open_field
+from client.game.walking import AStarPathfinder, Pathfinder
+from conftest import assert_walkable, point, world
+
+
+def random_queries(walkable: np.ndarray, rng: np.random.Generator, count: int):
+    ys, xs = np.nonzero(walkable[0])
+    picks = rng.integers(len(xs), size=(count, 2))
+    return [(point(xs[a], ys[a]), point(xs[b], ys[b])) for a, b in picks]
+
+
+@pytest.mark.parametrize("generate", [open_field, maze])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_paths_as_short_as_bfs(generate, seed):
+    rng = np.random.default_rng(seed)
+    walkable = generate(1, rng)
+    collision_map = world(walkable)
+    bfs_expanded = astar_expanded = 0
+    for start, target in random_queries(walkable, rng, 20):
+        bfs = Pathfinder(collision_map, start, target)
+        astar = AStarPathfinder(collision_map, start, target)
+        expected, path = bfs.find(), astar.find()
+        assert len(path) == len(expected)
+        if path:
+            assert path[0] == start and path[-1] == target
+            assert_walkable(collision_map, path)
+        bfs_expanded += bfs.expanded
+        astar_expanded += astar.expanded
+    assert astar_expanded < bfs_expanded
+
+
+def test_diagonal_blocked_by_corner(walkable):
+    walkable[0, 11, 10] = False  # North of the start
+    walkable[0, 10, 11] = False  # East of the start
+    collision_map = world(walkable)
+    start, target = point(10, 10), point(11, 11)
+    expected = Pathfinder(collision_map, start, target).find()
+    path = AStarPathfinder(collision_map, start, target).find()
+    # The diagonal step cuts past two walls, so the path has to go around them.
+    assert len(path) == len(expected) > 2
+    assert_walkable(collision_map, path)
+
+
+def test_diagonal_blocked_by_one_wall(walkable):
+    walkable[0, 20:40, 30] = False
+    collision_map = world(walkable)
+    start, target = point(29, 30), point(31, 31)
+    expected = Pathfinder(collision_map, start, target).find()
+    path = AStarPathfinder(collision_map, start, target).find()
+    assert len(path) == len(expected)
+    assert_walkable(collision_map, path)
+
+
+def test_open_ground_is_a_straight_line(walkable):
+    collision_map = world(walkable)
+    start, target = point(5, 5), point(40, 20)
+    astar = AStarPathfinder(collision_map, start, target)
+    path = astar.find()
+    assert len(path) == 36
+    assert astar.expanded == len(path)
+
+
+def test_unreachable_target(walkable):
+    walkable[0, :, 32] = False
+    collision_map = world(walkable)
+    assert AStarPathfinder(collision_map, point(10, 10), point(50, 10)).find() == []
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from benchmarks.__main__ import bench_world
+from benchmarks.worlds import WORLDS, generate, serialize
+from client.game.walking import DistanceField
+from conftest import point, world
+
+
+@pytest.mark.parametrize("kind", sorted(WORLDS))
+def test_worlds_are_reproducible_and_region_aligned(kind):
+    walkable = generate(kind, 2, seed=3)
+    assert walkable.dtype == bool and walkable.shape[1:] == (128, 128)
+    assert np.array_equal(walkable, generate(kind, 2, seed=3))
+    assert walkable.any()
+
+
+def test_serialized_flags_follow_the_walkable_tiles():
+    walkable = generate('buildings', 2, seed=0)
+    collision_map = world(walkable)
+    assert collision_map.to_bytes() == serialize(walkable)
+    assert len(collision_map.regions.ids()) == 4
+    planes = walkable.shape[0]
+    for x, y, plane in zip(*(np.random.default_rng(1).integers(n, size=500) for n in (127, 127, planes))):
+        tile = point(int(x), int(y), int(plane))
+        north = walkable[plane, y, x] and walkable[plane, y + 1, x]
+        east = walkable[plane, y, x] and walkable[plane, y, x + 1]
+        assert collision_map.n(tile.x, tile.y, tile.plane) == north
+        assert collision_map.e(tile.x, tile.y, tile.plane) == east
+
+
+def test_maze_is_connected():
+    walkable = generate('maze', 1, seed=0)
+    field = DistanceField(world(walkable), point(1, 1))
+    distances = field.flood()[point(1, 1).get_region_id()][0]
+    assert np.array_equal(distances >= 0, walkable[0])
+
+
+def test_report_compares_the_pathfinders():
+    report = bench_world('maze', 1, 3, seed=0)
+    assert report['regions'] == 1 and report['bytes'] == 4098
+    bfs, astar = report['pathfinders']['bfs'], report['pathfinders']['astar']
+    assert bfs['path_length'] == astar['path_length']
+    assert bfs['unreachable'] == astar['unreachable'] == 0
+    assert astar['expanded']['mean'] <= bfs['expanded']['mean']
@@ -0,0 +1,47 @@
+import math
+import numpy as np
+import pytest
+from client.game.interaction.utils import _bezier, bernstein_matrix, generate_bezier_curve, generate_bezier_curves
+
+
+@pytest.mark.parametrize("n", [1, 3, 8])
+def test_bernstein_matrix_matches_the_binomial_formula(n):
+    basis = bernstein_matrix(n, 11)
+    t = np.linspace(0, 1, 11)
+    expected = np.array([[math.comb(n, k) * s ** k * (1 - s) ** (n - k) for k in range(n + 1)] for s in t])
+    assert basis.shape == (11, n + 1)
+    assert np.allclose(basis, expected)
+    assert bernstein_matrix(n, 11) is basis and not basis.flags.writeable
+
+
+def test_high_degree_basis_stays_finite():
+    basis = bernstein_matrix(1 << 10, 50)
+    assert np.isfinite(basis).all()
+    assert np.allclose(basis.sum(axis=1), 1)
+
+
+def test_curve_matches_de_casteljau():
+    control_points = np.random.default_rng(0).uniform(0, 800, size=(17, 2))
+    curve = bernstein_matrix(16, 20) @ control_points
+    for t, point in zip(np.linspace(0, 1, 20), curve):
+        assert np.allclose(_bezier(t, control_points), point)
+
+
+def test_curves_start_and_end_at_the_scaled_positions():
+    rng = np.random.default_rng(1)
+    curve = generate_bezier_curve((0.25, 0.5), (0.75, 0.1), complexity=4, steps=30, rng=rng)
+    assert len(curve) == 30 and all(isinstance(point, tuple) for point in curve)
+    assert curve[0] == (200, 300) and curve[-1] == (600, 60)
+
+    starts, ends = rng.random((5, 2)), rng.random((5, 2))
+    curves = generate_bezier_curves(starts, ends, complexity=3, steps=25, window_size=(100, 200), rng=rng)
+    assert curves.shape == (5, 25, 2)
+    assert np.allclose(curves[:, 0], np.trunc(starts * (100, 200)))
+    assert np.allclose(curves[:, -1], np.trunc(ends * (100, 200)))
+
+
+def test_curves_are_reproducible_from_a_seed():
+    first = generate_bezier_curves([(0.1, 0.1)] * 3, [(0.9, 0.9)] * 3, rng=np.random.default_rng(2))
+    second = generate_bezier_curves([(0.1, 0.1)] * 3, [(0.9, 0.9)] * 3, rng=np.random.default_rng(2))
+    assert np.array_equal(first, second)
+    assert not np.array_equal(first[0], first[1])
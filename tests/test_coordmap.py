@@ -0,0 +1,29 @@
+from client.game.walking import AStarPathfinder, CoordMap, DistanceField, Pathfinder
+from client.game.walking import coordmap
+from conftest import point, world
+
+
+def test_start_has_no_predecessor_and_no_custom_entry():
+    predecessors = CoordMap()
+    start = point(5, 5).pack()
+    predecessors.put(start, None, CoordMap.START)
+    assert predecessors.contains_key(start)
+    assert predecessors.get(start) is None
+    assert not predecessors.custom
+
+
+def test_searches_return_their_predecessors_to_the_pool(walkable):
+    walkable[0, :, 32] = False
+    collision_map = world(walkable)
+    coordmap._pool.clear()
+    for pathfinder in (Pathfinder, AStarPathfinder):
+        for target in (point(20, 20), point(50, 20)):
+            search = pathfinder(collision_map, point(5, 5), target)
+            search.find()
+            assert search.predecessors is None
+    assert len(coordmap._pool) == 1
+    assert not coordmap._pool[0].custom
+
+    field = DistanceField(collision_map, point(5, 5))
+    assert field.path_to(point(20, 5))
+    assert len(coordmap._pool) == 1
@@ -0,0 +1,55 @@
+import numpy as np
+from client.game.walking import DistanceField, Pathfinder
+from conftest import assert_walkable, point, world
+
+
+def walled_world(walkable: np.ndarray):
+    # A wall across the region with a single gap at the top, and a walled-in pocket around (50, 10)
+    walkable[0, :60, 32] = False
+    walkable[0, 8:13, 48] = walkable[0, 8:13, 52] = False
+    walkable[0, 8, 48:53] = walkable[0, 12, 48:53] = False
+    return world(walkable)
+
+
+def test_nearest_target_is_the_fewest_steps_away(walkable):
+    collision_map = walled_world(walkable)
+    origin = point(20, 5)
+    # Closest as the crow flies, but behind the wall
+    far, near, middle = point(40, 5), point(20, 30), point(5, 50)
+    field = DistanceField(collision_map, origin)
+    path = field.nearest([far, near, middle])
+    assert path[0] == origin and path[-1] == near
+    assert len(path) == len(Pathfinder(collision_map, origin, near).find())
+    assert_walkable(collision_map, path)
+
+
+def test_queries_resume_the_flood(walkable):
+    collision_map = walled_world(walkable)
+    origin, target = point(20, 5), point(40, 5)
+    field = DistanceField(collision_map, origin)
+    assert field.distance(target) is None
+    path = field.path_to(target)
+    assert field.distance(target) == len(path) - 1 == len(Pathfinder(collision_map, origin, target).find()) - 1
+    expanded = field.expanded
+    # Tiles nearer than the target were reached on the way, so they cost no further expansions
+    closer = point(25, 5)
+    assert field.path_to(closer)[-1] == closer
+    assert field.expanded == expanded
+
+
+def test_unreachable_and_out_of_radius_targets(walkable):
+    collision_map = walled_world(walkable)
+    origin = point(20, 5)
+    assert DistanceField(collision_map, origin).nearest([point(50, 10)]) == []
+    field = DistanceField(collision_map, origin, radius=10)
+    assert field.path_to(point(40, 5)) == []
+    assert field.path_to(point(20, 15))[-1] == point(20, 15)
+
+
+def test_flood_distances_match_breadth_first_paths(walkable):
+    collision_map = walled_world(walkable)
+    origin = point(20, 5)
+    distances = DistanceField(collision_map, origin).flood()[origin.get_region_id()]
+    assert distances[0, 10, 50] == -1
+    for x, y in ((40, 5), (0, 63), (63, 63), (31, 59)):
+        assert distances[0, y, x] == len(Pathfinder(collision_map, origin, point(x, y)).find()) - 1
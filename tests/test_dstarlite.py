@@ -0,0 +1,25 @@
+from client.game.walking import DStarLitePathfinder, Pathfinder
+from client.game.walking import coordmap
+from conftest import X0, Y0, point, world
+
+
+def test_repairs_the_path_after_a_collision_change(walkable):
+    walkable[0, :60, 32] = False
+    collision_map = world(walkable)
+    start, target = point(20, 5), point(45, 5)
+    search = DStarLitePathfinder(collision_map, start, target)
+    assert len(search.find()) == len(Pathfinder(collision_map, start, target).find())
+
+    for y in range(4, 7):
+        collision_map.set(X0 + 31, Y0 + y, 0, 1, True)
+        collision_map.set(X0 + 32, Y0 + y, 0, 1, True)
+    assert len(search.find()) == len(Pathfinder(collision_map, start, target).find()) == 26
+    search.close()
+
+
+def test_does_not_take_pooled_predecessors(walkable):
+    collision_map = world(walkable)
+    coordmap._pool[:] = [coordmap.CoordMap()]
+    searches = [DStarLitePathfinder(collision_map, point(1, 1), point(10, 10)) for _ in range(3)]
+    assert all(search.find() for search in searches)
+    assert len(coordmap._pool) == 1
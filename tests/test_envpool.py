@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from DummyRS.envs import EnvPool, OldSchoolRunescapeEnv
+
+
+def random_actions(rng: np.random.Generator, count: int) -> np.ndarray:
+    return np.stack([np.zeros(count, dtype=np.int64), rng.integers(0, 10, count), rng.integers(0, 7, count)], axis=1)
+
+
+def test_pipelined_steps_match_local_envs():
+    rng = np.random.default_rng(0)
+    local = [OldSchoolRunescapeEnv("tensor") for _ in range(4)]
+    for env in local:
+        env.reset()
+    with EnvPool(2, 2, ring_size=3) as pool:
+        pool.reset()
+        actions = [random_actions(rng, 4) for _ in range(20)]
+        pool.step_async(actions[0])
+        for t in range(20):
+            if t + 1 < len(actions):
+                pool.step_async(actions[t + 1])
+            observations, rewards, dones = pool.step_wait()
+            for i, env in enumerate(local):
+                expected = env.step(tuple(int(a) for a in actions[t][i]))[0]
+                assert (observations["current_map"][i] == expected["current_map"]).all()
+                assert tuple(observations["player_pos"][i]) == expected["player_pos"]
+            assert not dones.any()
+
+
+def test_in_flight_steps_are_bounded_by_the_ring():
+    with EnvPool(1, 2, ring_size=3) as pool:
+        pool.reset()
+        actions = np.zeros((2, 3), dtype=np.int64)
+        pool.step_async(actions)
+        pool.step_async(actions)
+        with pytest.raises(RuntimeError):
+            pool.step_async(actions)
+        pool.step_wait()
+        pool.step_wait()
+        with pytest.raises(RuntimeError):
+            pool.step_wait()
+
+
+def test_worker_errors_are_raised_in_order():
+    with EnvPool(2, 1, ring_size=3) as pool:
+        pool.reset()
+        pool.step_async(np.array([[0, 50, 50], [0, 1, 1]]))
+        pool.step_async(np.array([[0, 2, 2], [0, 1, 1]]))
+        with pytest.raises(RuntimeError, match="IndexError"):
+            pool.step_wait()
+        observations, _, _ = pool.step_wait()
+        assert observations["player_pos"].tolist() == [[2, 2], [1, 1]]
@@ -0,0 +1,82 @@
+import os
+import numpy as np
+from benchmarks.worlds import serialize
+from client.game.walking import GlobalCollisionMap, RegionTable
+from conftest import point, world
+
+
+def random_walkable(seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).random((1, 128, 128)) >= 0.2
+
+
+def test_regions_are_materialized_on_first_lookup():
+    data = serialize(random_walkable())
+    regions = RegionTable(data)
+    east, west = point(64, 0).get_region_id(), point(0, 0).get_region_id()
+    assert regions.ids() == sorted(regions.offsets) and len(regions.ids()) == 4
+    assert not regions.loaded
+    assert regions[east] is regions[east]
+    assert list(regions.loaded) == [east]
+    assert regions[east - 1] is None
+    regions[west] = None
+    assert west not in regions.ids() and regions[west] is None
+
+
+def test_file_map_reads_in_place_and_copies_on_write(tmp_path):
+    walkable = random_walkable()
+    data = serialize(walkable)
+    path = os.path.join(tmp_path, 'collision.bin')
+    with open(path, 'wb') as f:
+        f.write(data)
+    collision_map = GlobalCollisionMap.from_file(path)
+    in_memory = world(walkable)
+    assert collision_map.to_bytes() == in_memory.to_bytes() == data
+
+    tile = point(10, 10)
+    value = collision_map.get(tile.x, tile.y, 0, 0)
+    collision_map.set(tile.x, tile.y, 0, 0, not value)
+    in_memory.set(tile.x, tile.y, 0, 0, not value)
+    assert collision_map.get(tile.x, tile.y, 0, 0) == in_memory.get(tile.x, tile.y, 0, 0) == (not value)
+    assert collision_map.to_bytes() == in_memory.to_bytes() != data
+    with open(path, 'rb') as f:
+        assert f.read() == data
+
+
+def test_empty_file_has_no_regions(tmp_path):
+    path = os.path.join(tmp_path, 'empty.bin')
+    open(path, 'wb').close()
+    collision_map = GlobalCollisionMap.from_file(path)
+    tile = point(0, 0)
+    assert collision_map.regions.ids() == []
+    assert not collision_map.get(tile.x, tile.y, 0, 0)
+
+
+def test_bulk_queries_match_single_lookups():
+    collision_map = world(random_walkable())
+    rng = np.random.default_rng(1)
+    # Some coordinates fall outside of the four loaded regions
+    x, y = point(0, 0).x - 10 + rng.integers(150, size=1000), point(0, 0).y - 10 + rng.integers(150, size=1000)
+    z, w = rng.integers(4, size=1000), rng.integers(2, size=1000)
+    expected = [collision_map.get(*coordinates) for coordinates in zip(x.tolist(), y.tolist(), z.tolist(), w.tolist())]
+    assert collision_map.get_many(x, y, z, w).tolist() == expected
+
+
+def test_bulk_set_round_trips_and_notifies_once_per_changed_region():
+    collision_map = world(random_walkable())
+    changes = []
+    collision_map.add_listener(lambda region, tile: changes.append((region, tile)))
+    rng = np.random.default_rng(2)
+    # Distinct flags of the two western regions, and one flag outside of the loaded regions
+    index = rng.choice(64 * 128 * 4 * 2, size=200, replace=False)
+    x = np.append(point(0, 0).x + index % 64, point(-1, 0).x)
+    y = np.append(point(0, 0).y + index // 64 % 128, point(-1, 0).y)
+    z, w = np.append(index // 8192 % 4, 0), np.append(index // 32768, 0)
+    values = rng.random(len(x)) < 0.5
+
+    collision_map.set_many(x, y, z, w, values)
+    assert collision_map.get_many(x, y, z, w).tolist() == (values & (x >= point(0, 0).x)).tolist()
+    assert sorted(changes) == sorted((point(0, y).get_region_id(), None) for y in (0, 64))
+
+    changes.clear()
+    collision_map.set_many(x, y, z, w, values)
+    assert changes == []
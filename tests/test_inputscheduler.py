@@ -0,0 +1,57 @@
+import pytest
+from client.game.interaction import (InputEvent, InputScheduler, OSRSGame, RecordingBackend, TrajectoryPool,
+                                     smooth_move_bezier)
+
+
+def test_game_input_goes_through_the_scheduler():
+    backend = RecordingBackend()
+    game = OSRSGame(backend=backend, window_rect=(100, 50, 900, 650))
+    try:
+        game.move_mouse(10, 20)
+        game.click_mouse('Right')
+        assert game.press_key('a').wait(5)
+        # Backends take screen coordinates, so the window position is added once by the game
+        assert [(kind, args) for _, kind, args in backend.events] == [
+            ('move', (110, 70)), ('click', ('right',)), ('key', ('a',))]
+        backend.events.clear()
+        assert game.smooth_move_mouse((0.1, 0.1), (0.5, 0.5), duration=0.05, steps=10).wait(5)
+        moves = [args for _, _, args in backend.events]
+        assert moves[0] == (180.0, 110.0) and moves[-1] == (500.0, 350.0)
+    finally:
+        game.close()
+
+
+def test_smooth_move_returns_before_the_moves_are_sent():
+    backend = RecordingBackend()
+    with InputScheduler(backend) as scheduler:
+        handle = smooth_move_bezier((0.1, 0.1), (0.5, 0.5), duration=0.2, steps=20, window_size=(800, 600),
+                                    scheduler=scheduler)
+        assert not handle.done.is_set()
+        assert handle.wait(5)
+        assert len(backend.events) == 20
+        moves = [args for _, _, args in backend.events]
+        assert moves[0] == (80.0, 60.0) and moves[-1] == (400.0, 300.0)
+
+
+def test_smooth_move_from_a_pool_through_the_game():
+    backend = RecordingBackend()
+    game = OSRSGame(backend=backend, window_rect=(0, 0, 800, 600))
+    try:
+        pool = TrajectoryPool(size=4, steps=10)
+        pool.fill()
+        assert game.smooth_move_mouse((0.0, 0.0), (0.5, 0.5), duration=0.05, pool=pool).wait(5)
+        assert len(backend.events) == 10
+        assert game.smooth_move_mouse((0.0, 0.0), (0.5, 0.5), duration=0.05, steps=10, pool=pool).wait(5)
+        # The pool's trajectories cannot be regenerated with other parameters
+        with pytest.raises(ValueError, match="steps"):
+            game.smooth_move_mouse((0.0, 0.0), (0.5, 0.5), steps=50, pool=pool)
+        with pytest.raises(ValueError, match="complexity"):
+            game.smooth_move_mouse((0.0, 0.0), (0.5, 0.5), complexity=8, pool=pool)
+        assert len(backend.events) == 20
+    finally:
+        game.close()
+
+
+def test_move_events_of_an_empty_trajectory():
+    assert InputScheduler.move_events([], 1.0) == []
+    assert InputScheduler.move_events([(1, 2)], 1.0) == [InputEvent(0.0, 'move', (1, 2))]
@@ -0,0 +1,34 @@
+import numpy as np
+from client.game.walking import AStarPathfinder, GlobalCollisionMap, LandmarkTable, Pathfinder
+from conftest import X0, Y0, point, world
+
+
+def walled_world() -> GlobalCollisionMap:
+    # A wall across the region with a single gap at the top
+    walkable = np.ones((1, 64, 64), dtype=bool)
+    walkable[0, :60, 32] = False
+    return world(walkable)
+
+
+def test_landmarks_keep_paths_optimal():
+    collision_map = walled_world()
+    table = LandmarkTable.build(collision_map, [point(0, 0), point(63, 0)], '')
+    start, target = point(20, 5), point(45, 5)
+    expected = Pathfinder(collision_map, start, target).find()
+    plain = AStarPathfinder(collision_map, start, target)
+    alt = AStarPathfinder(collision_map, start, target, landmarks=table)
+    assert len(plain.find()) == len(alt.find()) == len(expected)
+    assert alt.expanded < plain.expanded
+
+
+def test_collision_change_makes_the_table_stale():
+    collision_map = walled_world()
+    table = LandmarkTable.build(collision_map, [point(63, 0), point(50, 5)], '')
+    start, target = point(20, 5), point(45, 5)
+    # Open a gap right between start and target, which the landmark distances know nothing about
+    for y in range(4, 7):
+        collision_map.set(X0 + 31, Y0 + y, 0, 1, True)
+        collision_map.set(X0 + 32, Y0 + y, 0, 1, True)
+    assert table.stale
+    expected = Pathfinder(collision_map, start, target).find()
+    assert len(AStarPathfinder(collision_map, start, target, landmarks=table).find()) == len(expected)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from client.game.walking import MovementMaskMap
+from conftest import X0, Y0, point, world
+
+
+def assert_matches(masks: MovementMaskMap, size: int = 128):
+    # Tiles of unloaded regions have no masks, so only the loaded regions are compared
+    collision_map = masks.collision_map
+    for plane in (0, 1):
+        for x in range(X0, X0 + size):
+            for y in range(Y0, Y0 + size):
+                if collision_map.regions[x // 64 * 256 + y // 64] is None:
+                    continue
+                assert masks.moves(x, y, plane) == collision_map.moves(x, y, plane), (x, y, plane)
+
+
+@pytest.fixture
+def random_world():
+    walkable = np.random.default_rng(0).random((2, 128, 128)) >= 0.2
+    return world(walkable)
+
+
+def test_masks_match_after_construction(random_world):
+    assert_matches(MovementMaskMap(random_world))
+
+
+def test_masks_follow_single_tile_changes(random_world):
+    masks = MovementMaskMap(random_world)
+    rng = np.random.default_rng(1)
+    # Region corners and borders, where the 3x3 update spans several regions, and random tiles
+    tiles = [(63, 63), (64, 64), (63, 64), (64, 63), (0, 0), (127, 127), (63, 10), (10, 64)]
+    tiles += [tuple(xy) for xy in rng.integers(128, size=(30, 2))]
+    for x, y in tiles:
+        tile = point(int(x), int(y), int(rng.integers(2)))
+        for w in (0, 1):
+            random_world.set(tile.x, tile.y, tile.plane, w, not random_world.get(tile.x, tile.y, tile.plane, w))
+    assert_matches(masks)
+
+
+def test_masks_follow_bulk_changes_and_new_regions(random_world):
+    masks = MovementMaskMap(random_world)
+    rng = np.random.default_rng(2)
+    x, y = X0 + rng.integers(128, size=500), Y0 + rng.integers(128, size=500)
+    random_world.set_many(x, y, rng.integers(2, size=500), rng.integers(2, size=500), rng.random(500) < 0.5)
+    assert_matches(masks)
+
+    region = point(128, 0).get_region_id()
+    random_world.create_region(region)
+    assert region in masks.masks
+    assert_matches(masks, size=192)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from DummyRS.envs import (CHANNELS, ENEMIES, INTERACTIBLE, INTERACTIBLE_IDS, ITEMS, PLAYER, Door,
+                          OldSchoolRunescapeEnv, TileEncoder, Tree, interactible_id)
+
+
+def populate(env: OldSchoolRunescapeEnv) -> None:
+    state = env.current_map.state
+    state.add_item(1, 1, "coins")
+    state.add_item(1, 1, "bones")
+    state.add_enemy(2, 3, "goblin")
+    state.set_interactible_object(4, 4, Tree("oak", True))
+    state.set_interactible_object(6, 2, Door(False))
+    env.encoder.encode_state(state)
+
+
+def test_tensor_observations_fit_the_observation_space():
+    env = OldSchoolRunescapeEnv("tensor")
+    observation = env.reset()
+    assert observation["current_map"].shape == (CHANNELS, 7, 10)
+    assert observation["current_map"].dtype == np.uint8
+    assert env.observation_space.contains(observation)
+    observation = env.step((0, 4, 5))[0]
+    assert env.observation_space.contains(observation)
+    # Observations are copies, so a later step does not change an earlier one
+    assert observation["current_map"][PLAYER, 5, 4] == 1
+    env.step((0, 3, 5))
+    assert observation["current_map"][PLAYER, 5, 4] == 1
+
+
+def test_state_encoding_matches_tile_encoding():
+    env = OldSchoolRunescapeEnv("tensor")
+    env.reset()
+    populate(env)
+    tiles = env.current_map.tiles
+    encoded = TileEncoder(10, 7).encode(tiles)
+    assert np.array_equal(encoded, env.encoder.buffer)
+    assert encoded[ITEMS, 1, 1] == 2 and encoded[ENEMIES, 3, 2] == 1
+    assert encoded[INTERACTIBLE, 4, 4] == INTERACTIBLE_IDS[Tree]
+    assert encoded[INTERACTIBLE, 2, 6] == INTERACTIBLE_IDS[Door]
+
+
+def test_incremental_encoding_matches_a_full_encode():
+    env = OldSchoolRunescapeEnv("tensor")
+    env.reset()
+    populate(env)
+    for action in [(0, 4, 5), (0, 5, 5), (0, 5, 4), (1, 0, 0), (0, 0, 0)]:
+        env.step(action)
+        env.move_enemy(2, 3, 3, 3, "goblin") or env.move_enemy(3, 3, 2, 3, "goblin")
+        env.set_interactible_state(4, 4, 2, available=False)
+        full = TileEncoder(10, 7).encode_state(env.current_map.state)
+        assert np.array_equal(env.get_observation()["current_map"], full)
+
+
+def test_unknown_interactibles_and_modes():
+    assert interactible_id(None) == 0
+    assert interactible_id(object()) == 0
+    with pytest.raises(ValueError):
+        OldSchoolRunescapeEnv("pixels")
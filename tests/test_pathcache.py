@@ -0,0 +1,31 @@
+import numpy as np
+from client.game.walking import GlobalCollisionMap, PathCache, Pathfinder
+from conftest import point, world
+
+
+def pocket_world() -> GlobalCollisionMap:
+    # Open ground with a walled-in pocket around (10, 10)
+    walkable = np.ones((1, 64, 64), dtype=bool)
+    walkable[0, 8:13, 8] = walkable[0, 8:13, 12] = False
+    walkable[0, 8, 8:13] = walkable[0, 12, 8:13] = False
+    return world(walkable)
+
+
+def test_region_key_does_not_share_unreachable_results():
+    cache = PathCache(pocket_world(), key_by_region=True)
+    target = point(40, 40)
+    assert cache.find(point(10, 10), target) == []
+    path = cache.find(point(20, 20), target)
+    assert path and path[0] == point(20, 20) and path[-1] == target
+    assert cache.find(point(10, 10), target) == []
+    assert cache.hits == 1
+
+
+def test_region_key_answers_starts_on_a_cached_path():
+    collision_map = pocket_world()
+    cache = PathCache(collision_map, key_by_region=True)
+    path = cache.find(point(20, 20), point(40, 40))
+    rest = cache.find(path[3], point(40, 40))
+    assert rest == path[3:]
+    assert len(rest) == len(Pathfinder(collision_map, path[3], point(40, 40)).find())
+    assert cache.hits == 1
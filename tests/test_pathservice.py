@@ -0,0 +1,37 @@
+import os
+from concurrent.futures import wait
+from benchmarks.worlds import serialize
+from client.game.walking import AStarPathfinder, PathService
+from conftest import point, world
+
+
+def test_answers_like_a_local_search_and_tolerates_cancelled_futures(tmp_path, walkable):
+    walkable[0, :60, 32] = False
+    collision_path = os.path.join(tmp_path, 'collision.bin')
+    with open(collision_path, 'wb') as f:
+        f.write(serialize(walkable))
+    collision_map = world(walkable)
+    queries = [(point(5, 5), point(50, 5)), (point(40, 40), point(10, 10)), (point(1, 1), point(2, 2))]
+
+    with PathService(collision_path, workers=2) as service:
+        assert service.workers == 2
+        futures = service.submit_batch(queries)
+        cancelled = futures[0].cancel()
+        for (start, target), future in zip(queries[1:], futures[1:]):
+            assert future.result(timeout=30) == AStarPathfinder(collision_map, start, target).find()
+        assert futures[0].cancelled() == cancelled
+
+
+def test_cancelled_chunks_cancel_their_futures(tmp_path, walkable):
+    collision_path = os.path.join(tmp_path, 'collision.bin')
+    with open(collision_path, 'wb') as f:
+        f.write(serialize(walkable))
+
+    with PathService(collision_path, workers=1, chunk_size=1) as service:
+        futures = service.submit_batch([(point(0, 0), point(63, 63))] * 100)
+        # Drops the chunks no worker has taken yet
+        service._executor.shutdown(cancel_futures=True)
+        done, pending = wait(futures, timeout=30)
+        assert not pending
+        assert any(future.cancelled() for future in futures)
+        assert all(future.result() for future in futures if not future.cancelled())
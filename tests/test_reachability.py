@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+from benchmarks.worlds import generate
+from client.game.walking import Pathfinder, ReachabilityIndex, Transport, TransportIndex
+from conftest import X0, Y0, point, world
+
+
+def assert_same_components(index: ReachabilityIndex, expected: ReachabilityIndex, rng: np.random.Generator,
+                           size: int = 128):
+    points = [point(int(x), int(y), int(plane)) for x, y, plane in
+              zip(rng.integers(size, size=300), rng.integers(size, size=300), rng.integers(2, size=300))]
+    components = [index.component(p) for p in points]
+    expected_components = [expected.component(p) for p in points]
+    for i in range(len(points)):
+        for j in range(i + 1, len(points)):
+            same = components[i] is not None and components[i] == components[j]
+            expected_same = expected_components[i] is not None and expected_components[i] == expected_components[j]
+            assert same == expected_same, (points[i], points[j])
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_incremental_updates_match_a_fresh_index(seed):
+    rng = np.random.default_rng(seed)
+    walkable = np.concatenate([generate('maze', 2, seed), generate('archipelago', 2, seed)])
+    collision_map = world(walkable)
+    index = ReachabilityIndex(collision_map)
+    index.update()
+    for _ in range(15):
+        kind = rng.integers(3)
+        if kind == 0:
+            # Single flags anywhere, including walls that split corridors and openings that join them
+            for _ in range(rng.integers(1, 4)):
+                x, y = X0 + int(rng.integers(128)), Y0 + int(rng.integers(128))
+                z, w = int(rng.integers(2)), int(rng.integers(2))
+                collision_map.set(x, y, z, w, not collision_map.get(x, y, z, w))
+        elif kind == 1:
+            x, y = X0 + rng.integers(128, size=50), Y0 + rng.integers(128, size=50)
+            collision_map.set_many(x, y, rng.integers(2, size=50), rng.integers(2, size=50), rng.random(50) < 0.7)
+        else:
+            # A region border flag, so components split or join across regions
+            x, y = X0 + 63, Y0 + int(rng.integers(128))
+            collision_map.set(x, y, 0, 1, not collision_map.get(x, y, 0, 1))
+        assert_same_components(index, ReachabilityIndex(collision_map), rng)
+
+
+def test_new_regions_join_the_index():
+    walkable = np.ones((1, 64, 64), dtype=bool)
+    walkable[0, :, 32] = False
+    collision_map = world(walkable)
+    index = ReachabilityIndex(collision_map)
+    assert not index.is_reachable(point(0, 0), point(40, 0))
+    # A fresh region north of the wall links both halves once the border is opened
+    collision_map.create_region(point(0, 64).get_region_id())
+    assert index.is_reachable(point(0, 70), point(40, 120))
+    assert not index.is_reachable(point(0, 0), point(40, 0))
+    collision_map.set_many(X0 + np.arange(64), Y0 + 63, 0, 0, True)
+    assert index.is_reachable(point(0, 0), point(40, 0))
+    assert index.is_reachable(point(0, 0), point(10, 100))
+    assert not index.is_reachable(point(0, 0), point(0, 130))
+
+
+def test_a_change_only_relinks_its_region(monkeypatch):
+    collision_map = world(generate('open_field', 4, 0))
+    index = ReachabilityIndex(collision_map)
+    far = index.component(point(10, 10))
+    links = []
+    link = ReachabilityIndex._link
+    monkeypatch.setattr(ReachabilityIndex, '_link', lambda self, a, b: links.append((a, b)) or link(self, a, b))
+    monkeypatch.setattr(ReachabilityIndex, '_build', lambda self: pytest.fail("rebuilt the whole index"))
+    tile = point(100, 100)
+    collision_map.set(tile.x, tile.y, 0, 0, not collision_map.get(tile.x, tile.y, 0, 0))
+    assert index.component(point(10, 10)) == far
+    assert len(links) == 4 and all(tile.get_region_id() in pair for pair in links)
+
+
+def test_transports_added_after_a_query_join_the_index(walkable):
+    walkable[0, :, 32] = False
+    collision_map = world(walkable)
+    transports = TransportIndex()
+    index = ReachabilityIndex(collision_map, transports)
+    start, target = point(0, 0), point(40, 0)
+    assert not index.is_reachable(start, target)
+    assert Pathfinder(collision_map, start, target, index, transports).find() == []
+    transports.add(Transport(point(31, 10), point(33, 10), kind='door'))
+    assert index.is_reachable(start, target)
+    path = Pathfinder(collision_map, start, target, index, transports).find()
+    assert path[0] == start and path[-1] == target
+    # A collision change afterwards keeps the transport linked
+    collision_map.set(X0 + 10, Y0 + 10, 0, 0, not collision_map.get(X0 + 10, Y0 + 10, 0, 0))
+    assert index.is_reachable(start, target)
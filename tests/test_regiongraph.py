@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from client.game.walking import AStarPathfinder, HierarchicalPathfinder, ReachabilityIndex, RegionGraph
+from conftest import assert_walkable, point, world
+
+
+def pocket_world():
+    # Two regions side by side. Thin walls cut the middle of the western region's border column off from the
+    # rest of the region, so the middle of the border run only leads into the pocket.
+    collision_map = world(np.ones((1, 64, 128), dtype=bool))
+    for y in range(20, 45):
+        wall = point(62, y)
+        collision_map.set(wall.x, wall.y, 0, 1, False)
+    for y in (19, 44):
+        wall = point(63, y)
+        collision_map.set(wall.x, wall.y, 0, 0, False)
+    return collision_map
+
+
+def test_wall_parallel_to_the_border_keeps_the_regions_connected():
+    collision_map = pocket_world()
+    start, target = point(10, 32), point(74, 32)
+    assert ReachabilityIndex(collision_map).is_reachable(start, target)
+    expected = AStarPathfinder(collision_map, start, target).find()
+    path = HierarchicalPathfinder(RegionGraph(collision_map), start, target).find()
+    assert path and path[0] == start and path[-1] == target
+    assert len(path) >= len(expected)
+    assert_walkable(collision_map, path)
+
+
+def test_pocket_is_reached_through_the_neighbouring_region():
+    collision_map = pocket_world()
+    start, target = point(10, 32), point(63, 32)
+    path = HierarchicalPathfinder(RegionGraph(collision_map), start, target).find()
+    assert path and path[-1] == target
+    assert_walkable(collision_map, path)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_open_world_paths_reach_their_targets(seed):
+    rng = np.random.default_rng(seed)
+    walkable = rng.random((1, 128, 128)) >= 0.05
+    collision_map = world(walkable)
+    graph = RegionGraph(collision_map)
+    ys, xs = np.nonzero(walkable[0])
+    for a, b in rng.integers(len(xs), size=(10, 2)):
+        start, target = point(xs[a], ys[a]), point(xs[b], ys[b])
+        expected = AStarPathfinder(collision_map, start, target).find()
+        path = HierarchicalPathfinder(graph, start, target).find()
+        assert bool(path) == bool(expected)
+        if path:
+            assert path[0] == start and path[-1] == target and len(path) >= len(expected)
+            assert_walkable(collision_map, path)
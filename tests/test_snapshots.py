@@ -0,0 +1,40 @@
+from DummyRS.envs import OldSchoolRunescapeEnv, Tree
+
+
+def test_restore_reloads_names_interned_after_an_earlier_snapshot():
+    env = OldSchoolRunescapeEnv()
+    env.reset()
+    state = env.current_map.state
+    state.add_enemy(1, 1, "goblin")
+    first = env.clone_state()
+    state.add_enemy(2, 2, "cow")
+    second = env.clone_state()
+
+    env.reset()
+    env.restore_state(first)
+    env.restore_state(second)
+    tiles = env.get_observation()["current_map"]
+    assert tiles[1][1].enemies == ("goblin",)
+    assert tiles[2][2].enemies == ("cow",)
+
+
+def test_restore_to_a_sibling_branch():
+    env = OldSchoolRunescapeEnv("tensor")
+    env.reset()
+    env.current_map.state.set_interactible_object(4, 4, Tree("oak", True))
+    root = env.clone_state()
+    env.step((0, 1, 1))
+    env.set_interactible_state(4, 4, available=False)
+    left = env.clone_state()
+    left_map = env.get_observation()["current_map"]
+
+    env.restore_state(root)
+    env.step((0, 8, 2))
+    right = env.clone_state()
+    env.restore_state(left)
+    assert env.player_pos == (1, 1)
+    assert not env.current_map.state.tile(4, 4).interactible_object.available
+    assert (env.get_observation()["current_map"] == left_map).all()
+    env.restore_state(right)
+    assert env.player_pos == (8, 2)
+    assert env.current_map.state.tile(4, 4).interactible_object.available
@@ -0,0 +1,80 @@
+from DummyRS.envs import Door, OldSchoolRunescapeEnv, TickScheduler, Tree
+
+
+def test_events_fire_in_order_and_can_be_cancelled():
+    scheduler = TickScheduler()
+    fired = []
+    scheduler.schedule(2, fired.append, "a")
+    scheduler.schedule(1, fired.append, "b")
+    cancelled = scheduler.schedule(2, fired.append, "c")
+    scheduler.schedule(0, lambda: scheduler.schedule(0, fired.append, "nested"))
+    scheduler.cancel(cancelled)
+    assert len(scheduler) == 3
+    assert scheduler.advance() == 3
+    assert fired == ["b", "nested"]
+    assert scheduler.advance() == 1
+    assert fired == ["b", "nested", "a"]
+    assert len(scheduler) == 0 and scheduler.next_tick() == -1
+
+
+def tree_env() -> OldSchoolRunescapeEnv:
+    env = OldSchoolRunescapeEnv()
+    env.reset()
+    env.current_map.state.set_interactible_object(2, 2, Tree("oak", True))
+    return env
+
+
+def available(env: OldSchoolRunescapeEnv) -> bool:
+    return env.current_map.state.tile(2, 2).interactible_object.available
+
+
+def test_resource_respawns():
+    env = tree_env()
+    env.set_interactible_state(2, 2, 3, available=False)
+    for _ in range(2):
+        env.step((1, 0, 0))
+        assert not available(env)
+    env.step((1, 0, 0))
+    assert available(env)
+
+
+def test_depleting_again_postpones_the_respawn_to_the_base_state():
+    env = tree_env()
+    env.set_interactible_state(2, 2, 10, available=False)
+    env.step((1, 0, 0))
+    env.set_interactible_state(2, 2, 10, available=False)
+    for _ in range(9):
+        env.step((1, 0, 0))
+        assert not available(env)
+    env.step((1, 0, 0))
+    assert available(env)
+    for _ in range(25):
+        env.step((1, 0, 0))
+    assert available(env)
+    assert len(env.scheduler) == 0
+
+
+def test_permanent_change_drops_the_pending_reset():
+    env = OldSchoolRunescapeEnv()
+    env.reset()
+    env.current_map.state.set_interactible_object(3, 3, Door(False))
+    env.set_interactible_state(3, 3, 5, is_open=True)
+    env.set_interactible_state(3, 3, is_open=True)
+    for _ in range(10):
+        env.step((1, 0, 0))
+    assert env.current_map.state.tile(3, 3).interactible_object.is_open
+
+
+def test_snapshots_capture_pending_resets():
+    env = tree_env()
+    env.set_interactible_state(2, 2, 4, available=False)
+    snapshot = env.clone_state()
+    for _ in range(4):
+        env.step((1, 0, 0))
+    assert available(env)
+    env.restore_state(snapshot)
+    assert not available(env)
+    env.set_interactible_state(2, 2, 4, available=False)
+    for _ in range(4):
+        env.step((1, 0, 0))
+    assert available(env)
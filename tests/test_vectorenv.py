@@ -0,0 +1,78 @@
+import numpy as np
+from DummyRS.envs import PLAYER, OldSchoolRunescapeEnv, VectorOldSchoolRunescapeEnv, WorldState
+
+WALLS = [(5, 5), (5, 4), (4, 4), (2, 1)]
+
+
+def add_walls(state: WorldState) -> None:
+    for x, y in WALLS:
+        state.set_movement_flags(x, y, [True] * 4)
+
+
+def random_actions(rng: np.random.Generator, num_envs: int) -> np.ndarray:
+    # Mostly moves, some of them off the map, and some attacks and interactions
+    return np.stack([rng.choice(3, size=num_envs, p=[0.8, 0.1, 0.1]),
+                     rng.integers(-1, 11, size=num_envs), rng.integers(-1, 8, size=num_envs)], axis=1)
+
+
+def test_steps_match_single_envs():
+    num_envs = 4
+    template = WorldState()
+    add_walls(template)
+    vector_env = VectorOldSchoolRunescapeEnv(num_envs, template=template)
+    envs = [OldSchoolRunescapeEnv("tensor") for _ in range(num_envs)]
+    observations, _ = vector_env.reset(seed=0)
+    singles = []
+    for env in envs:
+        env.reset()
+        add_walls(env.current_map.state)
+        env.encoder.encode_state(env.current_map.state)
+        singles.append(env.get_observation())
+    rejected = 0
+    assert vector_env.observation_space.contains(observations)
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        actions = random_actions(rng, num_envs)
+        observations, rewards, terminations, truncations, _ = vector_env.step(actions)
+        for i, env in enumerate(envs):
+            action_type, x, y = actions[i].tolist()
+            # The single env indexes its map with the coordinates, so it is only given moves onto the map
+            if action_type != 0 or 0 <= x < 10 and 0 <= y < 7:
+                singles[i] = env.step((action_type, x, y))[0]
+            rejected += action_type == 0 and (x, y) in WALLS
+            assert np.array_equal(observations["current_map"][i], singles[i]["current_map"])
+            assert tuple(observations["player_pos"][i]) == singles[i]["player_pos"]
+        assert vector_env.observation_space.contains(observations)
+        assert rewards.dtype == np.float32 and not rewards.any()
+        assert not terminations.any() and not truncations.any()
+    assert rejected
+
+
+def test_truncated_worlds_reset_on_their_next_step():
+    vector_env = VectorOldSchoolRunescapeEnv(2, max_episode_steps=3)
+    initial, _ = vector_env.reset()
+    moves = np.array([[0, 4, 5], [0, 3, 4]])
+    for _ in range(2):
+        _, _, _, truncations, _ = vector_env.step(moves)
+        assert not truncations.any()
+    observations, _, _, truncations, _ = vector_env.step(moves)
+    assert truncations.all()
+    assert not np.array_equal(observations["current_map"], initial["current_map"])
+
+    # The action of the resetting step is ignored
+    observations, _, _, truncations, _ = vector_env.step(np.array([[0, 5, 5], [0, 5, 5]]))
+    assert not truncations.any()
+    assert np.array_equal(observations["current_map"], initial["current_map"])
+    assert np.array_equal(observations["player_pos"], initial["player_pos"])
+    assert vector_env.elapsed_steps.tolist() == [0, 0]
+
+
+def test_reset_mask_resets_only_the_selected_worlds():
+    vector_env = VectorOldSchoolRunescapeEnv(3)
+    initial, _ = vector_env.reset()
+    vector_env.step(np.array([[0, 4, 5]] * 3))
+    observations, _ = vector_env.reset(options={"reset_mask": [False, True, False]})
+    assert observations["player_pos"].tolist() == [[4, 5], [3, 5], [4, 5]]
+    assert np.array_equal(observations["current_map"][1], initial["current_map"][1])
+    assert observations["current_map"][0, PLAYER, 5, 4] == 1
+    assert vector_env.elapsed_steps.tolist() == [1, 0, 1]
@@ -0,0 +1,31 @@
+from client.game.walking import WaypointSimplifier
+from conftest import assert_walkable, point, world
+
+
+def test_open_ground_walks_diagonally_then_straight(walkable):
+    simplifier = WaypointSimplifier(world(walkable))
+    assert simplifier.can_walk(point(10, 10), point(15, 12))
+    path = [point(10 + i, 10 + min(i, 2)) for i in range(6)]
+    assert simplifier.simplify(path) == [path[0], path[-1]]
+
+
+def test_blocked_diagonal_is_not_sidestepped(walkable):
+    walkable[0, 11, 11] = False
+    simplifier = WaypointSimplifier(world(walkable))
+    # Going around the wall takes 5 steps for a Chebyshev distance of 3
+    assert not simplifier.can_walk(point(10, 10), point(13, 13))
+    path = [point(10, 10), point(11, 10), point(12, 10), point(13, 11), point(13, 12), point(13, 13)]
+    assert_walkable(simplifier.collision_map, path)
+    assert simplifier.simplify(path) == [point(10, 10), point(13, 11), point(13, 13)]
+
+
+def test_straight_fallback_along_the_shorter_axis_is_rejected(walkable):
+    walkable[0, 11, 11] = False
+    simplifier = WaypointSimplifier(world(walkable))
+    # Both diagonals are cut by the wall, so the walk goes east twice and north twice, 4 steps for a distance of 2
+    assert not simplifier.can_walk(point(10, 10), point(12, 12))
+    # Stepping east along the longer axis keeps the walk at the Chebyshev distance
+    assert simplifier.can_walk(point(10, 10), point(13, 11))
+    path = [point(10, 10), point(11, 10), point(12, 10), point(12, 11), point(12, 12)]
+    assert_walkable(simplifier.collision_map, path)
+    assert simplifier.simplify(path) == [point(10, 10), point(12, 10), point(12, 12)]
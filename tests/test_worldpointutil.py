@@ -0,0 +1,49 @@
+import numpy as np
+from client.game import worldpointutil
+from client.game.walking import MovementMaskMap
+from client.game.worldpoint import WorldPoint
+from conftest import point, world
+
+
+def random_points(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    coordinates = zip(rng.integers(1, 32767, size=count).tolist(), rng.integers(1, 32767, size=count).tolist(),
+                      rng.integers(4, size=count).tolist())
+    return [WorldPoint(x, y, plane) for x, y, plane in coordinates]
+
+
+def test_packing_round_trips_and_matches_world_points():
+    for p in random_points(500) + [WorldPoint(0, 0, 0), WorldPoint(32767, 32767, 3)]:
+        packed = p.pack()
+        assert WorldPoint.from_packed(packed) == p
+        assert worldpointutil.get_region_id(packed) == p.get_region_id()
+        assert worldpointutil.get_region_index(packed) == p.get_region_x() + 64 * p.get_region_y() + 4096 * p.plane
+
+
+def test_offsets_step_like_world_points():
+    steps = {worldpointutil.N: (0, 1), worldpointutil.E: (1, 0), worldpointutil.S: (0, -1),
+             worldpointutil.W: (-1, 0), worldpointutil.NE: (1, 1), worldpointutil.NW: (-1, 1),
+             worldpointutil.SE: (1, -1), worldpointutil.SW: (-1, -1)}
+    for p in random_points(100):
+        for offset, (dx, dy) in steps.items():
+            moved = p.dx(dx).dy(dy)
+            assert p.pack() + offset == worldpointutil.dx_dy(p.pack(), dx, dy) == moved.pack()
+
+
+def test_packed_distance_matches_world_points():
+    points = random_points(200, seed=1)
+    for a, b in zip(points, points[1:]):
+        assert worldpointutil.distance_2d(a.pack(), b.pack()) == a.distance_to_2d(b)
+
+
+def test_packed_lookups_match_coordinate_lookups():
+    collision_map = world(np.random.default_rng(2).random((2, 64, 64)) >= 0.3)
+    masks = MovementMaskMap(collision_map)
+    for x in range(64):
+        for y in range(64):
+            for plane in (0, 1):
+                p = point(x, y, plane)
+                moves = collision_map.moves(p.x, p.y, plane)
+                assert collision_map.packed_moves(p.pack()) == masks.packed_moves(p.pack()) == moves
+                for w in (0, 1):
+                    assert collision_map.get_packed(p.pack(), w) == collision_map.get(p.x, p.y, plane, w)
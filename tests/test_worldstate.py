@@ -0,0 +1,30 @@
+import pytest
+from DummyRS.envs import Door, OldSchoolRunescapeEnv, Tile, WorldState
+
+
+def test_tiles_are_read_only_views():
+    env = OldSchoolRunescapeEnv()
+    tiles = env.reset()["current_map"]
+    with pytest.raises(AttributeError):
+        tiles[5][3].player = False
+    with pytest.raises(TypeError):
+        tiles[5][3] = Tile(x=3, y=5)
+    with pytest.raises(AttributeError):
+        tiles[5][3].items.append("coins")
+
+
+def test_views_are_rebuilt_only_for_changed_tiles():
+    env = OldSchoolRunescapeEnv()
+    before = env.reset()["current_map"]
+    after = env.step((0, 4, 5))[0]["current_map"]
+    assert before[5][3].player and not after[5][3].player and after[5][4].player
+    assert after[0] is before[0]
+    assert after[5][0] is before[5][0]
+
+
+def test_set_tile_writes_back_a_changed_view():
+    state = WorldState()
+    state.set_tile(Tile.new_tile_with_item(state.tile(1, 1), "coins"))
+    state.set_interactible_object(2, 2, Door(False))
+    assert state.tiles()[1][1].items == ("coins",)
+    assert state.tile(2, 2).interactible_object == Door(False)